@@ -1,11 +1,15 @@
 # langgraph/admissions_graph.py
 
-from langgraph.graph import StateGraph, END
+from langgraph.graph import END
 
 from langgraph.prebuilt import ToolNode
 from typing import TypedDict, Optional
 
+from core.config import settings
 from core.llm import call_llm
+from core.tokens import fit_to_budget
+from ace_graphs.intent_router import intent_router
+from ace_graphs.instrumentation import InstrumentedStateGraph
 
 # ---------------------------
 #   State Definition
@@ -24,7 +28,13 @@ class AdmissionsState(TypedDict):
 async def public_supervisor_agent(state: AdmissionsState):
     """
     This supervisor decides which agent should handle the message.
+    High-confidence messages are routed locally; the LLM is only asked
+    when the local intent router is unsure.
     """
+    if settings.INTENT_ROUTER_ENABLED:
+        route = intent_router.route(state["message"])
+        if route is not None:
+            return {"route": route}
 
     prompt = f"""
     You are the PUBLIC SUPERVISOR AGENT for VNR-ACE Admissions.
@@ -36,17 +46,20 @@ async def public_supervisor_agent(state: AdmissionsState):
     - admin_action  (only if explicitly admin activity)
     - unknown
 
-    User message: {state['message']}
+    User message: {fit_to_budget(state['message'], "supervisor")}
 
     Return ONLY the route name.
     """
 
-    route = (await call_llm(prompt)).strip().lower()
+    route = (await call_llm(prompt, route="supervisor", graph="admissions")).strip().lower()
 
     # ensure normalization
     if route not in ["faq", "application_tracking", "department_query", "admin_action"]:
         route = "faq"
 
+    if settings.INTENT_ROUTER_ENABLED:
+        intent_router.record_fallback(state["message"], route)
+
     return {"route": route}
 
 
@@ -60,10 +73,10 @@ async def faq_agent(state: AdmissionsState):
     Answer clearly and concisely.
 
     Student question:
-    {state['message']}
+    {fit_to_budget(state['message'], "faq")}
     """
 
-    answer = await call_llm(prompt)
+    answer = await call_llm(prompt, route="faq", graph="admissions")
     return {"reply": answer}
 
 
@@ -80,7 +93,7 @@ async def tracking_agent(state: AdmissionsState):
     Provide a helpful response.
     """
 
-    answer = await call_llm(prompt)
+    answer = await call_llm(prompt, route="application_tracking", graph="admissions")
     return {"reply": answer}
 
 
@@ -93,7 +106,7 @@ async def department_router_agent(state: AdmissionsState):
     You are the DEPARTMENT ROUTING AGENT for VNR-ACE.
 
     User query:
-    {state['message']}
+    {fit_to_budget(state['message'], "department_query")}
 
     Determine which department this message belongs to:
     - cse
@@ -107,7 +120,7 @@ async def department_router_agent(state: AdmissionsState):
     Return ONLY the department key.
     """
 
-    dept = (await call_llm(prompt)).strip().lower()
+    dept = (await call_llm(prompt, route="department_query", graph="admissions")).strip().lower()
     return {"reply": f"This will be routed to department: {dept}"}
 
 
@@ -121,12 +134,12 @@ async def admin_agent(state: AdmissionsState):
     You ONLY assist administrators in performing tasks related to applications.
 
     Admin message:
-    {state['message']}
+    {fit_to_budget(state['message'], "admin_action")}
 
     Provide a structured, useful response.
     """
 
-    answer = await call_llm(prompt)
+    answer = await call_llm(prompt, route="admin_action", graph="admissions")
     return {"reply": answer}
 
 
@@ -134,7 +147,7 @@ async def admin_agent(state: AdmissionsState):
 # GRAPH DEFINITION
 # ---------------------------
 
-graph = StateGraph(AdmissionsState)
+graph = InstrumentedStateGraph(AdmissionsState, graph_name="admissions")
 
 graph.add_node("supervisor", public_supervisor_agent)
 graph.add_node("faq", faq_agent)
@@ -1,11 +1,12 @@
 from core.llm import call_llm
+from core.tokens import fit_to_budget
 
 async def faq_agent(message: str):
     prompt = f"""
     You are the VNR-ACE Admissions FAQ Assistant.
-    User question: {message}
+    User question: {fit_to_budget(message, "faq")}
     Provide a clear and helpful answer.
     """
 
-    answer = await call_llm(prompt)
+    answer = await call_llm(prompt, route="faq", graph="admissions")
     return {"reply": answer}
@@ -1,7 +1,22 @@
 from typing import TypedDict, Optional, List, Dict, Any
-from langgraph.graph import StateGraph, END
+from langgraph.graph import END
+from ace_graphs.instrumentation import InstrumentedStateGraph
+from core.logger import get_logger
+from classwork.analytics import high_risk, high_risk_threshold, score_risk
+from classwork.data_source import get_data_source
+from classwork.nlq import nlq_parser
+from classwork.plan_executor import build_plan
+from classwork.response import DEFAULT_SORT, page_rows, render_markdown, to_records
+from classwork.result_cache import make_result_key, result_cache
+from core.config import settings
+import pandas as pd
 # from core.llm import call_llm # Uncomment when integrated
 import asyncio
+from dataclasses import asdict
+
+logger = get_logger("classwork_graph")
+
+MAX_NAMES_IN_INSIGHT = 50
 
 # ---------------------------
 #   State Definition
@@ -12,11 +27,17 @@ class ClassworkState(TypedDict):
     role: str  # e.g., 'admin', 'student'
     context: Dict[str, Any]
     normalized_query: Optional[str]
+    parsed_query: Optional[Dict[str, Any]]  # classwork.nlq.ParsedQuery as a dict
     semantic_intent: Optional[Dict[str, Any]]
+    result_cache_key: Optional[str]  # None: result not cacheable
+    cache_hit: Optional[bool]
     execution_plan: Optional[Dict[str, Any]]
-    unified_dataset: Optional[List[Dict[str, Any]]]
+    unified_dataset: Optional[pd.DataFrame]
+    fetch_error: Optional[str]  # set when the data source failed; never cached
     insights: Optional[List[str]]
+    page_request: Optional[Dict[str, Any]]  # see classwork.response.parse_page_request
     final_response: Optional[str]
+    structured_response: Optional[Dict[str, Any]]
 
 # ---------------------------
 #   Nodes
@@ -29,7 +50,7 @@ async def academic_nlq_entry(state: ClassworkState):
     Output: Cleaned query text + metadata
     """
     query = state.get("user_query", "")
-    print(f"\n[1] Academic NLQ Entry: Received query '{query}'")
+    logger.debug("[1] Academic NLQ Entry: Received query %r", query)
     
     # Basic cleaning or context injection could happen here
     context = state.get("context", {})
@@ -41,152 +62,124 @@ async def query_normalizer(state: ClassworkState):
     """
     2. Query Normalizer
     Fixes grammar, expands shorthand.
+    One pass of the compiled rule table (classwork/nlq_rules.json) over the
+    query: synonyms and abbreviations are normalized and the metrics,
+    filters, thresholds and limit it mentions are recorded.
     """
     query = state["user_query"]
-    print(f"[2] Query Normalizer: Normalizing '{query}'")
+    logger.debug("[2] Query Normalizer: Normalizing %r", query)
     
     # Placeholder for LLM-based normalization
     # e.g., normalized = await call_llm(f"Normalize: {query}")
     
-    normalized = query
-    # Simple rule-based logic for the demo
-    if "low att" in normalized.lower():
-        normalized = normalized.replace("low att", "low attendance")
-    
-    # Example logic: "top performers" -> "top 10% by GPA" 
-    # (Not implementing all rules, just structure)
+    parsed = nlq_parser.parse(query)
     
-    print(f"    -> Normalized: '{normalized}'")
-    return {"normalized_query": normalized}
+    logger.debug("    -> Normalized: %r", parsed.normalized)
+    return {"normalized_query": parsed.normalized, "parsed_query": asdict(parsed)}
 
 async def schema_intent_mapper(state: ClassworkState):
     """
     3. Schema & Intent Mapper
     Maps natural language to academic schema.
     """
-    normalized = state["normalized_query"]
-    print(f"[3] Schema & Intent Mapper: Mapping '{normalized}'")
+    parsed = state["parsed_query"]
+    logger.debug("[3] Schema & Intent Mapper: Mapping %r", state["normalized_query"])
     
     intent = {
-        "metrics": [],
-        "filters": {},
+        "metrics": list(parsed["metrics"]),
+        "filters": dict(parsed["filters"]),
         "group_by": []
     }
-    
-    norm_lower = normalized.lower()
-    
-    # Rule-based Mapping
-    if "attendance" in norm_lower:
-        intent["metrics"].append("attendance_percentage")
-    if "cgpa" in norm_lower or "grades" in norm_lower:
-        intent["metrics"].append("cumulative_gpa")
-    
-    if "cse" in norm_lower:
-        intent["filters"]["branch"] = "CSE"
-    if "2nd year" in norm_lower:
-        intent["filters"]["year"] = 2
+    if parsed["thresholds"]:
+        intent["thresholds"] = dict(parsed["thresholds"])
+    if parsed["limit"]:
+        intent["limit"] = parsed["limit"]
         
-    print(f"    -> Intent: {intent}")
+    logger.debug("    -> Intent: %s", intent)
     return {"semantic_intent": intent}
 
+async def result_cache_lookup(state: ClassworkState):
+    """
+    3b. Result Cache
+    Same intent on the same dataset version -> reuse the scored rows and
+    insights, skipping planning, loading, scoring and insight generation.
+    """
+    version = await get_data_source().dataset_version()
+    if version is None:
+        return {"result_cache_key": None, "cache_hit": False}
+
+    result_cache.check_version(version)
+    key = make_result_key(state["semantic_intent"], version)
+    cached = result_cache.get(key)
+    if cached is None:
+        return {"result_cache_key": key, "cache_hit": False}
+
+    data, insights = cached
+    logger.debug("[3b] Result Cache: hit for %s", key)
+    return {"result_cache_key": key, "cache_hit": True, "unified_dataset": data, "insights": insights}
+
+def route_after_cache(state: ClassworkState) -> str:
+    return "response_formatter" if state.get("cache_hit") else "query_planner"
+
 async def query_planner(state: ClassworkState):
     """
     4. Query Planner
-    Builds a logical plan: Which datasets? Join strategy?
+    Builds a logical plan: which datasets and columns the intent needs,
+    and which filters can be applied while loading.
     """
     intent = state["semantic_intent"]
-    print(f"[4] Query Planner: Building plan for {intent}")
-    
-    plan = {
-        "datasets": ["student_metadata"], # Always need metadata
-        "operations": []
-    }
+    logger.debug("[4] Query Planner: Building plan for %s", intent)
     
-    metrics = intent.get("metrics", [])
-    if "attendance_percentage" in metrics:
-        plan["datasets"].append("attendance_table")
-    if "cumulative_gpa" in metrics:
-        plan["datasets"].append("marks_table")
+    plan = build_plan(intent)
+    try:
+        plan["estimated_rows"] = await get_data_source().estimate_rows(plan)
+    except Exception as e:
+        logger.warning("Row estimate unavailable: %s", e)
+        plan["estimated_rows"] = None
         
-    print(f"    -> Plan: {plan}")
+    logger.debug("    -> Plan: %s", plan)
     return {"execution_plan": plan}
 
-import pandas as pd
-import os
-
 async def data_fetcher(state: ClassworkState):
     """
     5. Data Fetcher
-    Executes the plan, fetches raw data from Excel.
+    Executes the plan against the configured data source (file or SQL):
+    only the planned columns are loaded, and only for rows matching the
+    filters.
     """
     plan = state["execution_plan"]
-    print(f"[5] Data Fetcher: Fetching datasets {plan['datasets']}")
-    
-    # Path to Excel file
-    file_path = os.path.join(os.path.dirname(__file__), "../data/student_data.xlsx")
+    logger.debug("[5] Data Fetcher: Fetching datasets %s", plan["datasets"])
     
     try:
-        # Read Excel using pandas
-        df = pd.read_excel(file_path)
-        data = df.to_dict(orient="records")
-        print(f"    -> Loaded {len(data)} records from Excel")
-        return {"unified_dataset": data}
+        data = await get_data_source().fetch(plan)
+        logger.debug("    -> Loaded %d records from dataset", len(data))
+        return {"unified_dataset": data, "fetch_error": None}
     except Exception as e:
-        print(f"    -> Error loading data: {e}")
-        # Fallback to empty list or mock if needed, but error is better for debugging
-        return {"unified_dataset": []}
+        logger.error("Error loading classwork data: %s", e)
+        # Continue with an empty frame; fetch_error keeps it out of the result cache
+        return {"unified_dataset": pd.DataFrame(columns=plan["columns"]), "fetch_error": str(e)}
 
 async def aggregation_reasoning_engine(state: ClassworkState):
     """
     6. Aggregation & Reasoning Engine
     Filtering, Aggregation, Trend detection, Risk scoring.
+    Columnar: the cached dataset is filtered into a new frame, never mutated.
     """
     intent = state["semantic_intent"]
     data = state["unified_dataset"]
-    print(f"[6] Aggregation Engine: Processing {len(data)} records")
+    logger.debug("[6] Aggregation Engine: Processing %d records", len(data))
     
-    filters = intent.get("filters", {})
-    
-    # 1. Apply Filters
-    filtered_data = []
-    for s in data:
-        match = True
-        if "branch" in filters and s["branch"] != filters["branch"]:
-            match = False
-        if "year" in filters and s["year"] != filters["year"]:
-            match = False
-        if match:
-            filtered_data.append(s)
-            
+    # 1. Filters were already applied by the data fetcher (predicate pushdown)
+
     # 2. Reasoning / Risk Scoring
-    # Logic: "Students with attendance < 70% AND CGPA < 6" (derived from query usually, here inferred for demo logic)
-    # We will compute a 'risk_score' based on the metrics requested.
-    
-    processed_data = []
-    for s in filtered_data:
-        risk_score = 0
-        reasons = []
-        
-        # Example thresholds
-        if s["attendance_pct"] < 75:
-            risk_score += 1
-            reasons.append("Low Attendance")
-        if s["cumulative_gpa"] < 6.0:
-            risk_score += 1
-            reasons.append("Low CGPA")
-            
-        s["risk_score"] = risk_score
-        s["risk_reasons"] = reasons
-        
-        # If the query implies looking for 'problems' (risk), we might filter by risk > 0
-        # For now, let's keep all matching filters but sort by risk.
-        processed_data.append(s)
-        
-    # Sort by risk score descending
-    processed_data.sort(key=lambda x: x["risk_score"], reverse=True)
+    # Logic: "Students with attendance < 75% / CGPA < 6" (see analytics.RISK_RULES),
+    # limited to the metrics that were loaded.
+    # For now, keep all matching filters but sort by risk.
+    # Sources that rank in the database return rows already scored.
+    processed = data if "risk_score" in data.columns else score_risk(data)
     
-    print(f"    -> {len(processed_data)} records remaining after filter.")
-    return {"unified_dataset": processed_data}
+    logger.debug("    -> %d records remaining after filter.", len(processed))
+    return {"unified_dataset": processed}
 
 async def insight_generator(state: ClassworkState):
     """
@@ -194,57 +187,74 @@ async def insight_generator(state: ClassworkState):
     Transforms numbers into meaning.
     """
     data = state["unified_dataset"]
-    print(f"[7] Insight Generator: Analyzing data")
+    logger.debug("[7] Insight Generator: Analyzing data")
     
     insights = []
     
     # Pattern identification
-    high_risk_students = [s for s in data if s["risk_score"] >= 2]
+    high_risk_students = high_risk(data)
     
-    if high_risk_students:
-        insights.append(f"{len(high_risk_students)} students in this group show critical performance drops (Risk Score >= 2).")
-        names = ", ".join([s["name"] for s in high_risk_students])
-        insights.append(f"Students requiring immediate attention: {names}.")
-    elif data:
+    if len(high_risk_students):
+        insights.append(f"{len(high_risk_students)} students in this group show critical performance drops (Risk Score >= {high_risk_threshold(data)}).")
+        names = high_risk_students["name"].tolist()
+        shown = ", ".join(names[:MAX_NAMES_IN_INSIGHT])
+        if len(names) > MAX_NAMES_IN_INSIGHT:
+            shown += f" and {len(names) - MAX_NAMES_IN_INSIGHT} more"
+        insights.append(f"Students requiring immediate attention: {shown}.")
+    elif len(data):
          insights.append("Overall performance appears stable for this cohort.")
+    elif state.get("fetch_error"):
+        insights.append("Classwork data could not be loaded right now. Please try again.")
     else:
         insights.append("No data found matching the specific criteria.")
 
+    # A failed fetch must not be served from the cache until the TTL expires
+    if state.get("result_cache_key") and not state.get("fetch_error"):
+        result_cache.set(state["result_cache_key"], data, insights)
+
     return {"insights": insights}
 
 async def response_formatter(state: ClassworkState):
     """
     8. Response Formatter
-    Output: JSON or Formatted Text
+    Output: JSON (one page of rows + summary) and the same page as Markdown.
+    Reply size depends on the page size, not on the cohort.
     """
     insights = state["insights"]
     data = state["unified_dataset"]
+    page = state.get("page_request") or {
+        "size": settings.CLASSWORK_PAGE_SIZE, "sort": DEFAULT_SORT, "offset": 0,
+    }
     
-    print(f"[8] Response Formatter: Formatting output")
-    
-    nl_response = "### Academic Insights\n\n"
-    for i in insights:
-        nl_response += f"- {i}\n"
-    
-    nl_response += "\n### Student Details\n"
-    nl_response += "| Name | Branch | Attendance | CGPA | Risk Factors |\n"
-    nl_response += "|---|---|---|---|---|\n"
+    logger.debug("[8] Response Formatter: Formatting page %s of %d rows", page, len(data))
     
-    for s in data:
-        reasons = ", ".join(s.get("risk_reasons", [])) or "None"
-        nl_response += f"| {s['name']} | {s['branch']} | {s['attendance_pct']}% | {s['cumulative_gpa']} | {reasons} |\n"
+    rows, info = page_rows(data, page)
+    structured = {
+        "summary": {
+            "total": len(data),
+            "high_risk": len(high_risk(data)),
+            "high_risk_threshold": high_risk_threshold(data),
+            "insights": insights,
+        },
+        "rows": to_records(rows),
+        "page": info,
+    }
         
-    return {"final_response": nl_response}
+    return {
+        "final_response": render_markdown(insights, rows, info),
+        "structured_response": structured,
+    }
 
 # ---------------------------
 #   Graph Construction
 # ---------------------------
 
-builder = StateGraph(ClassworkState)
+builder = InstrumentedStateGraph(ClassworkState, graph_name="classwork")
 
 builder.add_node("academic_nlq_entry", academic_nlq_entry)
 builder.add_node("query_normalizer", query_normalizer)
 builder.add_node("schema_intent_mapper", schema_intent_mapper)
+builder.add_node("result_cache_lookup", result_cache_lookup)
 builder.add_node("query_planner", query_planner)
 builder.add_node("data_fetcher", data_fetcher)
 builder.add_node("aggregation_reasoning_engine", aggregation_reasoning_engine)
@@ -255,7 +265,12 @@ builder.add_node("response_formatter", response_formatter)
 builder.set_entry_point("academic_nlq_entry")
 builder.add_edge("academic_nlq_entry", "query_normalizer")
 builder.add_edge("query_normalizer", "schema_intent_mapper")
-builder.add_edge("schema_intent_mapper", "query_planner")
+builder.add_edge("schema_intent_mapper", "result_cache_lookup")
+builder.add_conditional_edges(
+    "result_cache_lookup",
+    route_after_cache,
+    {"query_planner": "query_planner", "response_formatter": "response_formatter"},
+)
 builder.add_edge("query_planner", "data_fetcher")
 builder.add_edge("data_fetcher", "aggregation_reasoning_engine")
 builder.add_edge("aggregation_reasoning_engine", "insight_generator")
@@ -0,0 +1,116 @@
+# ace_graphs/instrumentation.py
+
+import functools
+import time
+
+from langgraph.graph import StateGraph
+
+from core.metrics import GRAPH_NODE_DURATION, GRAPH_NODE_ERRORS, GRAPH_RUN_DURATION
+from core.tracing import current_run, current_trace, state_stats
+
+
+def instrument_node(graph_name: str, node_name: str, action):
+    """
+    Wraps an async node so every execution is timed and errors counted,
+    and a span is recorded when the current request is being traced.
+    """
+
+    @functools.wraps(action)
+    async def wrapper(state, *args, **kwargs):
+        start = time.perf_counter()
+        update = None
+        status = "error"
+        try:
+            update = await action(state, *args, **kwargs)
+            status = "ok"
+            return update
+        except Exception:
+            GRAPH_NODE_ERRORS.inc(graph_name, node_name)
+            raise
+        finally:
+            end = time.perf_counter()
+            GRAPH_NODE_DURATION.observe(end - start, graph_name, node_name)
+            trace = current_trace.get()
+            if trace is not None:
+                state_bytes, records = state_stats(update)
+                trace.add_span(
+                    node_name, "node", start, end,
+                    graph=graph_name, status=status,
+                    state_bytes=state_bytes, record_count=records,
+                )
+
+    return wrapper
+
+
+class InstrumentedGraph:
+    """
+    Thin proxy over a compiled graph that times whole runs. Anything other
+    than ainvoke/astream is passed straight through.
+    """
+
+    def __init__(self, name: str, graph):
+        self.name = name
+        self.graph = graph
+
+    def _begin_run(self):
+        trace = current_trace.get()
+        token = current_run.set(trace.next_run_id()) if trace is not None else None
+        return trace, token
+
+    def _end_run(self, trace, token, start: float, status: str):
+        end = time.perf_counter()
+        GRAPH_RUN_DURATION.observe(end - start, self.name, status)
+        if trace is not None:
+            trace.add_span(self.name, "graph", start, end, status=status)
+            try:
+                current_run.reset(token)
+            except ValueError:
+                # astream generator finalized from another context
+                pass
+
+    async def ainvoke(self, *args, **kwargs):
+        trace, token = self._begin_run()
+        start = time.perf_counter()
+        status = "error"
+        try:
+            result = await self.graph.ainvoke(*args, **kwargs)
+            status = "ok"
+            return result
+        finally:
+            self._end_run(trace, token, start, status)
+
+    async def astream(self, *args, **kwargs):
+        trace, token = self._begin_run()
+        start = time.perf_counter()
+        status = "error"
+        try:
+            async for chunk in self.graph.astream(*args, **kwargs):
+                yield chunk
+            status = "ok"
+        finally:
+            self._end_run(trace, token, start, status)
+
+    def __getattr__(self, attr):
+        return getattr(self.graph, attr)
+
+
+class InstrumentedStateGraph(StateGraph):
+    """
+    StateGraph that instruments every node it is given and returns an
+    InstrumentedGraph from compile(). Drop-in for StateGraph(...) with an
+    extra `graph_name`.
+    """
+
+    def __init__(self, state_schema, *args, graph_name: str, **kwargs):
+        super().__init__(state_schema, *args, **kwargs)
+        self.graph_name = graph_name
+
+    def add_node(self, node, action=None, **kwargs):
+        if action is None and callable(node):
+            node, action = node.__name__, node
+        if action is not None:
+            action = instrument_node(self.graph_name, node, action)
+        return super().add_node(node, action, **kwargs)
+
+    def compile(self, *args, **kwargs):
+        return InstrumentedGraph(self.graph_name, super().compile(*args, **kwargs))
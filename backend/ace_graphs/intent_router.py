@@ -0,0 +1,215 @@
+# ace_graphs/intent_router.py
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Optional
+
+from core.config import settings
+from core.logger import get_logger
+
+logger = get_logger("intent_router")
+
+ROUTES = ["faq", "application_tracking", "department_query", "admin_action"]
+
+# ---------------------------
+#   Keyword / Regex Rules
+# ---------------------------
+
+RULES = {
+    "application_tracking": [
+        r"\b(application|app)\s*(status|id|no\.?|number)\b",
+        r"\b(track|tracking|check)\b.*\bapplication\b",
+        r"\bstatus of my (application|admission)\b",
+    ],
+    # Admin-only verbs on bulk/plural objects; "verify" and anything about
+    # "my application" are what students say, so they are left to the model.
+    "admin_action": [
+        r"^(?!.*\bmy\b).*\b(approve|reject|reassign|export|shortlist)\b.*\b(all|pending|applications|applicants|candidates|applicant list)\b",
+        r"\b(bulk|mass)[ -]?(approve|reject|reassign|export|update)\b",
+    ],
+    # "it" only counts as the IT department/branch, not the pronoun
+    "department_query": [
+        r"\b(cse|ece|eee|mechanical|civil)\b.*\b(department|dept|hod|faculty|lab)s?\b",
+        r"\b(department|dept|hod)\b.*\b(cse|ece|eee|mechanical|civil)\b",
+        r"\bit\s+(department|dept|branch)\b",
+        r"\b(department|dept|branch)\s+of\s+it\b",
+    ],
+    "faq": [
+        r"\b(fees?|eligibility|cut-?off|hostel|scholarships?|documents?|deadline|last date|counsell?ing|eamcet|intake|seats?)\b",
+    ],
+}
+
+# Routed locally only on a rule match: a wrong admin_action is costly, and
+# department_query needs a named department ("talk to someone in the
+# department" is closer to the seeds than to anything else, yet unclear).
+RULE_ONLY_ROUTES = {"admin_action", "department_query"}
+
+COMPILED_RULES = {
+    route: [re.compile(p, re.IGNORECASE) for p in patterns]
+    for route, patterns in RULES.items()
+}
+
+# Seed examples so the centroid model works before any logs exist
+SEED_EXAMPLES = [
+    ("what is the fee structure for btech", "faq"),
+    ("what documents are required for admission", "faq"),
+    ("is hostel available for first years", "faq"),
+    ("what was last year's eamcet cutoff", "faq"),
+    ("when does counselling start", "faq"),
+    ("what is the status of my application", "application_tracking"),
+    ("has my application been processed", "application_tracking"),
+    ("track my admission application", "application_tracking"),
+    ("i submitted my form last week any update", "application_tracking"),
+    ("who is the hod of cse department", "department_query"),
+    ("i want to talk to the ece department", "department_query"),
+    ("which labs does the mechanical department have", "department_query"),
+    ("contact details of civil department", "department_query"),
+    ("approve all pending applications for cse", "admin_action"),
+    ("export the applicant list as excel", "admin_action"),
+    ("reject application number 1042", "admin_action"),
+]
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+# ---------------------------
+#   Router
+# ---------------------------
+
+class IntentRouter:
+    """
+    Local first stage of the admissions supervisor.
+    1. TF-IDF centroid model - cosine similarity against per-route centroids
+    2. Regex rules - if exactly one route matches, its score is raised to
+       rule_confidence (< 1.0), so a message that is also close to another
+       route still fails the margin check. RULE_ONLY_ROUTES need a rule match.
+    Returns None when not confident so the caller falls back to the LLM.
+    """
+
+    def __init__(self, min_confidence: float, min_margin: float, rule_confidence: float):
+        self.min_confidence = min_confidence
+        self.min_margin = min_margin
+        self.rule_confidence = rule_confidence
+        self.idf: dict[str, float] = {}
+        self.centroids: dict[str, dict[str, float]] = {}
+        self.stats = {"rule": 0, "model": 0, "llm": 0}
+
+    def fit(self, examples: list[tuple[str, str]]):
+        docs = [(Counter(tokenize(text)), route) for text, route in examples if route in ROUTES]
+        df = Counter()
+        for tf, _ in docs:
+            df.update(tf.keys())
+        n = len(docs)
+        self.idf = {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+
+        sums: dict[str, Counter] = {route: Counter() for route in ROUTES}
+        counts = Counter()
+        for tf, route in docs:
+            for term, weight in self._vectorize(tf).items():
+                sums[route][term] += weight
+            counts[route] += 1
+
+        self.centroids = {
+            route: self._normalize({t: w / counts[route] for t, w in vec.items()})
+            for route, vec in sums.items()
+            if counts[route]
+        }
+
+    def _vectorize(self, tf: Counter) -> dict[str, float]:
+        vec = {term: count * self.idf[term] for term, count in tf.items() if term in self.idf}
+        return self._normalize(vec)
+
+    @staticmethod
+    def _normalize(vec: dict[str, float]) -> dict[str, float]:
+        norm = math.sqrt(sum(w * w for w in vec.values()))
+        return {t: w / norm for t, w in vec.items()} if norm else {}
+
+    def scores(self, message: str) -> tuple[dict[str, float], Optional[str]]:
+        """Per-route scores and the single matching rule route (if any)."""
+        vec = self._vectorize(Counter(tokenize(message)))
+        scores = {
+            route: sum(w * centroid.get(t, 0.0) for t, w in vec.items())
+            for route, centroid in self.centroids.items()
+        }
+        matched = [
+            route for route, patterns in COMPILED_RULES.items()
+            if any(p.search(message) for p in patterns)
+        ]
+        rule_route = matched[0] if len(matched) == 1 else None
+        if rule_route is not None:
+            scores[rule_route] = max(scores.get(rule_route, 0.0), self.rule_confidence)
+        return scores, rule_route
+
+    def predict(self, message: str) -> tuple[Optional[str], float, str]:
+        """Returns (route, confidence, method); route is None if unsure."""
+        scores, rule_route = self.scores(message)
+        if not scores:
+            return None, 0.0, "model"
+
+        ranked = sorted(((score, route) for route, score in scores.items()), reverse=True)
+        best, route = ranked[0]
+        runner_up = ranked[1][0] if len(ranked) > 1 else 0.0
+        method = "rule" if route == rule_route else "model"
+        if method == "model" and route in RULE_ONLY_ROUTES:
+            return None, best, method
+        if best >= self.min_confidence and best - runner_up >= self.min_margin:
+            return route, best, method
+        return None, best, method
+
+    def route(self, message: str) -> Optional[str]:
+        route, _, method = self.predict(message)
+        if route is not None:
+            self.stats[method] += 1
+        return route
+
+    def record_fallback(self, message: str, route: str):
+        """
+        Counts an LLM decision and logs the route with the local scores.
+        The message itself (user text) is only logged with
+        INTENT_ROUTER_LOG_MESSAGES, e.g. to collect training data.
+        """
+        self.stats["llm"] += 1
+        scores, _ = self.scores(message)
+        record = {"route": route, "scores": {r: round(v, 3) for r, v in scores.items()}}
+        if settings.INTENT_ROUTER_LOG_MESSAGES:
+            record["message"] = message
+        logger.info("intent_fallback %s", json.dumps(record))
+
+    def snapshot(self) -> dict:
+        total = sum(self.stats.values())
+        local = self.stats["rule"] + self.stats["model"]
+        return {
+            **self.stats,
+            "total": total,
+            "local_ratio": round(local / total, 4) if total else 0.0,
+        }
+
+
+def load_examples(path: Optional[str]) -> list[tuple[str, str]]:
+    """Reads logged {"message", "route"} JSONL records, if a file is configured."""
+    if not path or not os.path.exists(path):
+        return []
+    examples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            examples.append((record["message"], record["route"]))
+    return examples
+
+
+intent_router = IntentRouter(
+    min_confidence=settings.INTENT_ROUTER_MIN_CONFIDENCE,
+    min_margin=settings.INTENT_ROUTER_MIN_MARGIN,
+    rule_confidence=settings.INTENT_ROUTER_RULE_CONFIDENCE,
+)
+intent_router.fit(SEED_EXAMPLES + load_examples(settings.INTENT_ROUTER_TRAINING_FILE))
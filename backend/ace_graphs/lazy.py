@@ -0,0 +1,119 @@
+# ace_graphs/lazy.py
+
+"""
+Graphs are imported and compiled on first use, not when the app is
+imported: langgraph, the LLM client and pandas are a large part of a
+worker's cold start, and most workers never run every graph.
+
+Routers hold LazyGraph handles from GRAPHS. The first request to a graph
+pays its import + compile (about a second for the first one, since it
+pulls in langgraph). That runs in a worker thread, so other requests keep
+being served; concurrent first requests wait on one load. warmup_graphs()
+pays it up front instead:
+
+- per worker: set GRAPH_WARMUP (names or ["all"]) and the app warms
+  those graphs in its lifespan, before serving;
+- pre-fork: call warmup_graphs() in the server's master process after
+  importing the app (e.g. gunicorn --preload, on_starting hook) so
+  forked workers share the compiled graphs.
+"""
+
+import asyncio
+import importlib
+import threading
+import time
+
+from core.logger import get_logger
+from core.metrics import registry
+
+logger = get_logger("graphs")
+
+GRAPH_LOAD_SECONDS = registry.gauge(
+    "graph_load_seconds", "Import + compile time of a lazily loaded graph", ("graph",),
+)
+
+
+class LazyGraph:
+    """Stands in for a compiled graph; loads `module.attr` on first use."""
+
+    def __init__(self, name: str, module: str, attr: str):
+        self.name = name
+        self.module = module
+        self.attr = attr
+        self._graph = None
+        self._lock = threading.Lock()
+        # asyncio.Lock is bound to one event loop; recreated per loop
+        self._async_lock: asyncio.Lock | None = None
+        self._async_lock_loop = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._graph is not None
+
+    def load(self):
+        """Blocking; use aload() on the event loop."""
+        if self._graph is None:
+            with self._lock:
+                if self._graph is None:
+                    started = time.perf_counter()
+                    graph = getattr(importlib.import_module(self.module), self.attr)
+                    elapsed = time.perf_counter() - started
+                    GRAPH_LOAD_SECONDS.set(elapsed, self.name)
+                    logger.info("Loaded graph %s in %.0f ms", self.name, elapsed * 1000)
+                    self._graph = graph
+        return self._graph
+
+    async def aload(self):
+        """Loads in a worker thread; one load per graph, other callers wait for it."""
+        if self._graph is None:
+            loop = asyncio.get_running_loop()
+            if self._async_lock_loop is not loop:
+                self._async_lock, self._async_lock_loop = asyncio.Lock(), loop
+            async with self._async_lock:
+                if self._graph is None:
+                    await asyncio.to_thread(self.load)
+        return self._graph
+
+    async def ainvoke(self, *args, **kwargs):
+        return await (await self.aload()).ainvoke(*args, **kwargs)
+
+    async def astream(self, *args, **kwargs):
+        async for chunk in (await self.aload()).astream(*args, **kwargs):
+            yield chunk
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.load(), attr)
+
+
+GRAPHS = {
+    "admissions": LazyGraph("admissions", "ace_graphs.admissions_graph", "admissions_graph"),
+    "classwork": LazyGraph("classwork", "ace_graphs.classwork_graph", "classwork_graph"),
+    **{
+        f"placements_{name}": LazyGraph(f"placements_{name}", "ace_graphs.placements_graph", f"{name}_graph")
+        for name in ("dashboard", "resume", "prep", "shortlisting", "tracking", "notification")
+    },
+}
+
+
+def warmup_graphs(names=("all",)) -> dict[str, float]:
+    """Loads the named graphs (or all) and the LLM client; returns name -> seconds spent."""
+    selected = list(GRAPHS) if "all" in names else list(names)
+    unknown = [name for name in selected if name not in GRAPHS]
+    if unknown:
+        raise ValueError(f"Unknown graphs {unknown}; expected names from {list(GRAPHS)}")
+
+    timings = {}
+    for name in selected:
+        started = time.perf_counter()
+        GRAPHS[name].load()
+        timings[name] = time.perf_counter() - started
+
+    from core.llm import get_chat_model, retryable_errors
+
+    started = time.perf_counter()
+    get_chat_model()
+    retryable_errors()
+    timings["llm"] = time.perf_counter() - started
+    return timings
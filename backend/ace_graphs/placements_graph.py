@@ -1,6 +1,7 @@
 from typing import TypedDict, Optional, Literal
-from langgraph.graph import StateGraph, END
+from langgraph.graph import END
 from core.llm import call_llm
+from ace_graphs.instrumentation import InstrumentedStateGraph
 
 # ---------------------------
 #   State Definition
@@ -43,7 +44,7 @@ async def dashboard_agent(state: PlacementsState):
     # Simulated logic
     return {"response": "Here is your Placement Dashboard: \n- Eligible: 5 Companies\n- Applied: 2\n- Status: In Progress"}
 
-dashboard_builder = StateGraph(PlacementsState)
+dashboard_builder = InstrumentedStateGraph(PlacementsState, graph_name="placements_dashboard")
 dashboard_builder.add_node("rbac", rbac_node)
 dashboard_builder.add_node("dashboard_agent", dashboard_agent)
 dashboard_builder.add_node("validator", validator_node)
@@ -65,7 +66,7 @@ async def resume_agent(state: PlacementsState):
     response = "Resume Analysis: formatting looks good, add more metrics to your projects." # Mock for speed
     return {"response": response}
 
-resume_builder = StateGraph(PlacementsState)
+resume_builder = InstrumentedStateGraph(PlacementsState, graph_name="placements_resume")
 resume_builder.add_node("rbac", rbac_node)
 resume_builder.add_node("resume_agent", resume_agent)
 resume_builder.add_node("validator", validator_node)
@@ -84,7 +85,7 @@ resume_graph = resume_builder.compile()
 async def prep_agent(state: PlacementsState):
     return {"response": "Here are some study materials for your upcoming interview."}
 
-prep_builder = StateGraph(PlacementsState)
+prep_builder = InstrumentedStateGraph(PlacementsState, graph_name="placements_prep")
 prep_builder.add_node("rbac", rbac_node)
 prep_builder.add_node("prep_agent", prep_agent)
 prep_builder.add_node("validator", validator_node)
@@ -103,7 +104,7 @@ prep_graph = prep_builder.compile()
 async def shortlisting_agent(state: PlacementsState):
     return {"response": "You have been shortlisted for: \n- TechCorp Inc.\n- Global Solutions"}
 
-shortlisting_builder = StateGraph(PlacementsState)
+shortlisting_builder = InstrumentedStateGraph(PlacementsState, graph_name="placements_shortlisting")
 shortlisting_builder.add_node("rbac", rbac_node)
 shortlisting_builder.add_node("shortlisting_agent", shortlisting_agent)
 shortlisting_builder.add_node("validator", validator_node)
@@ -122,7 +123,7 @@ shortlisting_graph = shortlisting_builder.compile()
 async def tracking_agent(state: PlacementsState):
     return {"response": "Tracking Update: Your application to Cloud Systems is 'Under Review'."}
 
-tracking_builder = StateGraph(PlacementsState)
+tracking_builder = InstrumentedStateGraph(PlacementsState, graph_name="placements_tracking")
 tracking_builder.add_node("rbac", rbac_node)
 tracking_builder.add_node("tracking_agent", tracking_agent)
 tracking_builder.add_node("validator", validator_node)
@@ -141,7 +142,7 @@ tracking_graph = tracking_builder.compile()
 async def notification_agent(state: PlacementsState):
     return {"response": "No new notifications at this time."}
 
-notification_builder = StateGraph(PlacementsState)
+notification_builder = InstrumentedStateGraph(PlacementsState, graph_name="placements_notification")
 notification_builder.add_node("rbac", rbac_node)
 notification_builder.add_node("notification_agent", notification_agent)
 notification_builder.add_node("validator", validator_node)
@@ -1,5 +1,9 @@
+import asyncio
+import sys
+
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 
 from core.auth import router as auth_router
@@ -7,16 +11,22 @@ from routes.admissions import router as admissions_router
 from classwork.router import router as classwork_router
 from placements.router import router as placements_router
 from routes.test_rbac import router as test_rbac_router
+from routes.traces import router as traces_router
+from routes.users import router as users_router
 
 from core.deps import role_required
-from fastapi import FastAPI
-from core.db import engine, Base
-
-# IMPORTANT: import models so metadata registers
-from models.user import User
-from models.role import Role
+from core.config import settings
+from core.db import close_db
+from core.llm import close_llm
+from core.auth_utils import close_hash_executor
+from core.redis_client import close_redis
+from core.tokens import load_encoding
+from core.logger import get_logger
+from core.metrics import MetricsMiddleware, registry
+from core.tracing import RequestIdMiddleware
+from ace_graphs.lazy import warmup_graphs
 
-app = FastAPI(title="VNR-ACE Backend")
+logger = get_logger("app")
 
 # ---------------------------
 # 🚀 CORS
@@ -28,17 +38,32 @@ origins = [
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup logic
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Startup logic. The schema is managed by Alembic (`alembic upgrade head`),
+    # not created here; graphs compile on first use unless warmed up.
+    # The tokenizer may download its encoding file: keep that off the loop.
+    await asyncio.to_thread(load_encoding)
+    if settings.GRAPH_WARMUP:
+        timings = await asyncio.to_thread(warmup_graphs, settings.GRAPH_WARMUP)
+        logger.info("Warmed up %s in %.0f ms", list(timings), sum(timings.values()) * 1000)
 
     yield
 
-    # Shutdown logic (optional)
-    # await engine.dispose()
+    # Shutdown logic
+    await close_llm()
+    await close_redis()
+    # Only loaded if a classwork request ran in this worker
+    data_source = sys.modules.get("classwork.data_source")
+    if data_source is not None:
+        await data_source.close_data_source()
+    # No-op unless a bulk provisioning upload started the hashing pool
+    provisioning = sys.modules.get("core.provisioning")
+    if provisioning is not None:
+        await asyncio.to_thread(provisioning.close_hash_pool)
+    close_hash_executor()
+    await close_db()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(title="VNR-ACE Backend", lifespan=lifespan)
 
 
 app.add_middleware(
@@ -48,6 +73,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)
 
 # ---------------------------
 # 🚀 Root
@@ -56,6 +83,13 @@ app.add_middleware(
 def root():
     return {"status": "running", "message": "VNR-ACE backend is live!"}
 
+# ---------------------------
+# 🚀 Metrics (Prometheus text format)
+# ---------------------------
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 # ---------------------------
 # 🚀 Example Admin Protected Route
 # ---------------------------
@@ -71,3 +105,5 @@ app.include_router(admissions_router)
 app.include_router(classwork_router)
 app.include_router(placements_router)
 app.include_router(test_rbac_router)
+app.include_router(traces_router)
+app.include_router(users_router)
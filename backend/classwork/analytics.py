@@ -0,0 +1,83 @@
+# classwork/analytics.py
+
+"""
+Columnar filtering and risk scoring for the classwork pipeline.
+
+Everything here takes a DataFrame and returns a new one; the input
+(usually the shared cached dataset) is never modified.
+"""
+
+import numpy as np
+import pandas as pd
+
+# (column, threshold, reason) - a student is flagged when column < threshold
+RISK_RULES = [
+    ("attendance_pct", 75, "Low Attendance"),
+    ("cumulative_gpa", 6.0, "Low CGPA"),
+]
+HIGH_RISK_SCORE = 2
+
+
+def apply_filters(frame: pd.DataFrame, filters: dict) -> pd.DataFrame:
+    """Equality filters on columns, combined into one boolean mask."""
+    if not filters:
+        return frame
+    mask = np.ones(len(frame), dtype=bool)
+    for column, value in filters.items():
+        # Compare on the Series: string columns stay in their native
+        # (Arrow) representation instead of materializing object arrays
+        mask &= (frame[column] == value).to_numpy(dtype=bool, na_value=False)
+    return frame[mask]
+
+
+def active_rules(frame: pd.DataFrame) -> list[tuple]:
+    """Rules whose input column was loaded for this query."""
+    return [rule for rule in RISK_RULES if rule[0] in frame.columns]
+
+
+def high_risk_threshold(frame: pd.DataFrame) -> int:
+    """
+    Always HIGH_RISK_SCORE: a student is high risk only when that many
+    rules fire, so a query that loaded a single metric has none.
+    """
+    return HIGH_RISK_SCORE
+
+
+def score_risk(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds one boolean flag column per active rule and their sum as
+    `risk_score`, sorted by risk descending (stable, so ties keep dataset
+    order).
+    """
+    columns = {}
+    score = np.zeros(len(frame), dtype=np.int8)
+    for column, threshold, _ in active_rules(frame):
+        flag = (frame[column] < threshold).to_numpy(dtype=bool, na_value=False)
+        columns[f"flag_{column}"] = flag
+        score += flag
+    columns["risk_score"] = score
+
+    # Stable descending order on the score, then one gather of the rows;
+    # take() returns a new frame, so adding columns cannot touch the input.
+    order = np.argsort(-score, kind="stable")
+    scored = frame.take(order)
+    for name, values in columns.items():
+        scored[name] = values[order]
+    return scored
+
+
+def high_risk(frame: pd.DataFrame) -> pd.DataFrame:
+    return frame[frame["risk_score"].to_numpy() >= high_risk_threshold(frame)]
+
+
+def describe_risk(frame: pd.DataFrame) -> pd.Series:
+    """
+    Comma-separated risk reasons per row ("None" if unflagged). Meant for
+    the rows being displayed, not the whole cohort.
+    """
+    reasons = np.full(len(frame), "", dtype=object)
+    for column, _, label in active_rules(frame):
+        flag = frame[f"flag_{column}"].to_numpy()
+        reasons = np.where(flag, np.where(reasons == "", label, reasons + ", " + label), reasons)
+    reasons[reasons == ""] = "None"
+    return pd.Series(reasons, index=frame.index)
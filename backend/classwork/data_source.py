@@ -0,0 +1,108 @@
+# classwork/data_source.py
+
+"""
+Where the classwork query plan runs.
+
+A DataSource takes the plan built by plan_executor.build_plan and returns
+the matching rows as a DataFrame:
+
+- FileDataSource: the Excel/Parquet dataset, through the shared
+  DatasetCache (projection and predicate pushdown in plan_executor).
+- SqlDataSource (sql_source.py): the classwork tables in Postgres (or
+  any async SQLAlchemy database), queried with one SELECT per plan.
+
+The source is chosen by CLASSWORK_DATA_SOURCE ("file" or "sql"). The SQL
+source is imported only when selected, so file mode needs no database
+settings.
+"""
+
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+from core.config import settings
+from classwork.analytics import score_risk
+from classwork.dataset_cache import dataset_cache
+from classwork.plan_executor import estimate_rows, execute_plan
+
+
+class DataSource(ABC):
+    """
+    fetch() returns the plan's projected columns for rows matching its
+    filters. Sources may also score them: a frame with `risk_score` has the
+    flag columns of analytics.score_risk and is already ordered by risk.
+    When the plan has a `limit`, only the top `limit` rows by risk are
+    returned (which requires scoring).
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def estimate_rows(self, plan: dict) -> int | None:
+        ...
+
+    @abstractmethod
+    async def fetch(self, plan: dict) -> pd.DataFrame:
+        ...
+
+    async def dataset_version(self) -> str | None:
+        """Changes whenever the data changes; None if that cannot be told cheaply."""
+        return None
+
+    async def close(self):
+        pass
+
+
+# ---------------------------
+#   Excel / Parquet
+# ---------------------------
+
+class FileDataSource(DataSource):
+    name = "file"
+
+    async def estimate_rows(self, plan: dict) -> int | None:
+        return await estimate_rows(plan)
+
+    async def fetch(self, plan: dict) -> pd.DataFrame:
+        data = await execute_plan(plan)
+        if plan.get("limit"):
+            data = score_risk(data).head(plan["limit"])
+        return data
+
+    async def dataset_version(self) -> str | None:
+        # Stat-checked by the dataset cache; re-hashed only if a file changed
+        paths = sorted({settings.CLASSWORK_DATA_PATH, *settings.CLASSWORK_DATASET_PATHS.values()})
+        return "+".join([(await dataset_cache.aget(path)).version for path in paths])
+
+
+# ---------------------------
+#   Selection
+# ---------------------------
+
+def _sql_source() -> DataSource:
+    # Imported here: it pulls in the ORM models and the app's DB engine
+    from classwork.sql_source import SqlDataSource
+
+    return SqlDataSource(settings.CLASSWORK_SQL_URL)
+
+
+SOURCES = {
+    "file": FileDataSource,
+    "sql": _sql_source,
+}
+
+_data_source: DataSource | None = None
+
+
+def get_data_source() -> DataSource:
+    global _data_source
+    if _data_source is None:
+        if settings.CLASSWORK_DATA_SOURCE not in SOURCES:
+            raise ValueError(f"Unknown CLASSWORK_DATA_SOURCE {settings.CLASSWORK_DATA_SOURCE!r}")
+        _data_source = SOURCES[settings.CLASSWORK_DATA_SOURCE]()
+    return _data_source
+
+
+async def close_data_source():
+    if _data_source is not None:
+        await _data_source.close()
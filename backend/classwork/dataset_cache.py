@@ -0,0 +1,265 @@
+# classwork/dataset_cache.py
+
+"""
+Change-aware, cross-process cache for the classwork student dataset.
+
+Each version of a source file (Excel/CSV/Parquet) is converted once into
+an uncompressed Arrow IPC snapshot under CLASSWORK_CACHE_DIR, named by the
+content hash (its "generation"). Every worker memory-maps the snapshot
+read-only and wraps its columns as Arrow-backed pandas Series without
+copying, so all workers share the same page-cache pages and per-worker
+resident memory stays flat as the worker count grows. Pages are only
+faulted in for the columns a query plan touches - a query that only needs
+attendance never reads grade data.
+
+A cheap stat() (mtime + size) on every access detects changes; the new
+generation is built off to the side, written with an atomic rename, and
+swapped in with a single assignment, so readers never see a half-loaded
+dataset. Older generations are unlinked; workers still mapping them keep
+a valid mapping until they move on.
+
+Without pyarrow the parsed frame is simply kept in process memory.
+Cached columns are shared: callers must treat them as read-only.
+"""
+
+import asyncio
+import glob
+import hashlib
+import os
+import threading
+from typing import Optional
+
+import pandas as pd
+
+from core.config import settings
+from core.logger import get_logger
+
+logger = get_logger("classwork.dataset_cache")
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def resolve_path(path: str) -> str:
+    """Relative paths in settings are relative to backend/."""
+    return path if os.path.isabs(path) else os.path.join(BACKEND_DIR, path)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_source(path: str) -> pd.DataFrame:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xls"):
+        return pd.read_excel(path)
+    if ext == ".parquet":
+        return pd.read_parquet(path)
+    if ext == ".csv":
+        return pd.read_csv(path)
+    raise ValueError(f"Unsupported dataset format: {path}")
+
+
+class CachedDataset:
+    """
+    One generation of one source file. Columns come either from a
+    memory-mapped Arrow table (zero-copy) or, without pyarrow, from the
+    parsed frame.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mtime_ns: int,
+        size: int,
+        sha256: str,
+        table=None,
+        frame: Optional[pd.DataFrame] = None,
+        snapshot_path: Optional[str] = None,
+    ):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.sha256 = sha256
+        self.table = table
+        self.snapshot_path = snapshot_path
+        if table is not None:
+            self.schema = list(table.column_names)
+            self.num_rows = table.num_rows
+            self._columns: dict[str, pd.Series] = {}
+        else:
+            self.schema = list(frame.columns)
+            self.num_rows = len(frame)
+            self._columns = {name: frame[name] for name in frame.columns}
+        self._distinct: dict[str, int] = {}
+
+    @property
+    def version(self) -> str:
+        """Content-derived generation id, identical in every worker."""
+        return self.sha256[:16]
+
+    @property
+    def loaded_columns(self) -> list[str]:
+        return list(self._columns)
+
+    def _column(self, name: str) -> pd.Series:
+        series = self._columns.get(name)
+        if series is None:
+            if self.table is None or name not in self.schema:
+                raise KeyError(f"Column {name!r} not available in {self.path}")
+            # Arrow-backed Series over the mapped buffers: no copy
+            series = self.table.column(name).to_pandas(types_mapper=pd.ArrowDtype)
+            series.name = name
+            self._columns[name] = series
+        return series
+
+    def columns(self, names: list[str]) -> pd.DataFrame:
+        """Projection of the requested columns."""
+        return pd.DataFrame({n: self._column(n) for n in names}, copy=False)
+
+    async def acolumns(self, names: list[str]) -> pd.DataFrame:
+        # Mapping is lazy and wrapping is zero-copy, so this never blocks
+        # for long; kept async for data sources that do real I/O.
+        return self.columns(names)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Every column."""
+        return self.columns(self.schema)
+
+    def distinct_count(self, name: str) -> int:
+        """Number of distinct values of a column (for row estimates)."""
+        if name not in self._distinct:
+            self._distinct[name] = max(1, int(self._column(name).nunique()))
+        return self._distinct[name]
+
+
+class DatasetCache:
+    def __init__(self, cache_dir: str):
+        self.cache_dir = resolve_path(cache_dir)
+        self._entries: dict[str, CachedDataset] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.stats = {"memory_hits": 0, "snapshot_maps": 0, "source_parses": 0}
+
+    def _lock_for(self, path: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def _fresh_entry(self, path: str) -> CachedDataset | None:
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        st = os.stat(path)
+        if entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+            return entry
+        return None
+
+    def get(self, path: str) -> CachedDataset:
+        """Blocking load; use aget() from async code."""
+        path = resolve_path(path)
+        entry = self._fresh_entry(path)
+        if entry is not None:
+            self.stats["memory_hits"] += 1
+            return entry
+
+        with self._lock_for(path):
+            # Another thread may have reloaded while we waited
+            entry = self._fresh_entry(path)
+            if entry is not None:
+                self.stats["memory_hits"] += 1
+                return entry
+            entry = self._load(path)
+            self._entries[path] = entry
+            return entry
+
+    async def aget(self, path: str) -> CachedDataset:
+        """Serves fresh entries inline; parsing runs in a worker thread."""
+        entry = self._fresh_entry(resolve_path(path))
+        if entry is not None:
+            self.stats["memory_hits"] += 1
+            return entry
+        return await asyncio.to_thread(self.get, path)
+
+    def _snapshot_prefix(self, path: str) -> str:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        key = hashlib.sha1(path.encode()).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{stem}-{key}")
+
+    def _load(self, path: str) -> CachedDataset:
+        st = os.stat(path)
+        sha = file_sha256(path)
+        prefix = self._snapshot_prefix(path)
+        snapshot = f"{prefix}.{sha[:16]}.arrow"
+
+        if os.path.exists(snapshot):
+            entry = self._map_snapshot(path, st, sha, snapshot)
+            if entry is not None:
+                self.stats["snapshot_maps"] += 1
+                return entry
+
+        frame = read_source(path)
+        self.stats["source_parses"] += 1
+        logger.info("Parsed dataset %s (%d rows, generation %s)", path, len(frame), sha[:16])
+        if self._write_snapshot(frame, snapshot):
+            self._remove_old_generations(prefix, snapshot)
+            entry = self._map_snapshot(path, st, sha, snapshot)
+            if entry is not None:
+                return entry
+
+        # No pyarrow / unwritable cache dir: keep the parsed frame in memory
+        return CachedDataset(path, st.st_mtime_ns, st.st_size, sha, frame=frame)
+
+    def _map_snapshot(self, path: str, st: os.stat_result, sha: str, snapshot: str) -> CachedDataset | None:
+        try:
+            import pyarrow as pa
+        except ImportError:
+            return None
+        try:
+            source = pa.memory_map(snapshot, "r")
+            table = pa.ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowInvalid) as e:
+            logger.warning("Ignoring unreadable snapshot %s: %s", snapshot, e)
+            return None
+        return CachedDataset(path, st.st_mtime_ns, st.st_size, sha, table=table, snapshot_path=snapshot)
+
+    def _write_snapshot(self, frame: pd.DataFrame, snapshot: str) -> bool:
+        try:
+            import pyarrow as pa
+        except ImportError:
+            logger.warning("pyarrow not installed; shared dataset snapshots disabled")
+            return False
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            tmp = f"{snapshot}.{os.getpid()}.tmp"
+            # Uncompressed, so the mapped file can be used in place
+            with pa.OSFile(tmp, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp, snapshot)  # atomic: readers see old or new, never partial
+            return True
+        except OSError as e:
+            logger.warning("Could not write dataset snapshot %s: %s", snapshot, e)
+            return False
+
+    @staticmethod
+    def _remove_old_generations(prefix: str, keep: str):
+        for old in glob.glob(f"{prefix}.*.arrow"):
+            if old != keep:
+                try:
+                    os.unlink(old)
+                except OSError:
+                    pass
+
+    def invalidate(self, path: str | None = None):
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(resolve_path(path), None)
+
+
+dataset_cache = DatasetCache(settings.CLASSWORK_CACHE_DIR)
@@ -0,0 +1,207 @@
+# classwork/nlq.py
+
+"""
+Table-driven query normalizer and intent mapper for the classwork graph.
+
+The rule table (CLASSWORK_NLQ_RULES_PATH, JSON) lists phrases for
+rewrites, metrics, filters, comparators, limits and units. It is
+compiled once into a word-level trie; parsing walks the query's tokens
+once, taking the longest phrase at each position. Per-query cost
+depends on the query length and the longest phrase, not on how many
+rules there are.
+
+    parse("CSE 2nd yr att below 65%")
+    -> normalized "cse 2nd year attendance below 65 %"
+       metrics ["attendance_percentage"], filters {"branch": "CSE", "year": 2}
+       thresholds {"attendance_percentage": {"op": "<", "value": 65.0}}
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from core.config import settings
+from core.logger import get_logger
+from classwork.dataset_cache import resolve_path
+
+logger = get_logger("classwork.nlq")
+
+TOKEN_RE = re.compile(r"[<>]=?|%|\d+(?:\.\d+)?(?:st|nd|rd|th)?|[a-z]+")
+NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+# A number is taken for a comparator/limit only within this many tokens
+NUMBER_WINDOW = 3
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+@dataclass
+class ParsedQuery:
+    normalized: str
+    metrics: list[str] = field(default_factory=list)
+    filters: dict = field(default_factory=dict)
+    thresholds: dict = field(default_factory=dict)
+    limit: Optional[int] = None
+
+
+class _Node:
+    __slots__ = ("children", "actions", "text")
+
+    def __init__(self):
+        self.children: dict[str, "_Node"] = {}
+        self.actions: Optional[list[tuple]] = None  # set on phrase ends
+        self.text: Optional[str] = None  # normalized output for the phrase
+
+
+class NLQParser:
+    def __init__(self, rules: dict):
+        self.root = _Node()
+        self.max_depth = 0
+        self.phrases = 0
+        # One-word rewrites ("yr" -> "year") apply to tokens before matching,
+        # so every phrase also matches its abbreviated forms
+        self.aliases: dict[str, str] = {}
+        self._compile(rules)
+
+    def tokens(self, text: str) -> list[str]:
+        aliases = self.aliases
+        return [aliases.get(token, token) for token in tokenize(text)]
+
+    # ---------------------------
+    #   Compilation
+    # ---------------------------
+
+    def _add(self, phrase: str, actions: list[tuple], text: Optional[str] = None):
+        tokens = self.tokens(phrase)
+        if not tokens:
+            return
+        node = self.root
+        for token in tokens:
+            node = node.children.setdefault(token, _Node())
+        if node.actions is None:
+            node.actions = []
+            self.phrases += 1
+        node.actions.extend(a for a in actions if a not in node.actions)
+        node.text = text or node.text or " ".join(tokens)
+        self.max_depth = max(self.max_depth, len(tokens))
+
+    def _compile(self, rules: dict):
+        rewrites = {}
+        for phrase, replacement in rules.get("rewrites", {}).items():
+            source, target = tokenize(phrase), tokenize(replacement)
+            if len(source) == 1 and len(target) == 1:
+                self.aliases[source[0]] = target[0]
+            else:
+                rewrites[phrase] = replacement
+
+        for rule in rules.get("metrics", []):
+            for phrase in rule["phrases"]:
+                self._add(phrase, [("metric", rule["value"])])
+        for key, values in rules.get("filters", {}).items():
+            for rule in values:
+                for phrase in rule["phrases"]:
+                    self._add(phrase, [("filter", key, rule["value"])])
+        for op, phrases in rules.get("comparators", {}).items():
+            for phrase in phrases:
+                self._add(phrase, [("comparator", op)])
+        for phrase in rules.get("limit", []):
+            self._add(phrase, [("limit",)])
+        for phrase, metric in rules.get("units", {}).items():
+            self._add(phrase, [("unit", metric)])
+
+        # A rewrite carries whatever its replacement text means, e.g.
+        # "low att" -> "low attendance" is also the attendance metric
+        for phrase, replacement in rewrites.items():
+            target = self.tokens(replacement)
+            actions = [a for match in self._scan(target) for a in match[1]]
+            self._add(phrase, actions, text=" ".join(target))
+
+    # ---------------------------
+    #   Matching
+    # ---------------------------
+
+    def _scan(self, tokens: list[str]):
+        """Yields (text, actions) per position: longest phrase, else the token."""
+        i, n = 0, len(tokens)
+        while i < n:
+            node, end, match = self.root, i, None
+            while end < n and end - i < self.max_depth:
+                node = node.children.get(tokens[end])
+                if node is None:
+                    break
+                end += 1
+                if node.actions is not None:
+                    match = (node, end)
+            if match is None:
+                yield tokens[i], []
+                i += 1
+            else:
+                yield match[0].text, match[0].actions
+                i = match[1]
+
+    def parse(self, text: str) -> ParsedQuery:
+        parsed = ParsedQuery(normalized="")
+        output: list[str] = []
+        last_metric: Optional[str] = None
+        # (kind, op, tokens seen since) awaiting a number
+        pending: Optional[list] = None
+        # comparator thresholds not yet tied to a metric
+        unassigned: list[dict] = []
+
+        for text_out, actions in self._scan(self.tokens(text)):
+            output.append(text_out)
+
+            if pending is not None and NUMBER_RE.fullmatch(text_out):
+                kind, op, _ = pending
+                if kind == "limit":
+                    parsed.limit = int(float(text_out))
+                else:
+                    threshold = {"op": op, "value": float(text_out)}
+                    if last_metric is not None:
+                        parsed.thresholds[last_metric] = threshold
+                    else:
+                        unassigned.append(threshold)
+                pending = None
+                continue
+
+            for action in actions:
+                kind = action[0]
+                if kind == "metric":
+                    last_metric = action[1]
+                    if action[1] not in parsed.metrics:
+                        parsed.metrics.append(action[1])
+                    for threshold in unassigned:
+                        parsed.thresholds.setdefault(action[1], threshold)
+                    unassigned = []
+                elif kind == "filter":
+                    parsed.filters[action[1]] = action[2]
+                elif kind == "comparator":
+                    pending = ["comparator", action[1], 0]
+                elif kind == "limit":
+                    pending = ["limit", None, 0]
+                elif kind == "unit" and unassigned:
+                    # "below 65%" with no metric named: the unit decides
+                    parsed.thresholds.setdefault(action[1], unassigned.pop())
+                    if action[1] not in parsed.metrics:
+                        parsed.metrics.append(action[1])
+
+            if pending is not None and not actions:
+                pending[2] += 1
+                if pending[2] > NUMBER_WINDOW:
+                    pending = None
+
+        parsed.normalized = " ".join(output)
+        return parsed
+
+
+def load_rules(path: str) -> dict:
+    """Relative paths are relative to backend/, as for the datasets."""
+    with open(resolve_path(path), encoding="utf-8") as f:
+        return json.load(f)
+
+
+nlq_parser = NLQParser(load_rules(settings.CLASSWORK_NLQ_RULES_PATH))
+logger.info("Compiled %d NLQ phrases from %s", nlq_parser.phrases, settings.CLASSWORK_NLQ_RULES_PATH)
@@ -0,0 +1,193 @@
+# classwork/plan_executor.py
+
+"""
+Turns the classwork semantic intent into a physical plan and executes it.
+
+- Dataset selection: only logical datasets the intent needs are used.
+- Projection pushdown: only the columns required by the metrics, filters
+  and output are loaded (see DatasetCache's lazy column loading).
+- Predicate pushdown: filter columns are loaded and evaluated first; the
+  remaining columns are gathered for the matching rows only.
+
+Filters are equality predicates on FILTER_COLUMNS; ranges are metric
+thresholds ("attendance below 65%") as {"column", "op", "value"}.
+
+Logical datasets live in the unified CLASSWORK_DATA_PATH file unless
+CLASSWORK_DATASET_PATHS points one at its own file, in which case it is
+joined on `id`.
+"""
+
+import operator
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.config import settings
+from core.logger import get_logger
+from classwork.dataset_cache import dataset_cache
+
+logger = get_logger("classwork.plan_executor")
+
+KEY_COLUMN = "id"
+
+# Logical dataset -> columns it provides
+DATASETS = {
+    "student_metadata": ["id", "name", "branch", "year"],
+    "attendance_table": ["attendance_pct"],
+    "marks_table": ["cumulative_gpa"],
+}
+
+# Intent metric -> (dataset, column)
+METRICS = {
+    "attendance_percentage": ("attendance_table", "attendance_pct"),
+    "cumulative_gpa": ("marks_table", "cumulative_gpa"),
+}
+
+# Intent filter key -> column
+FILTER_COLUMNS = {
+    "branch": "branch",
+    "year": "year",
+}
+
+# Comparison operators allowed in range predicates
+RANGE_OPS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# Fraction of rows assumed to pass a range predicate when estimating
+RANGE_SELECTIVITY = 1 / 3
+
+# Always shown in the response
+OUTPUT_COLUMNS = ["id", "name", "branch"]
+
+
+def dataset_for_column(column: str) -> str:
+    for dataset, columns in DATASETS.items():
+        if column in columns:
+            return dataset
+    raise KeyError(f"No dataset provides column {column!r}")
+
+
+def build_plan(intent: dict) -> dict:
+    """
+    Logical plan for an intent. With no explicit metric the query is an
+    overview and every metric is included.
+    """
+    metrics = [m for m in intent.get("metrics", []) if m in METRICS] or list(METRICS)
+    filters = {
+        FILTER_COLUMNS[key]: value
+        for key, value in intent.get("filters", {}).items()
+        if key in FILTER_COLUMNS
+    }
+    ranges = [
+        {"column": METRICS[metric][1], "op": t["op"], "value": t["value"]}
+        for metric, t in intent.get("thresholds", {}).items()
+        if metric in METRICS and t.get("op") in RANGE_OPS
+    ]
+
+    columns = list(OUTPUT_COLUMNS)
+    for column in list(filters) + [r["column"] for r in ranges] + [METRICS[m][1] for m in metrics]:
+        if column not in columns:
+            columns.append(column)
+
+    datasets = []
+    for column in columns:
+        dataset = dataset_for_column(column)
+        if dataset not in datasets:
+            datasets.append(dataset)
+
+    return {
+        "datasets": datasets,
+        "metrics": metrics,
+        "columns": columns,
+        "filters": filters,
+        "ranges": ranges,
+        "operations": [],
+        # Top-N by risk; None returns every matching row
+        "limit": intent.get("limit"),
+    }
+
+
+def source_path(dataset: str) -> str:
+    return settings.CLASSWORK_DATASET_PATHS.get(dataset, settings.CLASSWORK_DATA_PATH)
+
+
+async def estimate_rows(plan: dict) -> int:
+    """Rows expected after filtering, assuming uniform independent columns."""
+    base = await dataset_cache.aget(source_path("student_metadata"))
+    estimate = float(base.num_rows)
+    for column in plan["filters"]:
+        source = await dataset_cache.aget(source_path(dataset_for_column(column)))
+        await source.acolumns([column])
+        estimate /= source.distinct_count(column)
+    estimate *= RANGE_SELECTIVITY ** len(plan.get("ranges", []))
+    return round(estimate)
+
+
+def _filter_mask(frame: pd.DataFrame, filters: dict, ranges: list = ()) -> np.ndarray:
+    mask = np.ones(len(frame), dtype=bool)
+    for column, value in filters.items():
+        mask &= (frame[column] == value).to_numpy(dtype=bool, na_value=False)
+    for r in ranges:
+        mask &= RANGE_OPS[r["op"]](frame[r["column"]], r["value"]).to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+async def execute_plan(plan: dict) -> pd.DataFrame:
+    """
+    Loads the projected columns for rows matching the plan's filters.
+    Returns a new frame; cached columns are never modified.
+    """
+    started = time.perf_counter()
+
+    # Group the plan's columns by physical file
+    by_path: dict[str, list[str]] = {}
+    for column in plan["columns"]:
+        path = source_path(dataset_for_column(column))
+        by_path.setdefault(path, [])
+        if column not in by_path[path]:
+            by_path[path].append(column)
+
+    base_path = source_path("student_metadata")
+    base = await dataset_cache.aget(base_path)
+
+    # 1. Predicate first: only filter columns of the base file
+    base_filters = {c: v for c, v in plan["filters"].items() if source_path(dataset_for_column(c)) == base_path}
+    base_ranges = [r for r in plan.get("ranges", []) if source_path(dataset_for_column(r["column"])) == base_path]
+    predicate_columns = list(dict.fromkeys(list(base_filters) + [r["column"] for r in base_ranges]))
+    filter_frame = await base.acolumns(predicate_columns)
+    mask = _filter_mask(filter_frame, base_filters, base_ranges) if predicate_columns else None
+
+    # 2. Gather the remaining projected columns for matching rows only
+    result = await base.acolumns(by_path.pop(base_path))
+    if mask is not None:
+        result = result[mask]
+
+    # 3. Columns from separately stored datasets, joined on the key
+    for path, columns in by_path.items():
+        source = await dataset_cache.aget(path)
+        other = await source.acolumns([KEY_COLUMN] + [c for c in columns if c != KEY_COLUMN])
+        other_filters = {c: v for c, v in plan["filters"].items() if c in columns}
+        other_ranges = [r for r in plan.get("ranges", []) if r["column"] in columns]
+        if other_filters or other_ranges:
+            other = other[_filter_mask(other, other_filters, other_ranges)]
+        other = other[other[KEY_COLUMN].isin(result[KEY_COLUMN])]
+        how = "inner" if other_filters or other_ranges else "left"
+        result = result.merge(other, on=KEY_COLUMN, how=how)
+
+    result = result.reset_index(drop=True)
+    plan_stats = {
+        "estimated_rows": plan.get("estimated_rows"),
+        "actual_rows": len(result),
+        "columns": plan["columns"],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    logger.debug(
+        "Executed plan datasets=%s filters=%s ranges=%s %s",
+        plan["datasets"], plan["filters"], plan.get("ranges"), plan_stats,
+    )
+    return result
@@ -0,0 +1,168 @@
+# classwork/response.py
+
+"""
+Paginated, structured classwork replies.
+
+The graph's result frame can hold a whole college; the reply only ever
+carries one page of it:
+
+- rows are sorted by a whitelisted sort key (risk by default) and sliced
+  at an opaque cursor, so page size, not cohort size, bounds the reply;
+- the markdown reply is the insights plus a table of the same page,
+  built with a single join.
+
+A cursor encodes (offset, sort, page size). It is only meaningful for
+the query that produced it.
+"""
+
+import base64
+import binascii
+import json
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+from fastapi import HTTPException
+
+from core.config import settings
+from classwork.analytics import describe_risk
+
+# Public sort key -> column (None: the risk order the frame already has).
+# Prefix with "-" for descending, e.g. "-cgpa".
+SORT_KEYS = {
+    "risk": None,
+    "name": "name",
+    "id": "id",
+    "attendance": "attendance_pct",
+    "cgpa": "cumulative_gpa",
+}
+DEFAULT_SORT = "risk"
+
+# (column, header, cell format) for the markdown table
+TABLE_COLUMNS = [
+    ("name", "Name", "{}"),
+    ("branch", "Branch", "{}"),
+    ("attendance_pct", "Attendance", "{}%"),
+    ("cumulative_gpa", "CGPA", "{}"),
+]
+
+# Columns returned in structured rows, when loaded
+ROW_COLUMNS = ["id", "name", "branch", "year", "attendance_pct", "cumulative_gpa", "risk_score"]
+
+
+# ---------------------------
+#   Request parsing
+# ---------------------------
+
+def encode_cursor(offset: int, sort: str, size: int) -> str:
+    raw = json.dumps({"o": offset, "s": sort, "n": size}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[int, str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        offset, sort, size = int(data["o"]), str(data["s"]), int(data["n"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if offset < 0 or size < 1:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return offset, sort, size
+
+
+def parse_page_request(body: dict) -> dict:
+    """
+    Validates {"page_size": n, "sort": "-cgpa", "cursor": "..."}; returns
+    {"size", "sort", "offset"}. A cursor carries its own sort key and page
+    size; an explicit page_size still wins.
+    """
+    offset, sort, size = 0, body.get("sort") or DEFAULT_SORT, settings.CLASSWORK_PAGE_SIZE
+    if body.get("cursor"):
+        offset, sort, size = decode_cursor(str(body["cursor"]))
+
+    size = body.get("page_size") or size
+    if not isinstance(size, int) or size < 1:
+        raise HTTPException(status_code=400, detail="page_size must be a positive integer")
+    size = min(size, settings.CLASSWORK_MAX_PAGE_SIZE)
+    if sort.lstrip("-") not in SORT_KEYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"sort must be one of {sorted(SORT_KEYS)} (prefix '-' for descending)",
+        )
+    return {"size": size, "sort": sort, "offset": offset}
+
+
+# ---------------------------
+#   Paging
+# ---------------------------
+
+def sort_rows(frame: pd.DataFrame, sort: str, limit: int | None = None) -> pd.DataFrame:
+    """
+    Stable sort by the key, ties in the frame's (risk) order. With `limit`,
+    only the first `limit` rows are needed: numeric keys then use a
+    partial selection instead of sorting the whole cohort.
+    """
+    column = SORT_KEYS[sort.lstrip("-")]
+    if column is None or column not in frame.columns:
+        return frame
+    ascending = not sort.startswith("-")
+    values = frame[column]
+    # nsmallest/nlargest skip missing values, so they only apply while the
+    # page is within the non-missing rows
+    if limit is not None and is_numeric_dtype(values) and limit <= values.count():
+        select = frame.nsmallest if ascending else frame.nlargest
+        return select(limit, column, keep="first")
+    return frame.sort_values(column, ascending=ascending, kind="stable")
+
+
+def page_rows(frame: pd.DataFrame, page: dict) -> tuple[pd.DataFrame, dict]:
+    """The requested page and its metadata (total, next_cursor, ...)."""
+    total = len(frame)
+    offset, size, sort = page["offset"], page["size"], page["sort"]
+    rows = sort_rows(frame, sort, limit=offset + size).iloc[offset:offset + size]
+    end = offset + len(rows)
+    info = {
+        "size": size,
+        "sort": sort,
+        "offset": offset,
+        "total": total,
+        "next_cursor": encode_cursor(end, sort, size) if end < total else None,
+    }
+    return rows, info
+
+
+def to_records(rows: pd.DataFrame) -> list[dict]:
+    """JSON-ready rows with their risk reasons."""
+    columns = [c for c in ROW_COLUMNS if c in rows.columns]
+    # Column-wise conversion to Python scalars (missing values -> None)
+    values = {c: rows[c].astype(object).where(rows[c].notna(), None).tolist() for c in columns}
+    values["risk_factors"] = describe_risk(rows).tolist()
+    return [dict(zip(values, row)) for row in zip(*values.values())]
+
+
+# ---------------------------
+#   Markdown
+# ---------------------------
+
+def render_markdown(insights: list[str], rows: pd.DataFrame, info: dict) -> str:
+    """Insights and one page of students; size is bounded by the page."""
+    lines = ["### Academic Insights", ""]
+    lines.extend(f"- {i}" for i in insights)
+
+    # Only the metric columns the plan loaded are shown
+    columns = [(c, label, fmt) for c, label, fmt in TABLE_COLUMNS if c in rows.columns]
+    lines.append("")
+    lines.append("### Student Details")
+    lines.append("| " + " | ".join(label for _, label, _ in columns) + " | Risk Factors |")
+    lines.append("|---" * (len(columns) + 1) + "|")
+
+    values = [rows[c].tolist() for c, _, _ in columns]
+    for i, reason in enumerate(describe_risk(rows).tolist()):
+        cells = [fmt.format(v[i]) for v, (_, _, fmt) in zip(values, columns)]
+        lines.append("| " + " | ".join(cells) + f" | {reason} |")
+
+    if info["total"] > len(rows):
+        first = info["offset"] + 1 if len(rows) else info["offset"]
+        lines.append("")
+        lines.append(f"_Showing {first}-{info['offset'] + len(rows)} of {info['total']} students._")
+    return "\n".join(lines) + "\n"
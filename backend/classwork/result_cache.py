@@ -0,0 +1,98 @@
+# classwork/result_cache.py
+
+"""
+Per-worker cache of classwork results (scored rows + insights).
+
+Key = canonical semantic intent + dataset version, so a changed dataset
+never serves old results: the first lookup that sees a new version drops
+every entry. Only sources that can report a version cheaply are cached
+(see DataSource.dataset_version).
+"""
+
+import json
+from typing import Optional
+
+import pandas as pd
+
+from core.config import settings
+from core.llm_cache import LRUCache
+from core.metrics import Counter, Gauge, registry
+
+
+def canonical_intent(intent: dict) -> str:
+    """Order-insensitive form of the intent fields that affect the result."""
+    return json.dumps(
+        {
+            "metrics": sorted(set(intent.get("metrics", []))),
+            "filters": intent.get("filters", {}),
+            "group_by": sorted(set(intent.get("group_by", []))),
+            "thresholds": intent.get("thresholds", {}),
+            "limit": intent.get("limit"),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+def make_result_key(intent: dict, version: str) -> str:
+    return f"{version}|{canonical_intent(intent)}"
+
+
+class ResultCache:
+    def __init__(self, max_entries: int, ttl: int, max_rows: int):
+        self.local = LRUCache(max_entries)
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._version: Optional[str] = None
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "skipped_large": 0, "invalidations": 0}
+
+    def check_version(self, version: str):
+        """Drops all entries when the dataset version changes."""
+        if version != self._version:
+            if self._version is not None:
+                self.local.clear()
+                self.stats["invalidations"] += 1
+            self._version = version
+
+    def get(self, key: str) -> Optional[tuple[pd.DataFrame, list[str]]]:
+        value = self.local.get(key)
+        self.stats["hits" if value is not None else "misses"] += 1
+        return value
+
+    def set(self, key: str, data: pd.DataFrame, insights: list[str]):
+        if len(data) > self.max_rows:
+            self.stats["skipped_large"] += 1
+            return
+        self.local.set(key, (data, insights), self.ttl)
+        self.stats["stores"] += 1
+
+    def clear(self):
+        self.local.clear()
+
+    def snapshot(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self.local),
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+result_cache = ResultCache(
+    settings.CLASSWORK_RESULT_CACHE_MAX_ENTRIES,
+    settings.CLASSWORK_RESULT_CACHE_TTL_SECONDS,
+    settings.CLASSWORK_RESULT_CACHE_MAX_ROWS,
+)
+
+
+def _collect_result_cache_metrics():
+    lookups = Counter("classwork_result_cache_total", "Classwork result cache events", ("event",))
+    for event, value in result_cache.stats.items():
+        lookups.inc(event, amount=value)
+    entries = Gauge("classwork_result_cache_entries", "Classwork results held in this worker")
+    entries.set(len(result_cache.local))
+    return [lookups, entries]
+
+
+registry.register_collector(_collect_result_cache_metrics)
@@ -0,0 +1,127 @@
+# classwork/risk_store.py
+
+"""
+Materialized per-student risk for the SQL data source.
+
+student_risk holds one row per student: a flag per analytics.RISK_RULES
+entry and their sum, indexed on (risk_score desc, id). It is derived from
+attendance_table and marks_table:
+
+- rebuild_risk(): bulk INSERT ... SELECT for every student (after a load).
+- record_metric_rows(): writes attendance/marks rows and recomputes only
+  those students, in the caller's transaction.
+
+Every change bumps student_risk_version. A classwork query is a single
+SELECT over the source and risk tables, so it reads one consistent
+snapshot; the version also keys the classwork result cache.
+"""
+
+from functools import reduce
+
+from sqlalchemy import case, delete, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from classwork.analytics import RISK_RULES
+from models.classwork import Attendance, Marks, RiskVersion, StudentMetadata, StudentRisk
+
+RISK = StudentRisk.__table__
+VERSION = RiskVersion.__table__
+
+# Rule / metric column -> table it lives in
+METRIC_TABLES = {
+    "attendance_pct": Attendance.__table__,
+    "cumulative_gpa": Marks.__table__,
+}
+
+# Ids per IN (...) clause, well below driver bound-parameter limits
+# (SQLite 32766, asyncpg 32767)
+IN_CHUNK = 1000
+
+for _column, _, _ in RISK_RULES:
+    if f"flag_{_column}" not in RISK.c:
+        raise RuntimeError(f"student_risk has no flag column for risk rule on {_column!r}")
+
+
+def _chunks(ids: list[int]):
+    for start in range(0, len(ids), IN_CHUNK):
+        yield ids[start:start + IN_CHUNK]
+
+
+async def current_version(conn: AsyncConnection) -> int | None:
+    """None until the risk table has been built."""
+    return (await conn.execute(select(VERSION.c.version).where(VERSION.c.id == 1))).scalar_one_or_none()
+
+
+async def bump_version(conn: AsyncConnection) -> int:
+    result = await conn.execute(update(VERSION).where(VERSION.c.id == 1).values(version=VERSION.c.version + 1))
+    if result.rowcount == 0:
+        await conn.execute(insert(VERSION).values(id=1, version=1))
+    return await current_version(conn)
+
+
+def _risk_select(version: int, ids: list[int] | None = None):
+    """Computed risk rows, in student_risk's column order."""
+    base = StudentMetadata.__table__
+    joined = base
+    for table in dict.fromkeys(METRIC_TABLES.values()):
+        joined = joined.outerjoin(table, table.c.id == base.c.id)
+
+    flags = {
+        f"flag_{column}": case((METRIC_TABLES[column].c[column] < threshold, 1), else_=0)
+        for column, threshold, _ in RISK_RULES
+    }
+    query = select(
+        base.c.id,
+        *[flag.label(name) for name, flag in flags.items()],
+        reduce(lambda a, b: a + b, flags.values()).label("risk_score"),
+        literal(version).label("version"),
+    ).select_from(joined)
+    if ids is not None:
+        query = query.where(base.c.id.in_(ids))
+    return query, ["id", *flags, "risk_score", "version"]
+
+
+async def _write_risk(conn: AsyncConnection, ids: list[int] | None = None) -> int:
+    version = await bump_version(conn)
+    if ids is None:
+        await conn.execute(delete(RISK))
+        query, columns = _risk_select(version)
+        await conn.execute(insert(RISK).from_select(columns, query))
+        return version
+
+    for chunk in _chunks(ids):
+        await conn.execute(delete(RISK).where(RISK.c.id.in_(chunk)))
+        query, columns = _risk_select(version, chunk)
+        await conn.execute(insert(RISK).from_select(columns, query))
+    return version
+
+
+async def rebuild_risk(conn: AsyncConnection) -> int:
+    """Recomputes every student's risk; returns the new version."""
+    return await _write_risk(conn)
+
+
+async def record_metric_rows(conn: AsyncConnection, column: str, rows: list[dict]) -> dict:
+    """
+    Upserts {"id", <column>} rows into the metric's table and refreshes the
+    risk of those students only. Unknown student ids are skipped.
+    """
+    table = METRIC_TABLES[column]
+    values = {int(row["id"]): row[column] for row in rows}
+    ids = list(values)
+
+    students = StudentMetadata.__table__
+    known = set()
+    for chunk in _chunks(ids):
+        known.update((await conn.execute(select(students.c.id).where(students.c.id.in_(chunk)))).scalars())
+    unknown = [i for i in ids if i not in known]
+    ids = [i for i in ids if i in known]
+    if not ids:
+        return {"updated": 0, "unknown_ids": unknown, "version": await current_version(conn)}
+
+    # Delete + insert: an upsert that behaves the same on Postgres and SQLite
+    for chunk in _chunks(ids):
+        await conn.execute(delete(table).where(table.c.id.in_(chunk)))
+    await conn.execute(insert(table), [{"id": i, column: values[i]} for i in ids])
+    version = await _write_risk(conn, ids)
+    return {"updated": len(ids), "unknown_ids": unknown, "version": version}
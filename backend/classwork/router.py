@@ -1,10 +1,14 @@
+import math
+
 from fastapi import APIRouter, Depends, HTTPException
+from core.config import settings
 from core.deps import role_required
 # from core.auth import get_current_user # Commented out DB dependency
-from ace_graphs.classwork_graph import classwork_graph
+from ace_graphs.lazy import GRAPHS
 from typing import Optional
 
 router = APIRouter(prefix="/classwork", tags=["Classwork"])
+classwork_graph = GRAPHS["classwork"]  # compiled on first use
 
 # MOCK User to bypass DB requirements for Excel mode
 class MockUser:
@@ -30,15 +34,25 @@ async def classwork_chat(
     # current_user=Depends(get_current_user) # OLD DB-dependent auth
     current_user=Depends(get_mock_user)      # NEW Mock auth
 ):
+    """
+    Body: {"message": "...", "page_size": 25, "sort": "risk", "cursor": null}
+    Returns one page of students (top N by risk by default); pass
+    page.next_cursor back with the same message for the next page.
+    """
+    # pandas-backed classwork modules load on first use, not at app import
+    from classwork.response import parse_page_request
+
     message = body.get("message")
     if not message:
         raise HTTPException(status_code=400, detail="Message required")
+    page_request = parse_page_request(body)
 
     # Prepare graph state
     initial_state = {
         "user_query": message,
         "role": current_user.role_id, 
-        "context": {"user_id": current_user.id}
+        "context": {"user_id": current_user.id},
+        "page_request": page_request,
     }
 
     # Run graph
@@ -46,4 +60,79 @@ async def classwork_chat(
 
     return {
         "reply": result.get("final_response"),
+        **result.get("structured_response", {}),
     }
+
+
+# ---------------------------
+#   Attendance / marks uploads
+# ---------------------------
+
+# Accepted range per uploaded metric, and how values are stored
+# (attendance_table.attendance_pct is an integer column)
+METRIC_RANGES = {
+    "attendance_pct": (0.0, 100.0, round),
+    "cumulative_gpa": (0.0, 10.0, float),
+}
+MAX_REPORTED_ROW_ERRORS = 50
+
+
+def _row_error(row, column: str) -> Optional[str]:
+    if not isinstance(row, dict):
+        return "row must be an object"
+    student_id, value = row.get("id"), row.get(column)
+    if isinstance(student_id, bool) or not isinstance(student_id, int):
+        return "'id' must be an integer"
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return f"'{column}' must be a number"
+    low, high, _ = METRIC_RANGES[column]
+    if not low <= value <= high:
+        return f"'{column}' must be between {low:g} and {high:g}"
+    return None
+
+
+def validate_metric_rows(column: str, body: dict) -> list[dict]:
+    """{"id": int, <column>: number in range} rows, or a 400 listing the bad ones."""
+    rows = body.get("rows")
+    if not isinstance(rows, list) or not rows:
+        raise HTTPException(status_code=400, detail="rows must be a non-empty list")
+    if len(rows) > settings.CLASSWORK_UPLOAD_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many rows ({len(rows)} > {settings.CLASSWORK_UPLOAD_MAX_ROWS}); split the upload",
+        )
+
+    errors = []
+    for index, row in enumerate(rows):
+        error = _row_error(row, column)
+        if error:
+            errors.append({"index": index, "error": error})
+    if errors:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": f"{len(errors)} invalid rows", "rows": errors[:MAX_REPORTED_ROW_ERRORS]},
+        )
+    convert = METRIC_RANGES[column][2]
+    return [{"id": row["id"], column: convert(row[column])} for row in rows]
+
+
+async def _record_metric(column: str, body: dict):
+    rows = validate_metric_rows(column, body)
+
+    from classwork.data_source import get_data_source
+
+    source = get_data_source()
+    if source.name != "sql":
+        raise HTTPException(status_code=409, detail="Uploads require CLASSWORK_DATA_SOURCE=sql")
+    # Source rows and the affected students' risk change in one transaction
+    return await source.record_metric_rows(column, rows)
+
+@router.post("/attendance")
+async def upload_attendance(body: dict, user = Depends(role_required("faculty"))):
+    """Body: {"rows": [{"id": 101, "attendance_pct": 72}, ...]}"""
+    return await _record_metric("attendance_pct", body)
+
+@router.post("/marks")
+async def upload_marks(body: dict, user = Depends(role_required("faculty"))):
+    """Body: {"rows": [{"id": 101, "cumulative_gpa": 6.4}, ...]}"""
+    return await _record_metric("cumulative_gpa", body)
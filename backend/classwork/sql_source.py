@@ -0,0 +1,161 @@
+# classwork/sql_source.py
+
+"""
+SqlDataSource: the classwork tables in Postgres (or any async SQLAlchemy
+database). Filters, joins, ORDER BY risk and LIMIT are compiled into one
+SELECT, so only result rows cross the wire. Risk flags come from the
+materialized student_risk table (risk_store.py) instead of being
+recomputed per query.
+"""
+
+import time
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, literal, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.logger import get_logger
+from classwork import risk_store
+from classwork.analytics import RISK_RULES
+from classwork.data_source import DataSource
+from classwork.plan_executor import DATASETS, RANGE_OPS, dataset_for_column
+from models.classwork import Attendance, Marks, StudentMetadata
+
+logger = get_logger("classwork.data_source")
+
+# Logical dataset -> table
+TABLES = {
+    "student_metadata": StudentMetadata.__table__,
+    "attendance_table": Attendance.__table__,
+    "marks_table": Marks.__table__,
+}
+
+
+class SqlDataSource(DataSource):
+    name = "sql"
+
+    def __init__(self, url: str = ""):
+        self._url = url
+        self._engine: AsyncEngine | None = None
+        self._read_engine: AsyncEngine | None = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """Writes (metric uploads)."""
+        if self._engine is None:
+            if self._url:
+                from core.db import create_engine
+
+                self._engine = create_engine(self._url, "classwork")
+            else:
+                from core.db import engine
+
+                self._engine = engine
+        return self._engine
+
+    @property
+    def read_engine(self) -> AsyncEngine:
+        """Queries; the app's read replica when using DATABASE_URL."""
+        if self._read_engine is None:
+            if self._url:
+                self._read_engine = self.engine
+            else:
+                from core.db import read_engine
+
+                self._read_engine = read_engine
+        return self._read_engine
+
+    def _from_clause(self, plan: dict):
+        """student_metadata joined to student_risk and the datasets the plan needs."""
+        base = TABLES["student_metadata"]
+        joined = base.join(risk_store.RISK, risk_store.RISK.c.id == base.c.id)
+        for dataset in plan["datasets"]:
+            if dataset == "student_metadata":
+                continue
+            table = TABLES[dataset]
+            # A filter on the joined table drops unmatched students anyway
+            predicates = list(plan["filters"]) + [r["column"] for r in plan.get("ranges", [])]
+            filtered = any(column in DATASETS[dataset] for column in predicates)
+            joined = joined.join(table, table.c.id == base.c.id, isouter=not filtered)
+        return joined
+
+    def _column(self, column: str):
+        return TABLES[dataset_for_column(column)].c[column]
+
+    def _where(self, plan: dict) -> list:
+        return [self._column(column) == value for column, value in plan["filters"].items()] + [
+            RANGE_OPS[r["op"]](self._column(r["column"]), r["value"]) for r in plan.get("ranges", [])
+        ]
+
+    def build_query(self, plan: dict):
+        """One SELECT for the whole plan: filters, risk flags, order, limit."""
+        # Only the rules whose metric the plan loaded, as in score_risk
+        risk = risk_store.RISK
+        flags = {
+            f"flag_{column}": risk.c[f"flag_{column}"]
+            for column, _, _ in RISK_RULES
+            if column in plan["columns"]
+        }
+        if len(flags) == len(RISK_RULES):
+            # Every rule: the materialized, indexed total
+            risk_score = risk.c.risk_score
+        else:
+            risk_score = reduce(lambda a, b: a + b, flags.values()) if flags else literal(0)
+
+        query = (
+            select(
+                *[self._column(column) for column in plan["columns"]],
+                *[flag.label(name) for name, flag in flags.items()],
+                risk_score.label("risk_score"),
+            )
+            .select_from(self._from_clause(plan))
+            .where(*self._where(plan))
+            # Same order as score_risk: risk descending, ties in id order
+            # (student_risk's id, so the order matches its indexes)
+            .order_by(risk_score.desc(), risk.c.id)
+        )
+        if plan.get("limit"):
+            query = query.limit(plan["limit"])
+        return query
+
+    async def dataset_version(self) -> str | None:
+        async with self.read_engine.connect() as conn:
+            version = await risk_store.current_version(conn)
+        return None if version is None else f"risk-{version}"
+
+    async def record_metric_rows(self, column: str, rows: list[dict]) -> dict:
+        """Attendance/marks upload: source rows and their risk in one transaction."""
+        async with self.engine.begin() as conn:
+            return await risk_store.record_metric_rows(conn, column, rows)
+
+    async def estimate_rows(self, plan: dict) -> int | None:
+        query = select(func.count()).select_from(self._from_clause(plan)).where(*self._where(plan))
+        async with self.read_engine.connect() as conn:
+            return (await conn.execute(query)).scalar_one()
+
+    async def fetch(self, plan: dict) -> pd.DataFrame:
+        started = time.perf_counter()
+        query = self.build_query(plan)
+        async with self.read_engine.connect() as conn:
+            result = await conn.execute(query)
+            rows = result.all()
+            data = pd.DataFrame(rows, columns=list(result.keys()))
+
+        # Match score_risk's dtypes
+        for name in data.columns:
+            if name.startswith("flag_"):
+                data[name] = data[name].to_numpy(dtype=bool)
+        data["risk_score"] = data["risk_score"].to_numpy(dtype=np.int8)
+
+        logger.debug(
+            "Executed SQL plan datasets=%s filters=%s ranges=%s rows=%d elapsed_ms=%.2f",
+            plan["datasets"], plan["filters"], plan.get("ranges"), len(data), (time.perf_counter() - started) * 1000,
+        )
+        return data
+
+    async def close(self):
+        # Only dispose an engine this source created
+        if self._engine is not None and self._url:
+            await self._engine.dispose()
@@ -1,23 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException,status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from datetime import timedelta
 
 from core.db import get_db
-from core.auth_utils import verify_password, create_access_token
+from core.auth_utils import ahash_password, averify_password, create_access_token, password_needs_rehash
 from core.config import settings
+from core.user_cache import AuthUser, user_cache
 from models.user import User
 from models.role import Role
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from core.auth_utils import decode_access_token
 
+# Auth dependencies live in core.deps; re-exported for existing imports
+from core.deps import get_current_user, oauth2_scheme, require_role, role_required  # noqa: F401
 
-router = APIRouter(prefix="/auth", tags=["Auth"])
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+router = APIRouter(prefix="/auth", tags=["Auth"])
 
 @router.post("/login")
 async def login(
@@ -33,10 +31,15 @@ async def login(
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    # Verify password
-    if not verify_password(form_data.password, user.password):
+    # Verify password (Argon2, off the event loop)
+    if not await averify_password(form_data.password, user.password):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
+    # Upgrade cheap/old hashes (e.g. bulk-provisioned initial passwords)
+    if password_needs_rehash(user.password):
+        user.password = await ahash_password(form_data.password)
+        await db.commit()
+
     # Get role name
     role = await db.get(Role, user.role_id)
     if not role:
@@ -45,16 +48,20 @@ async def login(
     # Token expiry
     expires = timedelta(minutes=settings.JWT_EXPIRE_MINUTES)
 
-    # Create JWT token with email & role name
+    # Create JWT token with email & role; role checks trust these claims
     token = create_access_token(
         data={
             "sub": user.email,
             "role": role.name,
+            "role_id": user.role_id,
             "user_id": user.id
         },
         expires_delta=expires,
     )
 
+    # Warm the user cache for get_current_user
+    user_cache.set(AuthUser(id=user.id, email=user.email, role_id=user.role_id, role=role.name))
+
     return {
         "access_token": token,
         "token_type": "bearer",
@@ -64,41 +71,3 @@ async def login(
             "role": role.name
         }
     }
-
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-):
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-        )
-
-    user_id = payload.get("user_id")
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    # Fetch user
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    return user
-
-# Role-based guard
-def require_role(*allowed_roles):
-    async def role_checker(current_user = Depends(get_current_user)):
-        user_role = current_user.role_id  # numeric role_id (1,2,3,4)
-
-        if user_role not in allowed_roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have permission to access this resource"
-            )
-        return current_user
-
-    return role_checker
\ No newline at end of file
@@ -1,10 +1,16 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 
+from fastapi import HTTPException
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from core.config import settings
+from core.metrics import registry
 
 
 # Password hashing (Argon2)
@@ -20,6 +26,93 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+# Generated initial passwords (bulk provisioning) are random, ~96 bits, so
+# a slow KDF adds nothing for them: they are hashed with cheap Argon2
+# parameters (<1 ms) and re-hashed with the full ones on first login.
+initial_password_hasher = pwd_context.handler("argon2").using(memory_cost=512, rounds=1, parallelism=1)
+
+def hash_initial_password(password: str) -> str:
+    return initial_password_hasher.hash(password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True for hashes made with other parameters than pwd_context's."""
+    return pwd_context.needs_update(hashed_password)
+
+def hash_password_batch(items: list[tuple[str, bool]]) -> list[str]:
+    """(password, generated) pairs -> hashes. Runs in provisioning worker processes."""
+    return [hash_initial_password(p) if generated else hash_password(p) for p, generated in items]
+
+
+# ---------------------------
+#   Hashing off the event loop
+# ---------------------------
+# An Argon2 hash is tens to hundreds of ms of CPU (and 64 MiB of memory).
+# argon2-cffi releases the GIL, so a small thread pool keeps the loop
+# serving other requests during a login burst. The pool size caps
+# concurrent hashes; logins queue for a worker, and past
+# AUTH_HASH_MAX_QUEUE waiting they are rejected with a 503.
+
+HASH_QUEUE_SECONDS = registry.histogram(
+    "auth_hash_queue_seconds", "Time a password hash waited for a worker", ("op",),
+)
+HASH_DURATION = registry.histogram(
+    "auth_hash_duration_seconds", "Password hash/verify CPU time", ("op",),
+)
+HASH_IN_FLIGHT = registry.gauge("auth_hash_in_flight", "Password hashes queued or running", ("op",))
+HASH_REJECTED = registry.counter("auth_hash_rejected_total", "Hashes rejected: queue full", ("op",))
+
+HASH_WORKERS = (
+    settings.AUTH_HASH_WORKERS if settings.AUTH_HASH_WORKERS is not None
+    else max(1, (os.cpu_count() or 2) - 1)
+)
+_hash_executor = (
+    ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="argon2")
+    if HASH_WORKERS > 0 else None
+)
+_hash_pending = 0
+
+
+async def _run_hash(op: str, fn: Callable, *args):
+    global _hash_pending
+    if _hash_pending >= HASH_WORKERS + settings.AUTH_HASH_MAX_QUEUE:
+        HASH_REJECTED.inc(op)
+        raise HTTPException(status_code=503, detail="Too many logins, retry shortly", headers={"Retry-After": "1"})
+
+    submitted = time.perf_counter()
+
+    def timed():
+        started = time.perf_counter()
+        HASH_QUEUE_SECONDS.observe(started - submitted, op)
+        try:
+            return fn(*args)
+        finally:
+            HASH_DURATION.observe(time.perf_counter() - started, op)
+
+    if _hash_executor is None:
+        return timed()
+
+    _hash_pending += 1
+    HASH_IN_FLIGHT.inc(op)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, timed)
+    finally:
+        _hash_pending -= 1
+        HASH_IN_FLIGHT.dec(op)
+
+
+async def ahash_password(password: str) -> str:
+    return await _run_hash("hash", hash_password, password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hash("verify", verify_password, plain_password, hashed_password)
+
+
+def close_hash_executor():
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+
+
 # Create JWT token
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -5,9 +5,127 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
     JWT_EXPIRE_MINUTES: int
+    # Role checks trust the token's role claims (valid until the token
+    # expires); False re-reads the user's role on every request
+    AUTH_TRUST_TOKEN_CLAIMS: bool = True
+    # Per-worker cache of user records for get_current_user
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 4096
+    AUTH_USER_CACHE_TTL_SECONDS: int = 300
+    # Argon2 hashing runs in a thread pool off the event loop.
+    # None = CPU count - 1 (min 1), leaving a core for the loop; 0 = inline
+    AUTH_HASH_WORKERS: int | None = None
+    # Logins waiting for a hash worker beyond this get a 503
+    AUTH_HASH_MAX_QUEUE: int = 256
+
+    # Bulk student provisioning (POST /admin/users/bulk, scripts/provision_students.py)
+    PROVISION_HASH_PROCESSES: int | None = None  # None = CPU count; 0 or 1 = hash in a thread
+    PROVISION_BATCH_SIZE: int = 1000  # rows per INSERT / COPY
+    PROVISION_MAX_ROWS: int = 50_000
+    PROVISION_DEFAULT_ROLE: str = "student"
+
+    # Database (async SQLAlchemy URL). DATABASE_READ_URL is an optional
+    # read replica for get_read_db; empty means reads use the primary.
+    DATABASE_URL: str = ""
+    DATABASE_READ_URL: str = ""
+    DB_ECHO: bool = False  # logs every statement; for local debugging only
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # wait for a free connection before erroring
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # Postgres statement_timeout; 0 = server default
+    # asyncpg prepared-statement cache; 0 behind PgBouncer in transaction mode
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # LLM provider: "groq" or "fake" (offline, deterministic; for benchmarks)
+    LLM_PROVIDER: str = "groq"
+    LLM_FAKE_LATENCY_MEDIAN_MS: float = 300.0
+    LLM_FAKE_LATENCY_SIGMA: float = 0.5
+    LLM_FAKE_TOKENS_PER_SECOND: float = 400.0
+    LLM_FAKE_SEED: int = 0
 
     # Groq LLM
-    GROQ_API_KEY: str
+    GROQ_API_KEY: str = ""
+    LLM_MODEL: str = "llama-3.1-8b-instant"
+    LLM_TEMPERATURE: float = 0.2
+    LLM_TIMEOUT_SECONDS: float = 30.0
+    LLM_MAX_RETRIES: int = 3
+    LLM_MAX_CONCURRENCY: int = 64  # in-flight completions per worker
+    LLM_MAX_CONNECTIONS: int = 100  # pooled HTTP connections to the provider
+
+    # Token accounting / budgets for user input pasted into prompts
+    LLM_TOKENIZER_ENCODING: str = "cl100k_base"
+    LLM_DEFAULT_INPUT_TOKEN_BUDGET: int = 1024
+    LLM_INPUT_TOKEN_BUDGETS: dict[str, int] = {
+        "supervisor": 256,
+        "department_query": 256,
+    }
+
+    # Redis. Timeouts keep a hung Redis from stalling cache lookups;
+    # a timed-out read counts as a miss.
+    REDIS_URL: str | None = None
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.25
+    REDIS_CONNECT_TIMEOUT_SECONDS: float = 0.5
+
+    # LLM response cache (in-process LRU + Redis)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 2048
+    LLM_CACHE_DEFAULT_TTL_SECONDS: int = 3600
+    # Per-route TTLs; 0 disables caching for that route
+    LLM_CACHE_ROUTE_TTLS: dict[str, int] = {
+        "supervisor": 6 * 3600,
+        "faq": 6 * 3600,
+        "application_tracking": 3600,
+        "department_query": 6 * 3600,
+        "admin_action": 0,
+    }
+
+    # Admissions local intent router
+    INTENT_ROUTER_ENABLED: bool = True
+    INTENT_ROUTER_MIN_CONFIDENCE: float = 0.35
+    INTENT_ROUTER_MIN_MARGIN: float = 0.1
+    # Score given to a route whose regex rule matches (margin still applies)
+    INTENT_ROUTER_RULE_CONFIDENCE: float = 0.9
+    INTENT_ROUTER_TRAINING_FILE: str | None = None  # JSONL of {"message", "route"}
+    # Include user messages in intent_fallback logs (training data); off by default
+    INTENT_ROUTER_LOG_MESSAGES: bool = False
+
+    # Bulk chat endpoints
+    BATCH_MAX_ITEMS: int = 5000
+    BATCH_DEFAULT_CONCURRENCY: int = 16
+    BATCH_MAX_CONCURRENCY: int = 64
+    # One batch can fan out to thousands of LLM calls: staff roles only
+    BATCH_ALLOWED_ROLES: list[str] = ["admin", "faculty", "coordinator"]
+
+    # Graphs compile on first use; these are loaded at worker startup
+    # instead (["all"] for every graph). See ace_graphs/lazy.py.
+    GRAPH_WARMUP: list[str] = []
+
+    # Graph tracing
+    TRACE_SAMPLE_RATE: float = 0.01  # fraction of requests whose spans are recorded
+    TRACE_BUFFER_SIZE: int = 200  # finished traces kept in memory
+    TRACE_MAX_SPANS: int = 5000  # per trace (bulk endpoints can produce many)
+
+    # Classwork dataset (paths relative to backend/)
+    CLASSWORK_DATA_PATH: str = "data/student_data.xlsx"
+    CLASSWORK_CACHE_DIR: str = "data/.cache"
+    # Logical dataset -> file, for datasets stored separately (joined on id)
+    CLASSWORK_DATASET_PATHS: dict[str, str] = {}
+    # Where classwork queries run: "file" (the dataset above) or "sql"
+    CLASSWORK_DATA_SOURCE: str = "file"
+    # Database for the "sql" source; empty means the app's DATABASE_URL
+    CLASSWORK_SQL_URL: str = ""
+    # Rows per classwork chat reply (the default page is the top N by risk)
+    CLASSWORK_PAGE_SIZE: int = 25
+    CLASSWORK_MAX_PAGE_SIZE: int = 500
+    # Scored results per (intent, dataset version); larger results are not kept
+    CLASSWORK_RESULT_CACHE_MAX_ENTRIES: int = 128
+    CLASSWORK_RESULT_CACHE_TTL_SECONDS: int = 3600
+    CLASSWORK_RESULT_CACHE_MAX_ROWS: int = 200_000
+    # Rows per attendance/marks upload request
+    CLASSWORK_UPLOAD_MAX_ROWS: int = 5000
+    # Synonyms, filters, metrics and comparators for classwork questions
+    CLASSWORK_NLQ_RULES_PATH: str = "classwork/nlq_rules.json"
 
     class Config:
         env_file = ".env"
@@ -1,27 +1,128 @@
-import os
-from dotenv import load_dotenv
+import time
 
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-# Base class for all models
+from core.config import settings
+from core.metrics import Gauge, registry
 
-load_dotenv()
+# Base class for all models
 Base = declarative_base()
-DATABASE_URL = os.getenv("DATABASE_URL")
-# Async engine for PostgreSQL
-engine = create_async_engine(
-    DATABASE_URL,  # Update with your database URL
-    echo=True,  # shows SQL queries in terminal, helpful for debugging
+
+DB_SESSIONS_ACTIVE = registry.gauge("db_sessions_active", "Open request-scoped DB sessions", ("engine",))
+DB_POOL_CHECKOUT = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time to get a pooled connection (queue wait, connect, pre-ping)",
+    ("engine",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
 )
+DB_POOL_WAITING = registry.gauge("db_pool_waiting", "Checkouts waiting for a pooled connection", ("engine",))
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times checkouts; labelled by pool_logging_name."""
+
+    def connect(self):
+        name = self.logging_name or "primary"
+        DB_POOL_WAITING.inc(name)
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT.observe(time.perf_counter() - started, name)
+            DB_POOL_WAITING.dec(name)
+
+
+# ---------------------------
+#   Engine factory
+# ---------------------------
+
+def create_engine(url: str, name: str = "primary") -> AsyncEngine:
+    """Async engine configured from the DB_* settings."""
+    url = make_url(url)
+    kwargs = {"echo": settings.DB_ECHO, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+    connect_args = {}
+
+    # In-memory SQLite shares one connection (StaticPool); no pool to size
+    if not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")):
+        kwargs.update(
+            poolclass=InstrumentedPool,
+            pool_logging_name=name,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+
+    if url.get_driver_name() == "asyncpg":
+        connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+        # SQLAlchemy's own prepared-statement cache sits on top of asyncpg's
+        url = url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+        )
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    elif url.get_backend_name() == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+    return create_async_engine(url, connect_args=connect_args, **kwargs)
+
 
-# Async session factory
+engine = create_engine(settings.DATABASE_URL)
+# Reads that tolerate replica lag; the primary when no replica is configured
+READ_ENGINE_NAME = "replica" if settings.DATABASE_READ_URL else "primary"
+read_engine = create_engine(settings.DATABASE_READ_URL, "replica") if settings.DATABASE_READ_URL else engine
+
+# Async session factories
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     expire_on_commit=False,
-)   
+)
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    expire_on_commit=False,
+)
+
+
+def _collect_pool_metrics():
+    gauge = Gauge("db_pool_connections", "DB connection pool state", ("engine", "state"))
+    for name, eng in {"primary": engine, READ_ENGINE_NAME: read_engine}.items():
+        pool = eng.sync_engine.pool
+        # NullPool/StaticPool do not track sizes
+        if hasattr(pool, "checkedout"):
+            gauge.set(pool.size(), name, "size")
+            gauge.set(pool.checkedout(), name, "checked_out")
+            gauge.set(pool.checkedin(), name, "checked_in")
+            gauge.set(pool.overflow(), name, "overflow")
+    return [gauge]
+
+
+registry.register_collector(_collect_pool_metrics)
+
+
+async def close_db():
+    if read_engine is not engine:
+        await read_engine.dispose()
+    await engine.dispose()
+
 
 # Dependency for FastAPI routes
 async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
+    DB_SESSIONS_ACTIVE.inc("primary")
+    try:
+        async with AsyncSessionLocal() as session:
+            yield session
+    finally:
+        DB_SESSIONS_ACTIVE.dec("primary")
+
+
+# Read-only dependency: routes that only read and can tolerate replica lag
+async def get_read_db():
+    DB_SESSIONS_ACTIVE.inc(READ_ENGINE_NAME)
+    try:
+        async with ReadSessionLocal() as session:
+            yield session
+    finally:
+        DB_SESSIONS_ACTIVE.dec(READ_ENGINE_NAME)
@@ -1,58 +1,118 @@
+"""
+Auth dependencies shared by every router.
+
+The login token carries user_id, email (sub), role and role_id. Role
+checks trust those signed claims, so a protected request needs no DB
+round trip; a role change applies to new tokens. With
+AUTH_TRUST_TOKEN_CLAIMS=False roles come from the per-worker user cache:
+the change applies at once in the worker that made it and in other
+workers once their entry expires (AUTH_USER_CACHE_TTL_SECONDS). Full
+user records (get_current_user) come from the same cache, then the DB.
+"""
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from core.auth_utils import decode_access_token
+from core.config import settings
 from core.db import get_db
+from core.user_cache import AUTH_CHECKS, AuthUser, user_cache
 from models.user import User
 from models.role import Role
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
-):
+async def get_token_claims(token: str = Depends(oauth2_scheme)) -> dict:
     # Decode JWT
     payload = decode_access_token(token)
     if not payload:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-    user_id = payload.get("user_id")
-    if not user_id:
+    if not payload.get("user_id"):
         raise HTTPException(status_code=401, detail="Token missing user ID")
 
-    # Fetch user
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    return payload
+
+
+async def load_user(db: AsyncSession, user_id: int) -> AuthUser | None:
+    """User + role name, from the cache or one DB query."""
+    user = user_cache.get(user_id)
+    if user is not None:
+        AUTH_CHECKS.inc("cache")
+        return user
+
+    AUTH_CHECKS.inc("db")
+    result = await db.execute(
+        select(User.id, User.email, User.role_id, Role.name)
+        .outerjoin(Role, Role.id == User.role_id)
+        .where(User.id == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+
+    user = AuthUser(id=row.id, email=row.email, role_id=row.role_id, role=row.name)
+    user_cache.set(user)
+    return user
+
 
+async def get_current_user(
+    claims: dict = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_db),
+) -> AuthUser:
+    user = await load_user(db, claims["user_id"])
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
-
     return user
 
 
-# ROLE CHECKER
-def role_required(required_role: str):
+async def _authorized_user(claims: dict, db: AsyncSession, claim: str) -> AuthUser:
+    """The user from the token when it carries `claim`, else from the cache/DB."""
+    if settings.AUTH_TRUST_TOKEN_CLAIMS and claims.get(claim) is not None:
+        AUTH_CHECKS.inc("claims")
+        return AuthUser.from_claims(claims)
+    return await get_current_user(claims, db)
+
+
+# ROLE CHECKER (by role name)
+def role_required(*required_roles: str):
     async def role_checker(
-        user: User = Depends(get_current_user),
+        claims: dict = Depends(get_token_claims),
         db: AsyncSession = Depends(get_db),
     ):
-        # Load role name for the user
-        result = await db.execute(select(Role).where(Role.id == user.role_id))
-        role = result.scalar_one_or_none()
+        user = await _authorized_user(claims, db, "role")
 
-        if not role:
+        if not user.role:
             raise HTTPException(status_code=403, detail="Role not found")
 
-        if role.name != required_role:
+        if user.role not in required_roles:
+            expected = " or ".join(f"'{role}'" for role in required_roles)
             raise HTTPException(
                 status_code=403,
-                detail=f"Requires '{required_role}' role. Current: '{role.name}'",
+                detail=f"Requires {expected} role. Current: '{user.role}'",
             )
 
         return user
 
     return role_checker
+
+
+# ROLE CHECKER (by numeric role_id)
+def require_role(*allowed_roles):
+    async def role_checker(
+        claims: dict = Depends(get_token_claims),
+        db: AsyncSession = Depends(get_db),
+    ):
+        user = await _authorized_user(claims, db, "role_id")
+
+        if user.role_id not in allowed_roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have permission to access this resource"
+            )
+        return user
+
+    return role_checker
@@ -0,0 +1,128 @@
+# core/fake_llm.py
+
+"""
+Offline, deterministic stand-in for the Groq chat model, used for
+benchmarks and load tests (LLM_PROVIDER=fake). Replies depend only on the
+prompt; latency follows a log-normal distribution around a configurable
+median, plus output time at a fixed token rate.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import time
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+ADMISSION_ROUTES = ["faq", "application_tracking", "department_query", "admin_action"]
+DEPARTMENTS = ["cse", "it", "ece", "eee", "mechanical", "civil", "not_department"]
+VOCABULARY = (
+    "admission eligibility counselling documents fee hostel scholarship semester "
+    "department branch application status process deadline campus students "
+    "please note the following details for your reference and next steps"
+).split()
+
+
+def _prompt_seed(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+
+
+def canned_reply(prompt: str) -> str:
+    """Deterministic reply shaped like what each graph node expects."""
+    seed = _prompt_seed(" ".join(prompt.split()))
+    if "PUBLIC SUPERVISOR AGENT" in prompt:
+        return ADMISSION_ROUTES[seed % len(ADMISSION_ROUTES)]
+    if "DEPARTMENT ROUTING AGENT" in prompt:
+        return DEPARTMENTS[seed % len(DEPARTMENTS)]
+
+    rng = random.Random(seed)
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(40, 120))]
+    return " ".join(words).capitalize() + "."
+
+
+class FakeChatModel(BaseChatModel):
+    latency_median_ms: float = 300.0
+    latency_sigma: float = 0.5  # log-normal shape; 0 = constant latency
+    tokens_per_second: float = 400.0
+    seed: int = 0
+
+    _rng: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-deterministic"
+
+    def _sample_latency(self) -> float:
+        if self._rng is None:
+            self._rng = random.Random(self.seed)
+        median = self.latency_median_ms / 1000
+        if self.latency_sigma <= 0:
+            return median
+        return self._rng.lognormvariate(math.log(median), self.latency_sigma)
+
+    @staticmethod
+    def _prompt_text(messages: list[BaseMessage]) -> str:
+        return "\n".join(str(m.content) for m in messages)
+
+    def _tokens(self, text: str) -> list[str]:
+        words = text.split(" ")
+        return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text = canned_reply(self._prompt_text(messages))
+        time.sleep(self._sample_latency() + len(self._tokens(text)) / self.tokens_per_second)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text = canned_reply(self._prompt_text(messages))
+        await asyncio.sleep(self._sample_latency() + len(self._tokens(text)) / self.tokens_per_second)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        text = canned_reply(self._prompt_text(messages))
+        time.sleep(self._sample_latency())
+        for token in self._tokens(text):
+            time.sleep(1 / self.tokens_per_second)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        text = canned_reply(self._prompt_text(messages))
+        await asyncio.sleep(self._sample_latency())
+        for token in self._tokens(text):
+            await asyncio.sleep(1 / self.tokens_per_second)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
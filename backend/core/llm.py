@@ -1,18 +1,168 @@
 # core/llm.py
 
-from langchain_groq import ChatGroq
+import asyncio
+import functools
+import time
+
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
 from core.config import settings
+from core.llm_cache import llm_cache, make_cache_key, ttl_for_route
+from core.metrics import Counter, Gauge, LLM_ERRORS, LLM_REQUEST_DURATION, registry
+from core.singleflight import SingleFlight
+from core.tokens import count_tokens, token_ledger
+
+
+@functools.cache
+def retryable_errors() -> tuple:
+    """Errors worth retrying: network blips, timeouts, 429s and 5xx from Groq."""
+    # groq / langchain_groq take ~0.7s to import; only pay it on first LLM use
+    from groq import APIConnectionError, InternalServerError, RateLimitError
 
-# Initialize Groq LLM
-groq_llm = ChatGroq(
-    model="llama-3.1-8b-instant",    # Best model on Groq
-    groq_api_key=settings.GROQ_API_KEY,
-    temperature=0.2,
+    return (APIConnectionError, InternalServerError, RateLimitError, asyncio.TimeoutError)
+
+
+# One pooled HTTP client shared by every call in this worker
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+    ),
+    timeout=settings.LLM_TIMEOUT_SECONDS,
 )
 
-async def call_llm(prompt: str):
+
+def build_chat_model():
+    """Chat model for the configured LLM_PROVIDER."""
+    if settings.LLM_PROVIDER == "fake":
+        from core.fake_llm import FakeChatModel
+
+        return FakeChatModel(
+            latency_median_ms=settings.LLM_FAKE_LATENCY_MEDIAN_MS,
+            latency_sigma=settings.LLM_FAKE_LATENCY_SIGMA,
+            tokens_per_second=settings.LLM_FAKE_TOKENS_PER_SECOND,
+            seed=settings.LLM_FAKE_SEED,
+        )
+
+    if settings.LLM_PROVIDER != "groq":
+        raise ValueError(f"Unknown LLM_PROVIDER: {settings.LLM_PROVIDER!r}")
+
+    from langchain_groq import ChatGroq
+
+    # Initialize Groq LLM (retries are handled below, not by the SDK)
+    return ChatGroq(
+        model=settings.LLM_MODEL,
+        groq_api_key=settings.GROQ_API_KEY,
+        temperature=settings.LLM_TEMPERATURE,
+        max_retries=0,
+        http_async_client=http_client,
+    )
+
+
+_chat_model = None
+
+
+def get_chat_model():
+    """The worker's chat model, built on first use."""
+    global _chat_model
+    if _chat_model is None:
+        _chat_model = build_chat_model()
+    return _chat_model
+
+
+# Caps concurrent upstream completions so a traffic spike queues here
+# instead of opening hundreds of sockets to the provider.
+llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+
+# Identical prompts that are already in flight share one upstream request
+llm_singleflight = SingleFlight()
+
+
+async def _invoke(prompt: str, timeout: float, tag: str):
+    async with llm_semaphore:
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(get_chat_model().ainvoke(prompt), timeout=timeout)
+        except Exception as e:
+            LLM_ERRORS.inc(tag, type(e).__name__)
+            raise
+        finally:
+            LLM_REQUEST_DURATION.observe(time.perf_counter() - start, tag)
+
+
+async def _fetch(prompt: str, key: str, ttl: int, timeout: float, tag: str) -> str:
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(settings.LLM_MAX_RETRIES),
+        wait=wait_random_exponential(multiplier=0.5, max=8),
+        retry=retry_if_exception_type(retryable_errors()),
+        reraise=True,
+    ):
+        with attempt:
+            response = await _invoke(prompt, timeout, tag)
+
+    content = response.content
+    token_ledger.record_upstream(tag, count_tokens(prompt), count_tokens(content))
+    if ttl > 0:
+        await llm_cache.set(key, content, ttl)
+    return content
+
+
+async def call_llm(
+    prompt: str,
+    route: str | None = None,
+    graph: str = "default",
+    timeout: float | None = None,
+) -> str:
     """
     Generic helper for all LangGraph agents.
+    Non-blocking: uses the async Groq client, retries transient failures
+    with jittered exponential backoff and enforces a per-attempt timeout.
+    Responses are cached per `route` (see LLM_CACHE_ROUTE_TTLS), and
+    concurrent identical prompts are coalesced into one upstream call.
+    Token usage is recorded under "<graph>.<route>".
     """
-    response = groq_llm.invoke(prompt)
-    return response.content
+    tag = f"{graph}.{route or 'default'}"
+    token_ledger.record_call(tag)
+    ttl = ttl_for_route(route) if settings.LLM_CACHE_ENABLED else 0
+    key = make_cache_key(settings.LLM_MODEL, settings.LLM_TEMPERATURE, prompt)
+    if ttl > 0:
+        cached = await llm_cache.get(key)
+        if cached is not None:
+            return cached
+
+    timeout = timeout or settings.LLM_TIMEOUT_SECONDS
+    return await llm_singleflight.do(key, lambda: _fetch(prompt, key, ttl, timeout, tag))
+
+
+def _collect_llm_metrics():
+    cache = Counter("llm_cache_lookups_total", "LLM response cache lookups", ("result",))
+    for result in ("local_hits", "redis_hits", "misses", "redis_errors"):
+        cache.inc(result, amount=llm_cache.stats[result])
+
+    coalesced = Counter("llm_singleflight_total", "Upstream LLM calls started vs coalesced", ("kind",))
+    for kind, value in llm_singleflight.stats.items():
+        coalesced.inc(kind, amount=value)
+
+    inflight = Gauge("llm_singleflight_inflight", "Distinct LLM prompts currently in flight")
+    inflight.set(len(llm_singleflight))
+
+    tokens = Counter("llm_tokens_total", "Tokens sent to / received from the provider", ("tag", "direction"))
+    for tag, usage in token_ledger.usage.items():
+        tokens.inc(tag, "in", amount=usage["tokens_in"])
+        tokens.inc(tag, "out", amount=usage["tokens_out"])
+
+    return [cache, coalesced, inflight, tokens]
+
+
+registry.register_collector(_collect_llm_metrics)
+
+
+async def close_llm():
+    """Release pooled connections on shutdown."""
+    await http_client.aclose()
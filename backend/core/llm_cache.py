@@ -0,0 +1,123 @@
+# core/llm_cache.py
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from core.config import settings
+from core.logger import get_logger
+from core.redis_client import redis_client
+
+logger = get_logger("llm_cache")
+
+KEY_PREFIX = "llm:resp:"
+
+
+def make_cache_key(model: str, temperature: float, prompt: str) -> str:
+    """
+    Key = model + temperature + prompt with whitespace collapsed, so the
+    indentation of the f-string prompts in ace_graphs/ does not matter.
+    """
+    normalized = " ".join(prompt.split())
+    raw = f"{model}|{temperature}|{normalized}"
+    return KEY_PREFIX + hashlib.sha256(raw.encode()).hexdigest()
+
+
+def ttl_for_route(route: Optional[str]) -> int:
+    if route is None:
+        return settings.LLM_CACHE_DEFAULT_TTL_SECONDS
+    return settings.LLM_CACHE_ROUTE_TTLS.get(route, settings.LLM_CACHE_DEFAULT_TTL_SECONDS)
+
+
+class LRUCache:
+    """Bounded in-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, ttl: int):
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache: L1 is a per-worker LRU, L2 is Redis shared by all
+    workers. Redis failures degrade to L1-only instead of failing the call.
+    """
+
+    def __init__(self, max_entries: int, redis=None):
+        self.local = LRUCache(max_entries)
+        self.redis = redis
+        self.stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "redis_errors": 0}
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self.local.get(key)
+        if value is not None:
+            self.stats["local_hits"] += 1
+            return value
+
+        if self.redis is not None:
+            try:
+                value = await self.redis.get(key)
+                if value is not None:
+                    # Promote into L1 for the remaining Redis TTL
+                    ttl = await self.redis.ttl(key)
+                    self.local.set(key, value, ttl if ttl > 0 else settings.LLM_CACHE_DEFAULT_TTL_SECONDS)
+                    self.stats["redis_hits"] += 1
+                    return value
+            except RedisError as e:
+                self.stats["redis_errors"] += 1
+                logger.warning("Redis cache read failed: %s", e)
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: str, ttl: int):
+        if ttl <= 0:
+            return
+        self.local.set(key, value, ttl)
+        if self.redis is not None:
+            try:
+                await self.redis.set(key, value, ex=ttl)
+            except RedisError as e:
+                self.stats["redis_errors"] += 1
+                logger.warning("Redis cache write failed: %s", e)
+
+    def snapshot(self) -> dict:
+        lookups = self.stats["local_hits"] + self.stats["redis_hits"] + self.stats["misses"]
+        hits = lookups - self.stats["misses"]
+        return {
+            **self.stats,
+            "local_entries": len(self.local),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+llm_cache = LLMResponseCache(settings.LLM_CACHE_MAX_ENTRIES, redis=redis_client)
@@ -0,0 +1,12 @@
+# core/logger.py
+
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)-5.5s [%(name)s] %(message)s",
+)
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(f"vnr_ace.{name}")
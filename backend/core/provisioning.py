@@ -0,0 +1,269 @@
+# core/provisioning.py
+
+"""
+Bulk student account provisioning from a CSV.
+
+CSV columns: email (required), password and role (optional). A blank
+password gets a random initial password, returned in `credentials`;
+a blank role means PROVISION_DEFAULT_ROLE.
+
+1. Validate every row: email format, duplicates in the file, unknown
+   roles, accounts that already exist. Bad rows are reported, not fatal.
+2. Hash passwords across a process pool (Argon2 is CPU-bound). Generated
+   passwords use the cheap initial-password parameters; supplied ones
+   use the full parameters (see core/auth_utils.py).
+3. Insert in batches of PROVISION_BATCH_SIZE, one transaction each:
+   COPY on asyncpg, a multi-row INSERT elsewhere. A batch that hits a
+   unique violation (an account created meanwhile) is retried row by
+   row so only the conflicting rows fail.
+"""
+
+import asyncio
+import csv
+import io
+import multiprocessing
+import os
+import re
+import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from core.auth_utils import hash_password_batch
+from core.config import settings
+from core.logger import get_logger
+from core.metrics import registry
+from models.role import Role
+from models.user import User
+
+logger = get_logger("provisioning")
+
+USERS = User.__table__
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+# Rows per hashing task sent to a worker process
+HASH_CHUNK = 64
+
+USERS_PROVISIONED = registry.counter(
+    "users_provisioned_total", "Bulk-provisioned accounts by outcome", ("result",),
+)
+
+
+@dataclass
+class ProvisionRow:
+    line: int  # CSV line number, header = 1
+    email: str
+    password: str
+    role_id: int
+    generated: bool  # password was generated here
+
+
+# ---------------------------
+#   Validation
+# ---------------------------
+
+def parse_csv(text: str, role_ids: dict[str, int]) -> tuple[list[ProvisionRow], list[dict]]:
+    """Valid rows and per-row errors. Raises ValueError for an unusable file."""
+    reader = csv.DictReader(io.StringIO(text))
+    columns = {(name or "").strip().lower() for name in reader.fieldnames or []}
+    if "email" not in columns:
+        raise ValueError("CSV needs an 'email' column (optional: password, role)")
+
+    rows, errors, seen = [], [], set()
+    for line, raw in enumerate(reader, start=2):
+        if line - 1 > settings.PROVISION_MAX_ROWS:
+            raise ValueError(f"At most {settings.PROVISION_MAX_ROWS} rows per upload")
+        record = {(k or "").strip().lower(): (v or "").strip() for k, v in raw.items()}
+        email = record.get("email", "").lower()
+        role = record.get("role") or settings.PROVISION_DEFAULT_ROLE
+
+        if not EMAIL_RE.match(email):
+            errors.append({"line": line, "email": email, "error": "invalid email"})
+        elif email in seen:
+            errors.append({"line": line, "email": email, "error": "duplicate email in file"})
+        elif role not in role_ids:
+            errors.append({"line": line, "email": email, "error": f"unknown role {role!r}"})
+        else:
+            seen.add(email)
+            password = record.get("password", "")
+            generated = not password
+            rows.append(ProvisionRow(
+                line, email, password or secrets.token_urlsafe(12), role_ids[role], generated,
+            ))
+    return rows, errors
+
+
+async def _existing_emails(conn: AsyncConnection, emails: list[str]) -> set[str]:
+    """Lowercased emails (as parsed) that already have an account, in any case."""
+    found = set()
+    stored = func.lower(USERS.c.email)
+    for start in range(0, len(emails), settings.PROVISION_BATCH_SIZE):
+        chunk = emails[start:start + settings.PROVISION_BATCH_SIZE]
+        found.update((await conn.execute(select(stored).where(stored.in_(chunk)))).scalars())
+    return found
+
+
+# ---------------------------
+#   Hashing
+# ---------------------------
+
+# One long-lived pool per process: spawning workers (and their imports)
+# costs about a second, and shutting a pool down waits for them to exit,
+# which must not happen on the event loop.
+_hash_pool: ProcessPoolExecutor | None = None
+_hash_pool_size = 0
+_hash_pool_lock = threading.Lock()
+
+
+def _get_hash_pool(processes: int) -> tuple[ProcessPoolExecutor, ProcessPoolExecutor | None]:
+    """The shared pool, resized if needed; also returns a replaced pool to shut down."""
+    global _hash_pool, _hash_pool_size
+    with _hash_pool_lock:
+        replaced = None
+        if _hash_pool is None or _hash_pool_size != processes:
+            replaced = _hash_pool
+            # spawn: forking a process that runs an event loop and DB threads is unsafe
+            _hash_pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+            _hash_pool_size = processes
+        return _hash_pool, replaced
+
+
+def close_hash_pool():
+    """Stops the worker processes (app shutdown / end of the CLI)."""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=True, cancel_futures=True)
+            _hash_pool = None
+
+
+async def hash_rows(rows: list[ProvisionRow], processes: int | None = None) -> list[str]:
+    """Password hashes for rows, in order, computed across worker processes."""
+    if processes is None:
+        processes = settings.PROVISION_HASH_PROCESSES
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    items = [(row.password, row.generated) for row in rows]
+    # One process gains nothing over a thread and pays the spawn + import
+    if processes <= 1 or len(items) <= HASH_CHUNK:
+        return await asyncio.to_thread(hash_password_batch, items)
+
+    pool, replaced = _get_hash_pool(processes)
+    if replaced is not None:
+        await asyncio.to_thread(replaced.shutdown, wait=True)
+    chunks = [items[i:i + HASH_CHUNK] for i in range(0, len(items), HASH_CHUNK)]
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*(loop.run_in_executor(pool, hash_password_batch, c) for c in chunks))
+    return [hashed for chunk in results for hashed in chunk]
+
+
+# ---------------------------
+#   Insert
+# ---------------------------
+
+def _integrity_errors(engine: AsyncEngine) -> tuple:
+    errors = (IntegrityError,)
+    if engine.dialect.driver == "asyncpg":
+        from asyncpg.exceptions import IntegrityConstraintViolationError
+
+        errors += (IntegrityConstraintViolationError,)
+    return errors
+
+
+async def _insert_batch(conn: AsyncConnection, records: list[dict]):
+    if conn.dialect.driver == "asyncpg":
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            USERS.name,
+            records=[(r["email"], r["password"], r["role_id"]) for r in records],
+            columns=["email", "password", "role_id"],
+        )
+    else:
+        await conn.execute(insert(USERS), records)
+
+
+async def insert_users(engine: AsyncEngine, rows: list[ProvisionRow], hashes: list[str]) -> tuple[list[ProvisionRow], list[dict]]:
+    """Created rows and per-row errors."""
+    created, errors = [], []
+    conflict = _integrity_errors(engine)
+    size = settings.PROVISION_BATCH_SIZE
+    for start in range(0, len(rows), size):
+        batch = rows[start:start + size]
+        records = [
+            {"email": row.email, "password": hashed, "role_id": row.role_id}
+            for row, hashed in zip(batch, hashes[start:start + size])
+        ]
+        try:
+            async with engine.begin() as conn:
+                await _insert_batch(conn, records)
+            created.extend(batch)
+            continue
+        except conflict:
+            logger.info("Batch at row %d conflicted; inserting row by row", batch[0].line)
+
+        for row, record in zip(batch, records):
+            try:
+                async with engine.begin() as conn:
+                    await conn.execute(insert(USERS), [record])
+                created.append(row)
+            except IntegrityError:
+                errors.append({"line": row.line, "email": row.email, "error": "already exists"})
+    return created, errors
+
+
+# ---------------------------
+#   Entry point
+# ---------------------------
+
+async def provision_students(
+    csv_text: str,
+    engine: AsyncEngine | None = None,
+    dry_run: bool = False,
+    processes: int | None = None,
+) -> dict:
+    if engine is None:
+        from core.db import engine
+    started = time.perf_counter()
+
+    async with engine.connect() as conn:
+        role_ids = {name: id_ for id_, name in (await conn.execute(select(Role.id, Role.name))).all()}
+        rows, errors = parse_csv(csv_text, role_ids)
+        total = len(rows) + len(errors)
+        existing = await _existing_emails(conn, [row.email for row in rows])
+    if existing:
+        errors += [{"line": r.line, "email": r.email, "error": "already exists"} for r in rows if r.email in existing]
+        rows = [row for row in rows if row.email not in existing]
+    validated = time.perf_counter()
+
+    created, hashed_at = [], validated
+    if rows and not dry_run:
+        hashes = await hash_rows(rows, processes)
+        hashed_at = time.perf_counter()
+        created, insert_errors = await insert_users(engine, rows, hashes)
+        errors += insert_errors
+    finished = time.perf_counter()
+
+    USERS_PROVISIONED.inc("created", amount=len(created))
+    USERS_PROVISIONED.inc("failed", amount=len(errors))
+    elapsed = finished - started
+    return {
+        "rows": total,
+        "created": len(created),
+        "failed": len(errors),
+        "dry_run": dry_run,
+        "errors": sorted(errors, key=lambda e: e["line"]),
+        # Only generated passwords; supplied ones are already known to the admin
+        "credentials": [{"email": r.email, "initial_password": r.password} for r in created if r.generated],
+        "timing": {
+            "validate_s": round(validated - started, 3),
+            "hash_s": round(hashed_at - validated, 3),
+            "insert_s": round(finished - hashed_at, 3),
+            "total_s": round(elapsed, 3),
+        },
+        "users_per_sec": round(len(created) / elapsed, 1) if elapsed and created else 0.0,
+    }
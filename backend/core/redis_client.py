@@ -0,0 +1,23 @@
+# core/redis_client.py
+
+import redis.asyncio as redis
+
+from core.config import settings
+
+# Shared async Redis client (None when REDIS_URL is not configured).
+# from_url() is lazy: no connection is opened until the first command.
+redis_client = (
+    redis.from_url(
+        settings.REDIS_URL,
+        decode_responses=True,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+    )
+    if settings.REDIS_URL
+    else None
+)
+
+
+async def close_redis():
+    if redis_client is not None:
+        await redis_client.aclose()
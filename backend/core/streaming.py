@@ -0,0 +1,153 @@
+# core/streaming.py
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Callable, Iterable
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from core.config import settings
+from core.logger import get_logger
+
+logger = get_logger("streaming")
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # stop nginx from buffering the stream
+}
+
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_graph_events(
+    graph,
+    initial_state: dict,
+    token_nodes: Iterable[str] = (),
+    result_keys: Iterable[str] = (),
+) -> AsyncIterator[str]:
+    """
+    Runs a compiled LangGraph and yields SSE frames:
+      start  - sent immediately so the client gets its first byte at once
+      node   - a node finished (progress)
+      token  - an LLM token produced inside one of `token_nodes`
+      done   - final values for `result_keys`
+      error  - the run failed
+    """
+    token_nodes = set(token_nodes)
+    state = dict(initial_state)
+
+    yield sse_event("start", {})
+
+    try:
+        async for mode, chunk in graph.astream(initial_state, stream_mode=["updates", "messages"]):
+            if mode == "messages":
+                message, metadata = chunk
+                node = metadata.get("langgraph_node")
+                if node in token_nodes and message.content:
+                    yield sse_event("token", {"node": node, "text": message.content})
+            elif mode == "updates":
+                for node, update in chunk.items():
+                    if update:
+                        state.update(update)
+                    yield sse_event("node", {"node": node})
+    except Exception as e:
+        logger.exception("Graph stream failed")
+        yield sse_event("error", {"detail": str(e)})
+        return
+
+    yield sse_event("done", {key: state.get(key) for key in result_keys})
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+def ndjson_line(data: Any) -> str:
+    return json.dumps(data, default=str) + "\n"
+
+
+async def stream_graph_batch(
+    graph,
+    states: list[dict],
+    result_fn: Callable[[dict], dict],
+    concurrency: int,
+) -> AsyncIterator[str]:
+    """
+    Runs every state through a compiled graph with at most `concurrency`
+    runs in flight, yielding one NDJSON line per item as it finishes
+    (completion order, tagged with its input `index`). A failing item
+    yields an error line without affecting the others. The last line is
+    a summary with overall throughput.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+
+    async def run_one(index: int, state: dict) -> dict:
+        async with semaphore:
+            t0 = time.perf_counter()
+            try:
+                result = await graph.ainvoke(state)
+                item = {"index": index, "ok": True, "result": result_fn(result)}
+            except Exception as e:
+                logger.warning("Batch item %d failed: %s", index, e)
+                item = {"index": index, "ok": False, "error": str(e)}
+            item["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+            return item
+
+    tasks = [asyncio.ensure_future(run_one(i, state)) for i, state in enumerate(states)]
+    succeeded = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            item = await next_done
+            succeeded += item["ok"]
+            yield ndjson_line(item)
+    finally:
+        # Client went away mid-batch: stop the remaining runs
+        for task in tasks:
+            task.cancel()
+
+    elapsed = time.perf_counter() - started
+    yield ndjson_line({
+        "summary": {
+            "total": len(states),
+            "succeeded": succeeded,
+            "failed": len(states) - succeeded,
+            "elapsed_s": round(elapsed, 3),
+            "items_per_sec": round(len(states) / elapsed, 2) if elapsed else None,
+        }
+    })
+
+
+def ndjson_response(lines: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(lines, media_type="application/x-ndjson", headers=SSE_HEADERS)
+
+
+def parse_batch_body(body: dict) -> tuple[list[str], int]:
+    """
+    Validates {"messages": [...], "concurrency": n} against the configured
+    limits; returns (messages, concurrency). Every message must be a
+    non-blank string.
+    """
+    messages = body.get("messages")
+    if not isinstance(messages, list) or not messages:
+        raise HTTPException(status_code=400, detail="messages must be a non-empty list")
+    if len(messages) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large ({len(messages)} > {settings.BATCH_MAX_ITEMS})",
+        )
+    invalid = [i for i, message in enumerate(messages) if not isinstance(message, str) or not message.strip()]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": "messages must be non-empty strings", "invalid_indexes": invalid[:50]},
+        )
+
+    concurrency = body.get("concurrency") or settings.BATCH_DEFAULT_CONCURRENCY
+    if not isinstance(concurrency, int) or concurrency < 1:
+        raise HTTPException(status_code=400, detail="concurrency must be a positive integer")
+    return messages, min(concurrency, settings.BATCH_MAX_CONCURRENCY)
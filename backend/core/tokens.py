@@ -0,0 +1,113 @@
+# core/tokens.py
+
+import threading
+from collections import defaultdict
+
+from core.config import settings
+from core.logger import get_logger
+
+logger = get_logger("tokens")
+
+TRUNCATION_MARKER = " [...] "
+
+
+# tiktoken's cl100k_base is not Llama's tokenizer, but it is close enough
+# for budgeting. Loading it may download the encoding file on first use, so
+# it never happens on the request path: the app loads it at startup in a
+# thread (load_encoding), and any earlier caller starts that load in the
+# background and meanwhile counts ~4 chars/token. If the load fails (e.g.
+# no network), counts stay approximate.
+_encoding_state = {"encoding": None, "attempted": False}
+_encoding_lock = threading.Lock()
+
+
+def load_encoding():
+    """Blocking; returns the encoding or None if it cannot be loaded."""
+    with _encoding_lock:
+        if not _encoding_state["attempted"]:
+            try:
+                import tiktoken
+                _encoding_state["encoding"] = tiktoken.get_encoding(settings.LLM_TOKENIZER_ENCODING)
+            except Exception as e:
+                logger.warning("tiktoken unavailable, approximating token counts: %s", e)
+            _encoding_state["attempted"] = True
+    return _encoding_state["encoding"]
+
+
+def _encoding():
+    """The loaded encoding, or None (approximate) while it is not loaded."""
+    if not _encoding_state["attempted"] and not _encoding_lock.locked():
+        threading.Thread(target=load_encoding, name="tiktoken-load", daemon=True).start()
+    return _encoding_state["encoding"]
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    enc = _encoding()
+    if enc is None:
+        return len(text) // 4 + 1
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def budget_for_route(route: str | None) -> int:
+    return settings.LLM_INPUT_TOKEN_BUDGETS.get(route, settings.LLM_DEFAULT_INPUT_TOKEN_BUDGET)
+
+
+def fit_to_budget(text: str, route: str | None = None, max_tokens: int | None = None) -> str:
+    """
+    Keeps user input within the route's token budget before it is pasted
+    into a prompt. First collapses whitespace; if still too long, keeps
+    the head and tail (questions usually sit at either end) and drops the
+    middle.
+    """
+    max_tokens = max_tokens or budget_for_route(route)
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    compact = " ".join(text.split())
+    if count_tokens(compact) <= max_tokens:
+        return compact
+
+    token_ledger.truncations[route or "default"] += 1
+    enc = _encoding()
+    if enc is None:
+        max_chars = max_tokens * 4
+        head = compact[: max_chars * 2 // 3]
+        tail = compact[-(max_chars // 3):]
+        return head + TRUNCATION_MARKER + tail
+
+    tokens = enc.encode(compact, disallowed_special=())
+    head = enc.decode(tokens[: max_tokens * 2 // 3])
+    tail = enc.decode(tokens[-(max_tokens // 3):])
+    return head + TRUNCATION_MARKER + tail
+
+
+class TokenLedger:
+    """Aggregated token usage per "graph.node" tag."""
+
+    def __init__(self):
+        self.usage = defaultdict(lambda: {"calls": 0, "upstream_calls": 0, "tokens_in": 0, "tokens_out": 0})
+        self.truncations = defaultdict(int)
+
+    def record_call(self, tag: str):
+        """Every call_llm invocation, including cache hits and coalesced calls."""
+        self.usage[tag]["calls"] += 1
+
+    def record_upstream(self, tag: str, tokens_in: int, tokens_out: int):
+        """A completion actually sent to the provider."""
+        entry = self.usage[tag]
+        entry["upstream_calls"] += 1
+        entry["tokens_in"] += tokens_in
+        entry["tokens_out"] += tokens_out
+
+    def snapshot(self) -> dict:
+        return {
+            "usage": {tag: dict(entry) for tag, entry in self.usage.items()},
+            "truncations": dict(self.truncations),
+            "total_tokens_in": sum(e["tokens_in"] for e in self.usage.values()),
+            "total_tokens_out": sum(e["tokens_out"] for e in self.usage.values()),
+        }
+
+
+token_ledger = TokenLedger()
@@ -0,0 +1,182 @@
+# core/tracing.py
+
+"""
+Per-request span tracing for LangGraph runs.
+
+A Trace is attached to the current request (via contextvars) by
+RequestIdMiddleware. Only sampled requests (TRACE_SAMPLE_RATE) pay for
+span recording; finished traces are kept in a bounded in-memory buffer
+and can be exported as JSON or Chrome trace format (chrome://tracing,
+Perfetto).
+"""
+
+import itertools
+import json
+import random
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from core.config import settings
+
+current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+current_request_id: ContextVar[Optional[str]] = ContextVar("current_request_id", default=None)
+# Graph run id within the trace; node spans of one run share a lane
+current_run: ContextVar[int] = ContextVar("current_run", default=0)
+
+
+def state_stats(update: Any) -> tuple[int, int]:
+    """
+    (size in bytes, number of records) of a node update. Lists count their
+    items; DataFrames count rows and report their memory footprint.
+    """
+    if not isinstance(update, dict):
+        return 0, 0
+    size = 0
+    records = 0
+    plain = {}
+    for key, value in update.items():
+        if hasattr(value, "memory_usage") and hasattr(value, "columns"):
+            size += int(value.memory_usage(index=False).sum())
+            records += len(value)
+        else:
+            if isinstance(value, list):
+                records += len(value)
+            plain[key] = value
+    size += len(json.dumps(plain, default=str).encode())
+    return size, records
+
+
+class Trace:
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self._run_ids = itertools.count(1)
+        self.spans: list[dict] = []
+        self.dropped = 0
+
+    def next_run_id(self) -> int:
+        return next(self._run_ids)
+
+    def add_span(self, name: str, category: str, start: float, end: float, **attrs):
+        """`start`/`end` are time.perf_counter() values."""
+        if len(self.spans) >= settings.TRACE_MAX_SPANS:
+            self.dropped += 1
+            return
+        self.spans.append({
+            "name": name,
+            "category": category,
+            "run": current_run.get(),
+            "start_us": round((start - self._origin) * 1e6),
+            "duration_us": round((end - start) * 1e6),
+            **attrs,
+        })
+
+    def to_json(self) -> dict:
+        return {
+            "request_id": self.request_id,
+            "started_at": self.started_at,
+            "dropped_spans": self.dropped,
+            "spans": self.spans,
+        }
+
+    def to_chrome_trace(self) -> dict:
+        events = []
+        for span in self.spans:
+            args = {k: v for k, v in span.items() if k not in ("name", "category", "run", "start_us", "duration_us")}
+            events.append({
+                "name": span["name"],
+                "cat": span["category"],
+                "ph": "X",
+                "ts": span["start_us"],
+                "dur": span["duration_us"],
+                "pid": 1,
+                "tid": span["run"],
+                "args": args,
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"request_id": self.request_id},
+        }
+
+
+class TraceStore:
+    """Bounded buffer of finished traces, oldest evicted first."""
+
+    def __init__(self, max_traces: int):
+        self.max_traces = max_traces
+        self._traces: OrderedDict[str, Trace] = OrderedDict()
+
+    def add(self, trace: Trace):
+        self._traces[trace.request_id] = trace
+        while len(self._traces) > self.max_traces:
+            self._traces.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[Trace]:
+        return self._traces.get(request_id)
+
+    def list(self) -> list[dict]:
+        return [
+            {"request_id": t.request_id, "started_at": t.started_at, "spans": len(t.spans)}
+            for t in reversed(self._traces.values())
+        ]
+
+
+trace_store = TraceStore(settings.TRACE_BUFFER_SIZE)
+
+
+@contextmanager
+def start_trace(request_id: Optional[str] = None, sample_rate: Optional[float] = None):
+    """
+    Starts a trace for the enclosed work if sampled. Yields the Trace or
+    None. Usable outside HTTP (scripts, benchmarks) as well.
+    """
+    request_id = request_id or uuid.uuid4().hex
+    rate = settings.TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+    trace = Trace(request_id) if rate > 0 and random.random() < rate else None
+
+    id_token = current_request_id.set(request_id)
+    trace_token = current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        current_trace.reset(trace_token)
+        current_request_id.reset(id_token)
+        if trace is not None and trace.spans:
+            trace_store.add(trace)
+
+
+class RequestIdMiddleware:
+    """
+    Pure ASGI middleware: takes X-Request-ID from the client (or generates
+    one), echoes it on the response and opens a (possibly sampled) trace.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:128]
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        with start_trace(request_id):
+            await self.app(scope, receive, send_wrapper)
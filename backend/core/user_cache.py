@@ -0,0 +1,104 @@
+# core/user_cache.py
+
+"""
+Per-worker TTL cache of the user records auth needs (id, email, role).
+
+Entries are dropped when a User or Role row changes through the ORM in
+this worker (mapper events below). Other workers catch up within
+AUTH_USER_CACHE_TTL_SECONDS; call invalidate_user()/clear() after bulk
+changes that bypass the ORM.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+
+from core.config import settings
+from core.llm_cache import LRUCache
+from core.metrics import Counter, Gauge, registry
+from models.role import Role
+from models.user import User
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    """What routes see as the current user; detached from any session."""
+    id: int
+    email: str
+    role_id: Optional[int]
+    role: Optional[str]
+
+    @classmethod
+    def from_claims(cls, claims: dict) -> "AuthUser":
+        return cls(
+            id=claims["user_id"],
+            email=claims.get("sub"),
+            role_id=claims.get("role_id"),
+            role=claims.get("role"),
+        )
+
+
+class UserCache:
+    def __init__(self, max_entries: int, ttl: int):
+        self.local = LRUCache(max_entries)
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, user_id: int) -> Optional[AuthUser]:
+        user = self.local.get(str(user_id))
+        self.stats["hits" if user is not None else "misses"] += 1
+        return user
+
+    def set(self, user: AuthUser):
+        if self.ttl > 0:
+            self.local.set(str(user.id), user, self.ttl)
+
+    def invalidate_user(self, user_id: int):
+        self.local.delete(str(user_id))
+        self.stats["invalidations"] += 1
+
+    def clear(self):
+        self.local.clear()
+        self.stats["invalidations"] += 1
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_MAX_ENTRIES, settings.AUTH_USER_CACHE_TTL_SECONDS)
+
+
+# ---------------------------
+#   Invalidation
+# ---------------------------
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    user_cache.invalidate_user(target.id)
+
+
+@event.listens_for(Role, "after_update")
+@event.listens_for(Role, "after_delete")
+def _role_changed(mapper, connection, target):
+    # Role names are denormalized into every entry
+    user_cache.clear()
+
+
+# ---------------------------
+#   Metrics
+# ---------------------------
+
+AUTH_CHECKS = registry.counter(
+    "auth_checks_total", "Authenticated requests by where the user/role came from", ("source",)
+)
+
+
+def _collect_user_cache_metrics():
+    events = Counter("auth_user_cache_total", "Auth user cache events", ("event",))
+    for name, value in user_cache.stats.items():
+        events.inc(name, amount=value)
+    entries = Gauge("auth_user_cache_entries", "User records cached in this worker")
+    entries.set(len(user_cache.local))
+    return [events, entries]
+
+
+registry.register_collector(_collect_user_cache_metrics)
@@ -16,9 +16,13 @@ from core.config import settings
 from core.db import Base
 from models.user import User
 from models.role import Role
+from models.classwork import StudentMetadata, Attendance, Marks, StudentRisk, RiskVersion
 
 # Access Alembic Config
 config = context.config
+# Same database as the app (DATABASE_URL / .env), not the alembic.ini placeholder
+if settings.DATABASE_URL:
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
 # Interpret config file for logging
 if config.config_file_name is not None:
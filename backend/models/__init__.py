@@ -2,3 +2,4 @@
 from core.db import Base
 from models.user import User
 from models.role import Role
+from models.classwork import StudentMetadata, Attendance, Marks, StudentRisk, RiskVersion
@@ -0,0 +1,59 @@
+from sqlalchemy import Column, Float, ForeignKey, Index, Integer, String
+from core.db import Base
+
+# Classwork datasets, one table per logical dataset (see
+# classwork/plan_executor.DATASETS). All are keyed by the student id.
+
+class StudentMetadata(Base):
+    __tablename__ = "student_metadata"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    branch = Column(String, index=True)
+    year = Column(Integer, index=True)
+    email = Column(String)
+
+
+class Attendance(Base):
+    __tablename__ = "attendance_table"
+
+    id = Column(Integer, ForeignKey("student_metadata.id"), primary_key=True)
+    attendance_pct = Column(Integer)
+
+
+class Marks(Base):
+    __tablename__ = "marks_table"
+
+    id = Column(Integer, ForeignKey("student_metadata.id"), primary_key=True)
+    cumulative_gpa = Column(Float)
+
+
+# Materialized risk (see classwork/risk_store.py): one row per student,
+# with a flag column per analytics.RISK_RULES entry and their sum.
+# Rebuilt in bulk on load, refreshed per student when attendance or marks
+# rows change.
+
+class StudentRisk(Base):
+    __tablename__ = "student_risk"
+
+    id = Column(Integer, ForeignKey("student_metadata.id"), primary_key=True)
+    flag_attendance_pct = Column(Integer, nullable=False, default=0)
+    flag_cumulative_gpa = Column(Integer, nullable=False, default=0)
+    risk_score = Column(Integer, nullable=False, default=0)
+    # Risk version in which this row was last computed
+    version = Column(Integer, nullable=False, default=0)
+
+    # Top-N by risk is an index scan, for all rules or for either one
+    __table_args__ = (
+        Index("ix_student_risk_score_id", risk_score.desc(), id),
+        Index("ix_student_risk_attendance_id", flag_attendance_pct.desc(), id),
+        Index("ix_student_risk_gpa_id", flag_cumulative_gpa.desc(), id),
+    )
+
+
+class RiskVersion(Base):
+    """Single row; bumped by every change to student_risk."""
+    __tablename__ = "student_risk_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,26 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from typing import List, Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from core.db import get_db
+from core.config import settings
 from core.deps import role_required
-from core.auth import get_current_user
-from ace_graphs import placements_graph
-# Import all graphs dynamically or by name
-from ace_graphs.placements_graph import (
-    dashboard_graph, resume_graph, prep_graph, 
-    shortlisting_graph, tracking_graph, notification_graph
+from core.streaming import (
+    ndjson_response,
+    parse_batch_body,
+    sse_response,
+    stream_graph_batch,
+    stream_graph_events,
 )
+from ace_graphs.lazy import GRAPHS
 
 router = APIRouter(prefix="/placements", tags=["Placements"])
 
-# Map graph_id to actual graph object
+# Map graph_id to its graph (compiled on first use)
 GRAPH_MAP = {
-    "dashboard": dashboard_graph,
-    "resume": resume_graph,
-    "prep": prep_graph,
-    "shortlisting": shortlisting_graph,
-    "tracking": tracking_graph,
-    "notification": notification_graph,
+    "dashboard": GRAPHS["placements_dashboard"],
+    "resume": GRAPHS["placements_resume"],
+    "prep": GRAPHS["placements_prep"],
+    "shortlisting": GRAPHS["placements_shortlisting"],
+    "tracking": GRAPHS["placements_tracking"],
+    "notification": GRAPHS["placements_notification"],
 }
 
 @router.get("/admin")
@@ -31,21 +30,7 @@ async def admin_access(user = Depends(role_required("admin"))):
 async def student_access(user = Depends(role_required("student"))):
     return {"message": "Placements Student Access", "user": user.email}
 
-@router.post("/chat/{graph_id}")
-async def placements_chat(
-    graph_id: str,
-    body: dict,
-    # current_user=Depends(get_current_user), # Bypassing for testing
-    # db: AsyncSession = Depends(get_db)
-):
-    """
-    Invokes the specific graph identified by graph_id.
-    """
-    if graph_id not in GRAPH_MAP:
-        raise HTTPException(status_code=404, detail="Graph not found")
-        
-    target_graph = GRAPH_MAP[graph_id]
-
+def build_initial_state(graph_id: str, body: dict) -> dict:
     message = body.get("message")
     if not message:
         # Default message if none provided (some widgets might just be 'triggers')
@@ -56,7 +41,7 @@ async def placements_chat(
     current_user_role = "student"
 
     # Prepare graph state
-    initial_state = {
+    return {
         "user_id": current_user_id,
         "role": current_user_role, 
         "message": message,
@@ -66,6 +51,22 @@ async def placements_chat(
         "validation_status": None
     }
 
+@router.post("/chat/{graph_id}")
+async def placements_chat(
+    graph_id: str,
+    body: dict,
+    # current_user=Depends(get_current_user), # Bypassing for testing
+    # db: AsyncSession = Depends(get_db)
+):
+    """
+    Invokes the specific graph identified by graph_id.
+    """
+    if graph_id not in GRAPH_MAP:
+        raise HTTPException(status_code=404, detail="Graph not found")
+        
+    target_graph = GRAPH_MAP[graph_id]
+    initial_state = build_initial_state(graph_id, body)
+
     # Run graph
     result = await target_graph.ainvoke(initial_state)
 
@@ -74,6 +75,52 @@ async def placements_chat(
         "graph": graph_id
     }
 
+@router.post("/chat/{graph_id}/stream")
+async def placements_chat_stream(graph_id: str, body: dict):
+    """
+    SSE variant of /chat/{graph_id}: streams node progress and agent
+    tokens, then a final `done` event with the reply.
+    """
+    if graph_id not in GRAPH_MAP:
+        raise HTTPException(status_code=404, detail="Graph not found")
+
+    initial_state = build_initial_state(graph_id, body)
+
+    return sse_response(
+        stream_graph_events(
+            GRAPH_MAP[graph_id],
+            initial_state,
+            token_nodes=(f"{graph_id}_agent",),
+            result_keys=("response", "validation_status"),
+        )
+    )
+
+@router.post("/chat/{graph_id}/batch")
+async def placements_chat_batch(
+    graph_id: str,
+    body: dict,
+    user = Depends(role_required(*settings.BATCH_ALLOWED_ROLES)),
+):
+    """
+    Runs many messages through one placements graph with bounded
+    concurrency, streaming NDJSON results and a throughput summary.
+    Body: {"messages": ["...", ...], "concurrency": 16}
+    """
+    if graph_id not in GRAPH_MAP:
+        raise HTTPException(status_code=404, detail="Graph not found")
+
+    messages, concurrency = parse_batch_body(body)
+    states = [build_initial_state(graph_id, {"message": message}) for message in messages]
+
+    return ndjson_response(
+        stream_graph_batch(
+            GRAPH_MAP[graph_id],
+            states,
+            result_fn=lambda r: {"reply": r.get("response"), "graph": graph_id},
+            concurrency=concurrency,
+        )
+    )
+
 # ---------------------------
 #   NEW FEATURE ENDPOINTS
 # ---------------------------
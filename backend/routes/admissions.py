@@ -1,18 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.db import get_db
-from ace_graphs.admissions_graph import admissions_graph
+from core.config import settings
+from core.deps import role_required
+from core.streaming import (
+    ndjson_response,
+    parse_batch_body,
+    sse_response,
+    stream_graph_batch,
+    stream_graph_events,
+)
+from ace_graphs.lazy import GRAPHS
+from ace_graphs.intent_router import intent_router
+from core.llm import llm_singleflight
+from core.llm_cache import llm_cache
+from core.tokens import token_ledger
 
 
 router = APIRouter(prefix="/admissions", tags=["Admissions"])
+admissions_graph = GRAPHS["admissions"]  # compiled on first use
+
+# Nodes whose LLM output is the user-facing answer (supervisor and
+# department routing only emit classification keys)
+ANSWER_NODES = ("faq", "application_tracking", "admin_action")
 
 
 @router.post("/chat")
-async def admissions_chat(
-    body: dict,
-    db: AsyncSession = Depends(get_db)
-):
+async def admissions_chat(body: dict):
     message = body.get("message")
     if not message:
         raise HTTPException(status_code=400, detail="Message required")
@@ -31,3 +44,71 @@ async def admissions_chat(
         "reply": result.get("reply"),
         "route": result.get("route")   # optional debug info
     }
+
+
+@router.post("/chat/stream")
+async def admissions_chat_stream(body: dict):
+    """
+    SSE variant of /admissions/chat: streams node progress and answer
+    tokens, then a final `done` event with reply and route.
+    """
+    message = body.get("message")
+    if not message:
+        raise HTTPException(status_code=400, detail="Message required")
+
+    initial_state = {
+        "message": message,
+        "reply": None,
+        "route": None,
+    }
+
+    return sse_response(
+        stream_graph_events(
+            admissions_graph,
+            initial_state,
+            token_nodes=ANSWER_NODES,
+            result_keys=("reply", "route"),
+        )
+    )
+
+
+@router.post("/chat/batch")
+async def admissions_chat_batch(
+    body: dict,
+    user = Depends(role_required(*settings.BATCH_ALLOWED_ROLES)),
+):
+    """
+    Runs many messages through the admissions graph with bounded
+    concurrency and streams one NDJSON result per message as it finishes,
+    followed by a throughput summary.
+    Body: {"messages": ["...", ...], "concurrency": 16}
+    """
+    messages, concurrency = parse_batch_body(body)
+
+    states = [
+        {"message": message, "reply": None, "route": None}
+        for message in messages
+    ]
+
+    return ndjson_response(
+        stream_graph_batch(
+            admissions_graph,
+            states,
+            result_fn=lambda r: {"reply": r.get("reply"), "route": r.get("route")},
+            concurrency=concurrency,
+        )
+    )
+
+
+@router.get("/chat/stats")
+async def admissions_chat_stats():
+    """
+    How many supervisor decisions were resolved locally vs by the LLM,
+    plus LLM cache, request-coalescing and token usage counters.
+    """
+    return {
+        "intent_router": intent_router.snapshot(),
+        "llm_cache": llm_cache.snapshot(),
+        "llm_singleflight": llm_singleflight.stats,
+        "tokens": token_ledger.snapshot(),
+    }
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends
-from core.auth import require_role
+from core.deps import require_role
 
 router = APIRouter(prefix="/test", tags=["RBAC Test"])
 
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from core.deps import role_required
+from core.tracing import trace_store
+
+router = APIRouter(prefix="/traces", tags=["Tracing"])
+
+
+@router.get("")
+async def list_traces(user = Depends(role_required("admin"))):
+    """Recently sampled request traces, newest first."""
+    return {"traces": trace_store.list()}
+
+
+@router.get("/{request_id}")
+async def get_trace(
+    request_id: str,
+    format: str = "json",
+    user = Depends(role_required("admin")),
+):
+    """
+    Spans of one traced request. format=chrome returns Chrome trace event
+    JSON that can be loaded into chrome://tracing or Perfetto.
+    """
+    trace = trace_store.get(request_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found (not sampled or evicted)")
+
+    if format == "chrome":
+        return trace.to_chrome_trace()
+    return trace.to_json()
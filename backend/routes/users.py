@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+
+from core.deps import role_required
+from core.provisioning import provision_students
+
+router = APIRouter(prefix="/admin/users", tags=["Users"])
+
+
+@router.post("/bulk")
+async def bulk_provision(
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    user = Depends(role_required("admin")),
+):
+    """
+    Creates student accounts from a CSV (columns: email, optional password
+    and role). Returns per-row errors, generated initial passwords and
+    throughput. dry_run=true only validates.
+    """
+    try:
+        text = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8")
+
+    try:
+        return await provision_students(text, dry_run=dry_run)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
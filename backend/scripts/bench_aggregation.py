@@ -0,0 +1,99 @@
+"""
+Benchmark: classwork filter + risk scoring + high-risk selection,
+row-at-a-time Python (the previous implementation) vs the columnar
+version in classwork/analytics.py. Speedup is measured against the full
+legacy per-request cost, including the to_dict() conversion it needed.
+
+    python scripts/bench_aggregation.py --sizes 1000 10000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Script is in backend/scripts/; make backend/ importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from classwork.analytics import apply_filters, high_risk, score_risk
+
+FILTERS = {"branch": "CSE", "year": 2}
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "name": [f"student_{i}" for i in range(rows)],
+        "branch": rng.choice(["CSE", "ECE", "IT", "EEE", "MECH", "CIVIL"], rows),
+        "year": rng.integers(1, 5, rows),
+        "attendance_pct": rng.integers(40, 99, rows),
+        "cumulative_gpa": rng.uniform(4.0, 9.8, rows).round(2),
+    })
+
+
+def legacy(records: list[dict]) -> int:
+    filtered = [
+        s for s in records
+        if s["branch"] == FILTERS["branch"] and s["year"] == FILTERS["year"]
+    ]
+    for s in filtered:
+        score, reasons = 0, []
+        if s["attendance_pct"] < 75:
+            score += 1
+            reasons.append("Low Attendance")
+        if s["cumulative_gpa"] < 6.0:
+            score += 1
+            reasons.append("Low CGPA")
+        s["risk_score"] = score
+        s["risk_reasons"] = reasons
+    filtered.sort(key=lambda x: x["risk_score"], reverse=True)
+    return len([s for s in filtered if s["risk_score"] >= 2])
+
+
+def columnar(frame: pd.DataFrame) -> int:
+    return len(high_risk(score_risk(apply_filters(frame, FILTERS))))
+
+
+def best_of(fn, arg, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def legacy_with_records(frame: pd.DataFrame) -> int:
+    """What each request used to pay: to_dict() plus the Python loops."""
+    return legacy(frame.to_dict(orient="records"))
+
+
+def main(args):
+    print(
+        f"{'rows':>9}  {'legacy_ms':>10}  {'legacy+to_dict_ms':>17}  "
+        f"{'columnar_ms':>11}  {'speedup':>7}  {'rows/s (columnar)':>17}"
+    )
+    for rows in args.sizes:
+        frame = make_frame(rows)
+        records = frame.to_dict(orient="records")
+        assert legacy(records) == columnar(frame)
+
+        t_legacy = best_of(legacy, records, args.repeat)
+        t_legacy_total = best_of(legacy_with_records, frame, args.repeat)
+        t_columnar = best_of(columnar, frame, args.repeat)
+        print(
+            f"{rows:>9}  {t_legacy * 1000:>10.2f}  {t_legacy_total * 1000:>17.2f}  "
+            f"{t_columnar * 1000:>11.2f}  {t_legacy_total / t_columnar:>6.1f}x  "
+            f"{rows / t_columnar:>17,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
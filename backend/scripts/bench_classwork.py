@@ -0,0 +1,212 @@
+"""
+Classwork benchmark suite: classwork_graph end-to-end and per node, across
+dataset sizes.
+
+Data comes from scripts/generate_data.py (generated once per size/format
+under --data-dir and reused). Each size runs in its own process, so peak
+memory and caches do not leak between sizes. The result cache is off
+unless --result-cache is given, so every run executes the full pipeline.
+
+    python scripts/bench_classwork.py --sizes 1000 10000 100000 1000000
+    python scripts/bench_classwork.py --layout split --json bench.json
+    python scripts/bench_classwork.py --baseline bench.json   # flag regressions
+
+Reported per size: first dataset load, per-query p50/p95 latency,
+rows/sec (dataset rows / p50), result rows, per-node p50 and the
+process's peak RSS.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+# Script is in backend/scripts/; make backend/ importable
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+QUERIES = [
+    "overview of all students",
+    "CSE students 2nd year with low attendance and poor grades",
+    "low att in 2nd year",
+    "top 20 students by cgpa",
+    "students below 65% in IT dept",
+    "cgpa at least 8 and attendance above 90",
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+# ---------------------------
+#   Worker (one size)
+# ---------------------------
+
+def configure_env(paths: dict[str, str], layout: str, cache_dir: str, result_cache: bool):
+    """Must run before any core.* / classwork.* import."""
+    os.environ["CLASSWORK_DATA_SOURCE"] = "file"
+    os.environ["CLASSWORK_CACHE_DIR"] = cache_dir
+    if layout == "split":
+        os.environ["CLASSWORK_DATA_PATH"] = paths["student_metadata"]
+        os.environ["CLASSWORK_DATASET_PATHS"] = json.dumps({
+            "attendance_table": paths["attendance_table"],
+            "marks_table": paths["marks_table"],
+        })
+    else:
+        os.environ["CLASSWORK_DATA_PATH"] = paths["student_data"]
+        os.environ["CLASSWORK_DATASET_PATHS"] = "{}"
+    if not result_cache:
+        os.environ["CLASSWORK_RESULT_CACHE_MAX_ENTRIES"] = "0"
+    os.environ["TRACE_SAMPLE_RATE"] = "0"
+
+
+async def run_worker(args) -> dict:
+    from core.config import settings
+    from core.tracing import start_trace
+    from classwork.dataset_cache import dataset_cache
+    from ace_graphs.classwork_graph import classwork_graph
+
+    # First load: parse the source file(s) and write/map the Arrow snapshot
+    started = time.perf_counter()
+    rows = 0
+    for path in {settings.CLASSWORK_DATA_PATH, *settings.CLASSWORK_DATASET_PATHS.values()}:
+        dataset = await dataset_cache.aget(path)
+        if path == settings.CLASSWORK_DATA_PATH:
+            rows = dataset.num_rows
+    load_ms = (time.perf_counter() - started) * 1000
+
+    queries = {}
+    node_times: dict[str, list[float]] = {}
+    for query in QUERIES:
+        state = {"user_query": query, "role": "admin", "context": {}}
+        await classwork_graph.ainvoke(state)  # warm-up: lazily loaded columns
+        latencies = []
+        for _ in range(args.repeat):
+            with start_trace(sample_rate=1.0) as trace:
+                started = time.perf_counter()
+                result = await classwork_graph.ainvoke(state)
+                latencies.append((time.perf_counter() - started) * 1000)
+            for span in trace.spans:
+                if span["category"] == "node":
+                    node_times.setdefault(span["name"], []).append(span["duration_us"] / 1000)
+        p50 = percentile(latencies, 50)
+        queries[query] = {
+            "p50_ms": round(p50, 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "rows_per_sec": round(rows / (p50 / 1000)),
+            "result_rows": result["structured_response"]["summary"]["total"],
+        }
+
+    return {
+        "rows": rows,
+        "load_ms": round(load_ms, 1),
+        "queries": queries,
+        "nodes_p50_ms": {name: round(percentile(t, 50), 3) for name, t in node_times.items()},
+        # ru_maxrss is KiB on Linux
+        "peak_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+# ---------------------------
+#   Driver
+# ---------------------------
+
+def ensure_data(size: int, fmt: str, data_dir: str, seed: int) -> dict[str, str]:
+    from generate_data import generate
+
+    out_dir = os.path.join(data_dir, f"{fmt}-{size}-seed{seed}")
+    names = ["student_metadata", "attendance_table", "marks_table", "student_data"]
+    paths = {name: os.path.join(out_dir, f"{name}.{fmt}") for name in names}
+    if not all(os.path.exists(p) for p in paths.values()):
+        print(f"Generating {size} students ({fmt}) in {out_dir} ...", file=sys.stderr)
+        generate(size, out_dir, fmt, seed, detail=False)
+    return paths
+
+
+def run_size(size: int, args) -> dict:
+    paths = ensure_data(size, args.format, args.data_dir, args.seed)
+    cmd = [
+        sys.executable, os.path.abspath(__file__), "--worker",
+        "--paths", json.dumps(paths), "--layout", args.layout, "--repeat", str(args.repeat),
+        "--cache-dir", os.path.join(args.data_dir, "cache"),
+    ]
+    if args.result_cache:
+        cmd.append("--result-cache")
+    out = subprocess.run(cmd, cwd=BACKEND_DIR, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"size {size} failed:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def print_report(results: dict):
+    for size, r in results.items():
+        print(f"\n== {int(size):,} students  load {r['load_ms']:.0f} ms  peak RSS {r['peak_rss_mib']:.0f} MiB")
+        print(f"  {'query':58} {'p50 ms':>8} {'p95 ms':>8} {'rows/s':>12} {'result':>8}")
+        for query, q in r["queries"].items():
+            print(f"  {query[:58]:58} {q['p50_ms']:>8.1f} {q['p95_ms']:>8.1f} {q['rows_per_sec']:>12,} {q['result_rows']:>8}")
+        nodes = "  ".join(f"{name}={ms:.2f}" for name, ms in r["nodes_p50_ms"].items())
+        print(f"  node p50 ms: {nodes}")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for size, r in results.items():
+        base = baseline.get(size)
+        if base is None:
+            continue
+        for query, q in r["queries"].items():
+            old = base["queries"].get(query)
+            if old and q["p50_ms"] > old["p50_ms"] * (1 + tolerance):
+                regressions.append(f"{size} {query!r}: p50 {old['p50_ms']} -> {q['p50_ms']} ms")
+        if r["peak_rss_mib"] > base["peak_rss_mib"] * (1 + tolerance):
+            regressions.append(f"{size} peak RSS {base['peak_rss_mib']} -> {r['peak_rss_mib']} MiB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--format", choices=["parquet", "csv", "xlsx"], default="parquet")
+    parser.add_argument("--layout", choices=["unified", "split"], default="unified")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=os.path.join(BACKEND_DIR, "data/.bench"))
+    parser.add_argument("--result-cache", action="store_true", help="keep the classwork result cache on")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging")
+    # Internal: run one size in this process
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--paths", help=argparse.SUPPRESS)
+    parser.add_argument("--cache-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        configure_env(json.loads(args.paths), args.layout, args.cache_dir, args.result_cache)
+        print(json.dumps(asyncio.run(run_worker(args))))
+        return
+
+    results = {str(size): run_size(size, args) for size in args.sizes}
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        print("\nRegressions:" if regressions else "\nNo regressions against the baseline.")
+        for line in regressions:
+            print(f"  {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: classwork NLQ parsing as the rule table grows.
+
+The shipped rule table (classwork/nlq_rules.json) is padded with synthetic
+filter phrases up to each size. For each size it reports the compile time
+and the per-query cost of the compiled trie parser, next to a chain of
+`phrase in query` checks (the previous approach) over the same phrases.
+
+    python scripts/bench_nlq.py --sizes 100 1000 10000 100000
+"""
+
+import argparse
+import copy
+import os
+import random
+import string
+import sys
+import time
+
+# Script is in backend/scripts/; make backend/ importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.config import settings
+from classwork.nlq import NLQParser, load_rules
+
+QUERIES = [
+    "CSE 2nd yr att below 65%",
+    "show cse students with low att",
+    "top 10 final year mech students by cgpa",
+    "students below 65% in IT dept",
+    "cgpa at least 8 and attendance above 90 in ece third year",
+    "which first year students in information technology have poor grades and low attendance this semester",
+]
+
+
+def padded_rules(base: dict, phrases: int, seed: int = 0) -> dict:
+    """The real rules plus synthetic section phrases, `phrases` in total."""
+    rng = random.Random(seed)
+    rules = copy.deepcopy(base)
+    existing = sum(len(r["phrases"]) for r in rules["metrics"])
+    existing += sum(len(r["phrases"]) for values in rules["filters"].values() for r in values)
+    sections = []
+    for i in range(max(0, phrases - existing)):
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8))) for _ in range(rng.randint(1, 3))]
+        sections.append({"value": f"S{i}", "phrases": [" ".join(words)]})
+    rules["filters"]["section"] = sections
+    return rules
+
+
+def all_phrases(rules: dict) -> list[str]:
+    phrases = list(rules["rewrites"])
+    phrases += [p for r in rules["metrics"] for p in r["phrases"]]
+    phrases += [p for values in rules["filters"].values() for r in values for p in r["phrases"]]
+    return phrases
+
+
+def naive(phrases: list[str], query: str) -> int:
+    lowered = query.lower()
+    return sum(1 for phrase in phrases if phrase in lowered)
+
+
+def per_query_us(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            fn(query)
+    return (time.perf_counter() - started) / (repeat * len(QUERIES)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    base = load_rules(settings.CLASSWORK_NLQ_RULES_PATH)
+    print(f"{'phrases':>9} {'compile ms':>11} {'trie us/query':>14} {'naive us/query':>15}")
+    for size in args.sizes:
+        rules = padded_rules(base, size)
+        started = time.perf_counter()
+        nlq = NLQParser(rules)
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        phrases = all_phrases(rules)
+        trie_us = per_query_us(nlq.parse, args.repeat)
+        naive_us = per_query_us(lambda q: naive(phrases, q), max(1, args.repeat * 100 // size))
+        print(f"{nlq.phrases:>9} {compile_ms:>11.1f} {trie_us:>14.1f} {naive_us:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Per-worker memory with the shared, memory-mapped classwork dataset vs a
+private in-process copy (what each worker held before).
+
+Starts N worker processes that each load the dataset and touch every
+column, then reports RSS split into anonymous (private) and file-backed
+(shared page cache) memory, plus PSS, which divides shared pages between
+the processes mapping them. Linux only (/proc).
+
+    python scripts/bench_worker_memory.py --rows 1000000 --workers 1 2 4 8
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def make_dataset(path: str, rows: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        "id": np.arange(rows),
+        "name": [f"student_{i}" for i in range(rows)],
+        "branch": rng.choice(["CSE", "ECE", "IT", "EEE", "MECH", "CIVIL"], rows),
+        "year": rng.integers(1, 5, rows),
+        "attendance_pct": rng.integers(40, 99, rows),
+        "cumulative_gpa": rng.uniform(4.0, 9.8, rows).round(2),
+        "email": [f"student_{i}@vnr.edu.in" for i in range(rows)],
+    }).to_parquet(path, index=False)
+
+
+def memory_kb() -> dict:
+    stats = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile", "RssShmem"):
+                stats[key] = int(value.split()[0])
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                stats["Pss"] = int(line.split()[1])
+    return stats
+
+
+def worker(mode: str, data_path: str, cache_dir: str, ready, release, results):
+    os.environ["CLASSWORK_CACHE_DIR"] = cache_dir
+    for key in ("JWT_SECRET_KEY", "JWT_ALGORITHM"):
+        os.environ.setdefault(key, "bench")
+    os.environ.setdefault("JWT_EXPIRE_MINUTES", "60")
+
+    # Import everything up front so the baseline excludes library code
+    import pyarrow  # noqa: F401
+    from classwork.dataset_cache import dataset_cache
+
+    baseline = memory_kb()
+    if mode == "shared":
+        frame = dataset_cache.get(data_path).frame
+    else:
+        frame = pd.read_parquet(data_path)
+    # Scan every value, as a whole-college query would (min() reads the
+    # data without allocating large temporaries)
+    for column in frame.columns:
+        frame[column].min()
+
+    ready.wait()  # measure while every worker is holding the dataset
+    after = memory_kb()
+    results.put({k: after[k] - baseline.get(k, 0) for k in after})
+    release.wait()
+
+
+def run(mode: str, workers: int, data_path: str, cache_dir: str) -> dict:
+    ctx = mp.get_context("spawn")
+    ready = ctx.Barrier(workers)
+    release = ctx.Barrier(workers + 1)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=worker, args=(mode, data_path, cache_dir, ready, release, results))
+        for _ in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    samples = [results.get() for _ in procs]
+    release.wait()
+    for p in procs:
+        p.join()
+    return {k: sum(s[k] for s in samples) / len(samples) / 1024 for k in samples[0]}
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "students.parquet")
+        cache_dir = os.path.join(tmp, "cache")
+        make_dataset(data_path, args.rows)
+
+        # Build the shared snapshot once, outside the measured workers
+        run("shared", 1, data_path, cache_dir)
+
+        print(f"rows={args.rows:,}  (MiB per worker, growth after loading)")
+        print(f"{'mode':>8}  {'workers':>7}  {'RSS':>8}  {'anon':>8}  {'file':>8}  {'PSS':>8}")
+        for mode in ("private", "shared"):
+            for n in args.workers:
+                r = run(mode, n, data_path, cache_dir)
+                print(
+                    f"{mode:>8}  {n:>7}  {r['VmRSS']:>8.1f}  {r['RssAnon']:>8.1f}  "
+                    f"{r['RssFile']:>8.1f}  {r['Pss']:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Classwork dataset memory per worker")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    main(parser.parse_args())
@@ -1,50 +1,227 @@
+"""
+Seeded synthetic classwork data, from the 30-student demo file up to 1M
+students.
+
+    # The demo dataset (data/student_data.xlsx), as before
+    python scripts/generate_data.py
+
+    # Separate tables at scale, plus a unified file
+    python scripts/generate_data.py --students 100000 --format parquet --out data/generated/100k
+
+With --out, these files are written to that directory:
+    student_metadata    id, name, branch, year, email
+    attendance_detail   id, subject, week, classes_held, classes_attended
+    attendance_table    id, attendance_pct          (from the detail)
+    marks_detail        id, subject, internal, external, total, grade_points
+    marks_table         id, cumulative_gpa          (from the detail)
+    student_data        the above per-student columns in one file
+
+The same --seed always gives the same data. Students are generated in
+chunks, so memory stays bounded at 1M. XLSX is limited to 1,048,575 rows
+per sheet; larger detail tables are skipped in that format.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
 import pandas as pd
-import random
 
-def generate_data():
-    names = ["Aarav", "Bhavna", "Chirag", "Divya", "Esha", "Farhan", "Gauri", "Harsh", "Ishaan", "Jiya", 
-             "Karthik", "Lakshmi", "Manish", "Neha", "Om", "Priya", "Rahul", "Sneha", "Tanvi", "Varun",
-             "Rohan", "Sanya", "Vikram", "Ananya", "Arjun", "Zara", "Vihaan", "Myra", "Reyansh", "Aditi"]
-    
-    departments = ["CSE", "ECE", "IT"]
-    years = [1, 2, 3, 4]
-    
-    data = []
-    for i, name in enumerate(names):
-        dept = random.choice(departments)
-        year = random.choice(years)
-        
-        # Correlate attendance and GPA slightly for realism
-        attendance = random.randint(40, 98)
-        if attendance > 85:
-            gpa = round(random.uniform(7.5, 9.8), 2)
-        elif attendance > 70:
-            gpa = round(random.uniform(6.0, 8.5), 2)
+FIRST_NAMES = [
+    "Aarav", "Bhavna", "Chirag", "Divya", "Esha", "Farhan", "Gauri", "Harsh", "Ishaan", "Jiya",
+    "Karthik", "Lakshmi", "Manish", "Neha", "Om", "Priya", "Rahul", "Sneha", "Tanvi", "Varun",
+    "Rohan", "Sanya", "Vikram", "Ananya", "Arjun", "Zara", "Vihaan", "Myra", "Reyansh", "Aditi",
+]
+LAST_NAMES = [
+    "Reddy", "Rao", "Sharma", "Naidu", "Kumar", "Varma", "Goud", "Iyer", "Patel", "Singh",
+    "Chowdary", "Gupta", "Nair", "Das", "Joshi", "Menon", "Verma", "Yadav", "Shetty", "Pillai",
+]
+BRANCHES = ["CSE", "ECE", "IT", "EEE", "MECH", "CIVIL"]
+BRANCH_WEIGHTS = [0.3, 0.2, 0.2, 0.1, 0.1, 0.1]
+YEARS = [1, 2, 3, 4]
+SUBJECTS = ["MATHS", "PHYSICS", "PROGRAMMING", "ELECTRONICS", "DATA_STRUCTURES", "ENGLISH"]
+
+FIRST_ID = 101
+CHUNK_STUDENTS = 50_000
+XLSX_MAX_ROWS = 1_048_575
+
+# total marks -> grade points (lower bound, points)
+GRADE_POINTS = [(90, 10), (80, 9), (70, 8), (60, 7), (50, 6), (40, 5)]
+
+# Script is in backend/scripts/generate_data.py; demo data in backend/data/
+DEMO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../data/student_data.xlsx")
+
+
+# ---------------------------
+#   Generation
+# ---------------------------
+
+def generate_chunk(rng: np.random.Generator, first_id: int, count: int, weeks: int,
+                   full_names: bool = True) -> dict[str, pd.DataFrame]:
+    """All tables for students first_id .. first_id + count - 1."""
+    ids = np.arange(first_id, first_id + count)
+    first = np.array(FIRST_NAMES)[rng.integers(0, len(FIRST_NAMES), count)]
+    last = np.array(LAST_NAMES)[rng.integers(0, len(LAST_NAMES), count)]
+    names = np.char.add(np.char.add(first, " "), last) if full_names else first
+    metadata = pd.DataFrame({
+        "id": ids,
+        "name": names,
+        "branch": rng.choice(BRANCHES, count, p=BRANCH_WEIGHTS),
+        "year": rng.choice(YEARS, count),
+        "email": [f"{n.split()[0].lower()}.{i}@vnr.edu.in" for n, i in zip(names, ids)],
+    })
+
+    # Attendance: a per-student propensity, per subject and week
+    subjects = len(SUBJECTS)
+    propensity = rng.beta(6, 2, count)
+    held = rng.integers(3, 5, (count, subjects, weeks)).astype(np.int8)
+    attended = rng.binomial(held, propensity[:, None, None]).astype(np.int8)
+    attendance_pct = np.rint(100 * attended.sum(axis=(1, 2)) / held.sum(axis=(1, 2))).astype(np.int64)
+    attendance_detail = pd.DataFrame({
+        "id": np.repeat(ids, subjects * weeks),
+        "subject": np.tile(np.repeat(SUBJECTS, weeks), count),
+        "week": np.tile(np.arange(1, weeks + 1, dtype=np.int8), count * subjects),
+        "classes_held": held.ravel(),
+        "classes_attended": attended.ravel(),
+    })
+
+    # Marks: ability plus an attendance effect, per subject
+    ability = rng.normal(0, 8, count)
+    mean_total = 25 + 0.55 * attendance_pct + ability
+    total = np.clip(np.rint(rng.normal(mean_total[:, None], 8, (count, subjects))), 0, 100).astype(np.int64)
+    internal = np.minimum(np.rint(total * rng.uniform(0.25, 0.35, (count, subjects))), 30).astype(np.int64)
+    points = np.zeros_like(total)
+    for bound, value in reversed(GRADE_POINTS):
+        points[total >= bound] = value
+    marks_detail = pd.DataFrame({
+        "id": np.repeat(ids, subjects),
+        "subject": np.tile(SUBJECTS, count),
+        "internal": internal.ravel(),
+        "external": (total - internal).ravel(),
+        "total": total.ravel(),
+        "grade_points": points.ravel(),
+    })
+    cumulative_gpa = np.round(points.mean(axis=1) * 0.4 + np.clip(mean_total / 10, 4, 9.8) * 0.6, 2)
+
+    return {
+        "student_metadata": metadata,
+        "attendance_detail": attendance_detail,
+        "attendance_table": pd.DataFrame({"id": ids, "attendance_pct": attendance_pct}),
+        "marks_detail": marks_detail,
+        "marks_table": pd.DataFrame({"id": ids, "cumulative_gpa": cumulative_gpa}),
+    }
+
+
+def unified(tables: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """One row per student, in the demo file's column order."""
+    data = tables["student_metadata"].merge(tables["attendance_table"], on="id").merge(tables["marks_table"], on="id")
+    return data[["id", "name", "branch", "year", "attendance_pct", "cumulative_gpa", "email"]]
+
+
+# ---------------------------
+#   Writing
+# ---------------------------
+
+class TableWriter:
+    """Appends chunks of one table to a file in the chosen format."""
+
+    def __init__(self, path: str, fmt: str):
+        self.path, self.fmt = path, fmt
+        self.rows = 0
+        self._parquet = None
+        self._chunks: list[pd.DataFrame] = []  # xlsx is written in one go
+
+    def write(self, frame: pd.DataFrame):
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        elif self.fmt == "csv":
+            frame.to_csv(self.path, mode="a" if self.rows else "w", header=not self.rows, index=False)
+        elif self.rows + len(frame) <= XLSX_MAX_ROWS:
+            self._chunks.append(frame)
         else:
-            gpa = round(random.uniform(4.0, 6.5), 2)
-            
-        data.append({
-            "id": 101 + i,
-            "name": name,
-            "branch": dept,
-            "year": year,
-            "attendance_pct": attendance,
-            "cumulative_gpa": gpa,
-            "email": f"{name.lower()}@vnr.edu.in"
-        })
-        
-    df = pd.DataFrame(data)
-    import os
-    # Script is in backend/scripts/generate_data.py
-    # Data should be in backend/data/student_data.xlsx
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(base_dir, "../data/student_data.xlsx")
-    
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    
-    df.to_excel(file_path, index=False)
-    print(f"Generated {len(data)} records at {file_path}")
+            # Over the sheet limit: stop buffering, the table is skipped
+            self._chunks = []
+        self.rows += len(frame)
+
+    def close(self) -> bool:
+        """False if the table could not be written (xlsx row limit)."""
+        if self._parquet is not None:
+            self._parquet.close()
+        if self.fmt == "xlsx":
+            if self.rows > XLSX_MAX_ROWS:
+                return False
+            pd.concat(self._chunks, ignore_index=True).to_excel(self.path, index=False)
+        return True
+
+
+def generate(students: int, out_dir: str, fmt: str = "parquet", seed: int = 0, weeks: int = 16,
+             detail: bool = True) -> dict[str, str]:
+    """Writes all tables for `students` students; returns table -> path."""
+    os.makedirs(out_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    names = ["student_metadata", "attendance_table", "marks_table", "student_data"]
+    if detail:
+        names += ["attendance_detail", "marks_detail"]
+    writers = {name: TableWriter(os.path.join(out_dir, f"{name}.{fmt}"), fmt) for name in names}
+
+    for start in range(0, students, CHUNK_STUDENTS):
+        tables = generate_chunk(rng, FIRST_ID + start, min(CHUNK_STUDENTS, students - start), weeks)
+        tables["student_data"] = unified(tables)
+        for name, writer in writers.items():
+            writer.write(tables[name])
+
+    paths = {}
+    for name, writer in writers.items():
+        if writer.close():
+            paths[name] = writer.path
+        else:
+            print(f"  skipped {name}: {writer.rows} rows exceed the XLSX sheet limit", file=sys.stderr)
+    return paths
+
+
+def generate_data():
+    """The 30-student demo dataset used by the classwork graph by default."""
+    tables = generate_chunk(np.random.default_rng(0), FIRST_ID, 30, weeks=16, full_names=False)
+    df = unified(tables)
+    os.makedirs(os.path.dirname(DEMO_PATH), exist_ok=True)
+    df.to_excel(DEMO_PATH, index=False)
+    print(f"Generated {len(df)} records at {DEMO_PATH}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=None, help="1k to 1M; omit for the demo file")
+    parser.add_argument("--format", choices=["parquet", "csv", "xlsx"], default="parquet")
+    parser.add_argument("--out", help="output directory (required with --students)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--weeks", type=int, default=16, help="attendance weeks per subject")
+    parser.add_argument("--no-detail", action="store_true", help="skip per-subject attendance/marks tables")
+    args = parser.parse_args()
+
+    if args.students is None:
+        generate_data()
+        return
+    if not args.out:
+        parser.error("--out is required with --students")
+
+    started = time.perf_counter()
+    paths = generate(args.students, args.out, args.format, args.seed, args.weeks, detail=not args.no_detail)
+    print(f"Generated {args.students} students in {time.perf_counter() - started:.1f}s:")
+    for name, path in paths.items():
+        print(f"  {name:18} {os.path.getsize(path) / 2**20:8.1f} MiB  {path}")
+    print("Point the classwork graph at the unified file, or at the separate tables:")
+    print(f"  CLASSWORK_DATA_PATH={paths['student_data']}")
+    print(f"  CLASSWORK_DATA_PATH={paths['student_metadata']} CLASSWORK_DATASET_PATHS="
+          f"'{{\"attendance_table\": \"{paths['attendance_table']}\", \"marks_table\": \"{paths['marks_table']}\"}}'")
+
 
 if __name__ == "__main__":
-    generate_data()
+    main()
@@ -0,0 +1,202 @@
+"""
+Offline load test for the LangGraph pipelines.
+
+Runs against the fake LLM provider (no network), drives each graph at a
+target concurrency and reports throughput, latency percentiles and
+event-loop lag.
+
+    python scripts/load_test.py --graph all --concurrency 100 --requests 2000
+    python scripts/load_test.py --graph admissions --latency-ms 800 --no-cache
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+
+# Script is in backend/scripts/; make backend/ importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+GRAPH_NAMES = [
+    "admissions",
+    "classwork",
+    "placements_dashboard",
+    "placements_resume",
+    "placements_prep",
+    "placements_shortlisting",
+    "placements_tracking",
+    "placements_notification",
+]
+
+ADMISSIONS_MESSAGES = [
+    "What is the fee structure for CSE?",
+    "What is the status of my application 4821?",
+    "Who is the HOD of the ECE department?",
+    "Can I get hostel accommodation in first year?",
+    "hi, i applied last week, any update?",
+    "Approve all pending applications for IT",
+    "Which documents do I need for counselling?",
+    "tell me about the campus",
+]
+
+CLASSWORK_QUERIES = [
+    "CSE students 2nd year with low attendance and poor grades",
+    "low att in 2nd year",
+    "cgpa of cse students",
+    "attendance report",
+]
+
+
+def configure_env(args):
+    """Must run before any core.* import: settings are read at import time."""
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ["LLM_FAKE_LATENCY_MEDIAN_MS"] = str(args.latency_ms)
+    os.environ["LLM_FAKE_LATENCY_SIGMA"] = str(args.latency_sigma)
+    os.environ["LLM_FAKE_TOKENS_PER_SECOND"] = str(args.tokens_per_second)
+    os.environ["LLM_FAKE_SEED"] = str(args.seed)
+    os.environ["LLM_CACHE_ENABLED"] = "false" if args.no_cache else "true"
+    os.environ.pop("REDIS_URL", None)
+    for key in ("JWT_SECRET_KEY", "JWT_ALGORITHM"):
+        os.environ.setdefault(key, "loadtest")
+    os.environ.setdefault("JWT_EXPIRE_MINUTES", "60")
+
+
+def load_graphs(selected: list[str]) -> dict:
+    graphs = {}
+    if "admissions" in selected:
+        from ace_graphs.admissions_graph import admissions_graph
+        graphs["admissions"] = admissions_graph
+    if "classwork" in selected:
+        from ace_graphs.classwork_graph import classwork_graph
+        graphs["classwork"] = classwork_graph
+    if any(name.startswith("placements_") for name in selected):
+        from ace_graphs import placements_graph
+        for name in selected:
+            if name.startswith("placements_"):
+                graphs[name] = getattr(placements_graph, name.split("_", 1)[1] + "_graph")
+    return graphs
+
+
+def make_state(graph_name: str, i: int, unique: bool) -> dict:
+    suffix = f" (#{i})" if unique else ""
+    if graph_name == "admissions":
+        message = ADMISSIONS_MESSAGES[i % len(ADMISSIONS_MESSAGES)] + suffix
+        return {"message": message, "reply": None, "route": None}
+    if graph_name == "classwork":
+        return {
+            "user_query": CLASSWORK_QUERIES[i % len(CLASSWORK_QUERIES)],
+            "role": "admin",
+            "context": {},
+        }
+    return {
+        "user_id": 999,
+        "role": "student",
+        "message": f"load test message {i}",
+        "intent": graph_name.split("_", 1)[1],
+        "authorized": False,
+        "response": None,
+        "validation_status": None,
+    }
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+async def monitor_loop_lag(samples: list[float], interval: float, stop: asyncio.Event):
+    """Measures how late the loop wakes a sleeping task - blocking work shows up here."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, time.perf_counter() - start - interval))
+
+
+async def run_graph(name: str, graph, total: int, concurrency: int, unique: bool) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < total:
+            i = next_index
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                await graph.ainvoke(make_state(name, i, unique))
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    lag_samples: list[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_loop_lag(lag_samples, 0.01, stop))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await monitor
+
+    latencies.sort()
+    lag_samples.sort()
+    return {
+        "graph": name,
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "loop_lag_p99_ms": round(percentile(lag_samples, 99) * 1000, 2),
+        "loop_lag_max_ms": round((lag_samples[-1] if lag_samples else 0) * 1000, 2),
+    }
+
+
+def print_table(results: list[dict]):
+    columns = ["graph", "requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms", "loop_lag_p99_ms", "loop_lag_max_ms"]
+    widths = [max(len(c), *(len(str(r[c])) for r in results)) for c in columns]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for r in results:
+        print("  ".join(str(r[c]).ljust(w) for c, w in zip(columns, widths)))
+
+
+async def main(args):
+    selected = GRAPH_NAMES if args.graph == "all" else [args.graph]
+    graphs = load_graphs(selected)
+
+    results = []
+    for name in selected:
+        results.append(await run_graph(name, graphs[name], args.requests, args.concurrency, args.unique))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline LangGraph load test")
+    parser.add_argument("--graph", choices=["all"] + GRAPH_NAMES, default="all")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500, help="requests per graph")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="fake LLM median latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="log-normal shape, 0 = constant")
+    parser.add_argument("--tokens-per-second", type=float, default=400.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-cache", action="store_true", help="disable the LLM response cache")
+    parser.add_argument("--unique", action="store_true", help="make every message unique (defeats caching/coalescing)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    configure_env(args)
+    asyncio.run(main(args))
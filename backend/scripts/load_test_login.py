@@ -0,0 +1,161 @@
+"""
+Login storm load test: latency of an unrelated endpoint during a burst of
+/auth/login requests.
+
+Runs the app in-process (httpx ASGI transport, one event loop, like one
+uvicorn worker) against a throwaway SQLite database seeded with --users
+students. A steady stream of GET /admin/test probes runs alongside;
+probe latency is reported for a quiet baseline and during the burst.
+/admin/test authorizes from token claims only, so any probe slowdown is
+the event loop being blocked.
+
+    python scripts/load_test_login.py --logins 200 --concurrency 50
+    python scripts/load_test_login.py --hash-workers 0    # hash inline (old behaviour)
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import sys
+import tempfile
+import time
+
+# Script is in backend/scripts/; make backend/ importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+PASSWORD = "loadtest-password"
+
+
+def configure_env(args):
+    """Must run before any core.* import: settings are read at import time."""
+    db_path = os.path.join(tempfile.mkdtemp(prefix="login-load-"), "auth.db")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    if args.hash_workers is not None:
+        os.environ["AUTH_HASH_WORKERS"] = str(args.hash_workers)
+    os.environ["AUTH_HASH_MAX_QUEUE"] = str(args.max_queue)
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ.pop("REDIS_URL", None)
+    for key in ("JWT_SECRET_KEY", "JWT_ALGORITHM"):
+        os.environ.setdefault(key, "loadtest")
+    os.environ["JWT_ALGORITHM"] = "HS256"
+    os.environ.setdefault("JWT_EXPIRE_MINUTES", "60")
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summary(latencies: list[float]) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round((latencies[-1] if latencies else 0) * 1000, 2),
+    }
+
+
+async def seed(users: int):
+    from core.auth_utils import hash_password
+    from core.db import AsyncSessionLocal, Base, engine
+    from models.role import Role
+    from models.user import User
+
+    engine.echo = False
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    hashed = hash_password(PASSWORD)  # one hash shared by all seeded users
+    async with AsyncSessionLocal() as db:
+        db.add_all([Role(id=1, name="admin"), Role(id=2, name="student")])
+        await db.flush()
+        db.add(User(id=1, email="admin@vnr.edu.in", password=hashed, role_id=1))
+        db.add_all(User(email=f"student{i}@vnr.edu.in", password=hashed, role_id=2) for i in range(users))
+        await db.commit()
+
+
+async def probe(client, headers: dict, interval: float, stop: asyncio.Event, out: list[float]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/admin/test", headers=headers)
+        response.raise_for_status()
+        out.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+
+
+async def login_burst(client, total: int, users: int, concurrency: int) -> dict:
+    latencies, statuses = [], {}
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < total:
+            i = next_index
+            next_index += 1
+            started = time.perf_counter()
+            response = await client.post(
+                "/auth/login", data={"username": f"student{i % users}@vnr.edu.in", "password": PASSWORD}
+            )
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {**summary(latencies), "elapsed_s": round(elapsed, 2), "logins_per_sec": round(total / elapsed, 1), "statuses": statuses}
+
+
+async def main(args):
+    import httpx
+
+    from app import app
+
+    await seed(args.users)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/auth/login", data={"username": "admin@vnr.edu.in", "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        interval = args.probe_interval_ms / 1000
+
+        # Quiet baseline
+        baseline: list[float] = []
+        stop = asyncio.Event()
+        task = asyncio.create_task(probe(client, headers, interval, stop, baseline))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        await task
+
+        # Probes during the login burst
+        during: list[float] = []
+        stop = asyncio.Event()
+        task = asyncio.create_task(probe(client, headers, interval, stop, during))
+        burst = await login_burst(client, args.logins, args.users, args.concurrency)
+        stop.set()
+        await task
+
+    from core.auth_utils import HASH_WORKERS, close_hash_executor
+    close_hash_executor()
+
+    print(f"hash workers: {HASH_WORKERS or 'inline'}  logins: {args.logins}  concurrency: {args.concurrency}")
+    print(f"  {'':22} {'requests':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for label, result in (("probe, quiet", summary(baseline)), ("probe, during burst", summary(during)), ("login", burst)):
+        print(f"  {label:22} {result['requests']:>9} {result['p50_ms']:>9} {result['p99_ms']:>9} {result['max_ms']:>9}")
+    print(f"  logins/sec: {burst['logins_per_sec']}  statuses: {burst['statuses']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent login clients")
+    parser.add_argument("--users", type=int, default=1000, help="seeded student accounts")
+    parser.add_argument("--hash-workers", type=int, default=None, help="AUTH_HASH_WORKERS; 0 = hash inline")
+    parser.add_argument("--max-queue", type=int, default=256, help="AUTH_HASH_MAX_QUEUE")
+    parser.add_argument("--probe-interval-ms", type=float, default=10.0)
+    parser.add_argument("--baseline-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    configure_env(args)
+    asyncio.run(main(args))
@@ -0,0 +1,164 @@
+"""
+Startup profile: how long a fresh worker takes to import the app and to
+become ready, and where the import time goes.
+
+Each measurement runs in a new interpreter (nothing is cached between
+runs except the OS page cache and .pyc files). Reported:
+
+- `import app` wall time (median of --runs), from python -X importtime;
+- the slowest top-level packages and modules by cumulative import time;
+- lifespan startup time, without and with GRAPH_WARMUP=["all"], and the
+  per-graph load times from the warmup.
+
+    python scripts/profile_startup.py
+    python scripts/profile_startup.py --runs 10 --json startup.json
+    python scripts/profile_startup.py --baseline startup.json   # flag regressions
+
+Needs the app's settings in the environment (.env), as for uvicorn.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+READY_SNIPPET = """
+import asyncio, json, time
+started = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+
+async def main():
+    async with app_module.app.router.lifespan_context(app_module.app):
+        ready = time.perf_counter()
+    from ace_graphs.lazy import GRAPH_LOAD_SECONDS
+    graphs = {labels[0]: value for labels, value in GRAPH_LOAD_SECONDS._values.items()}
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "ready_ms": (ready - started) * 1000,
+        "graphs_ms": {name: seconds * 1000 for name, seconds in graphs.items()},
+    }))
+
+asyncio.run(main())
+"""
+
+
+def run_python(args: list[str], env: dict | None = None) -> subprocess.CompletedProcess:
+    out = subprocess.run(
+        [sys.executable, *args], cwd=BACKEND_DIR, capture_output=True, text=True,
+        env={**os.environ, **(env or {})},
+    )
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr[-2000:])
+    return out
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """module -> cumulative import time in microseconds."""
+    modules = {}
+    for line in stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <indent><module>"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative_us)
+    return modules
+
+
+def profile_imports(runs: int, top: int) -> dict:
+    totals, samples = [], []
+    for _ in range(runs):
+        modules = parse_importtime(run_python(["-X", "importtime", "-c", "import app"]).stderr)
+        totals.append(modules["app"] / 1000)
+        samples.append(modules)
+
+    # Median run's breakdown
+    median_run = samples[totals.index(sorted(totals)[len(totals) // 2])]
+    packages: dict[str, int] = {}
+    for name, cumulative in median_run.items():
+        root = name.split(".")[0]
+        # Cumulative time of a package = its top-level import
+        if name == root:
+            packages[root] = max(packages.get(root, 0), cumulative)
+    project = {"app", "core", "routes", "classwork", "placements", "admissions", "ace_graphs", "models"}
+    third_party = {k: v for k, v in packages.items() if k not in project}
+
+    return {
+        "import_ms_median": round(statistics.median(totals), 1),
+        "import_ms_runs": [round(t, 1) for t in totals],
+        "top_packages_ms": {
+            name: round(us / 1000, 1) for name, us in sorted(third_party.items(), key=lambda kv: -kv[1])[:top]
+        },
+        "top_modules_ms": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(median_run.items(), key=lambda kv: -kv[1])[1:top + 1]
+        },
+    }
+
+
+def profile_ready(warmup: bool) -> dict:
+    env = {"GRAPH_WARMUP": '["all"]' if warmup else "[]"}
+    result = json.loads(run_python(["-c", READY_SNIPPET], env).stdout.strip().splitlines()[-1])
+    return {
+        "import_ms": round(result["import_ms"], 1),
+        "ready_ms": round(result["ready_ms"], 1),
+        "graphs_ms": {name: round(ms, 1) for name, ms in result["graphs_ms"].items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="import measurements (median is reported)")
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    results = {
+        "imports": profile_imports(args.runs, args.top),
+        "ready_lazy": profile_ready(warmup=False),
+        "ready_warm": profile_ready(warmup=True),
+    }
+
+    imports = results["imports"]
+    print(f"import app: {imports['import_ms_median']:.0f} ms median  (runs: {imports['import_ms_runs']})")
+    print("\nslowest packages (cumulative ms):")
+    for name, ms in imports["top_packages_ms"].items():
+        print(f"  {name:32} {ms:8.1f}")
+    print("\nslowest modules (cumulative ms):")
+    for name, ms in imports["top_modules_ms"].items():
+        print(f"  {name:48} {ms:8.1f}")
+    for key, label in (("ready_lazy", "lazy graphs"), ("ready_warm", "GRAPH_WARMUP=all")):
+        r = results[key]
+        print(f"\nready ({label}): {r['ready_ms']:.0f} ms  (import {r['import_ms']:.0f} ms)")
+        for name, ms in r["graphs_ms"].items():
+            print(f"  {name:32} {ms:8.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        checks = {
+            "import app": (baseline["imports"]["import_ms_median"], imports["import_ms_median"]),
+            "ready (lazy)": (baseline["ready_lazy"]["ready_ms"], results["ready_lazy"]["ready_ms"]),
+            "ready (warm)": (baseline["ready_warm"]["ready_ms"], results["ready_warm"]["ready_ms"]),
+        }
+        regressions = [
+            f"{name}: {old:.0f} -> {new:.0f} ms" for name, (old, new) in checks.items() if new > old * (1 + args.tolerance)
+        ]
+        print("\nRegressions:" if regressions else "\nNo regressions against the baseline.")
+        for line in regressions:
+            print(f"  {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
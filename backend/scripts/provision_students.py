@@ -0,0 +1,102 @@
+"""
+Bulk-create student accounts from a CSV (same rules as
+POST /admin/users/bulk, see core/provisioning.py).
+
+    python scripts/provision_students.py students.csv --credentials creds.csv
+    python scripts/provision_students.py students.csv --dry-run
+    python scripts/provision_students.py --sample 5000 > students.csv   # test data
+
+Uses the app's DATABASE_URL. Generated initial passwords are written to
+--credentials (they are not stored anywhere else in plain text), so a CSV
+with blank passwords is refused without it unless --dry-run.
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import sys
+
+# Script is in backend/scripts/; make backend/ importable
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def write_sample(count: int, start: int):
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["email", "password", "role"])
+    for i in range(start, start + count):
+        writer.writerow([f"student{i}@vnr.edu.in", "", "student"])
+
+
+def has_blank_passwords(text: str) -> bool:
+    """True if any row leaves the password blank (one would be generated)."""
+    for raw in csv.DictReader(io.StringIO(text)):
+        record = {(k or "").strip().lower(): (v or "").strip() for k, v in raw.items()}
+        if record.get("email") and not record.get("password"):
+            return True
+    return False
+
+
+async def main(args, text: str):
+    from core.db import engine
+    from core.provisioning import close_hash_pool, provision_students
+
+    try:
+        result = await provision_students(text, engine, dry_run=args.dry_run, processes=args.processes)
+    finally:
+        close_hash_pool()
+        await engine.dispose()
+
+    if args.credentials and result["credentials"]:
+        with open(args.credentials, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["email", "initial_password"])
+            writer.writeheader()
+            writer.writerows(result["credentials"])
+
+    if args.json:
+        print(json.dumps({k: v for k, v in result.items() if k != "credentials"}, indent=2))
+        return
+    timing = result["timing"]
+    print(
+        f"{result['rows']} rows: {result['created']} created, {result['failed']} failed"
+        f"{' (dry run)' if result['dry_run'] else ''}"
+    )
+    print(
+        f"validate {timing['validate_s']}s  hash {timing['hash_s']}s  insert {timing['insert_s']}s"
+        f"  total {timing['total_s']}s  -> {result['users_per_sec']} users/sec"
+    )
+    for error in result["errors"][:args.show_errors]:
+        print(f"  line {error['line']}: {error['email'] or '-'}: {error['error']}")
+    if len(result["errors"]) > args.show_errors:
+        print(f"  ... {len(result['errors']) - args.show_errors} more (use --json)")
+    if args.credentials and result["credentials"]:
+        print(f"Initial passwords for {len(result['credentials'])} accounts written to {args.credentials}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv", nargs="?", help="CSV with email[, password, role] columns")
+    parser.add_argument("--credentials", help="write generated initial passwords to this CSV")
+    parser.add_argument("--dry-run", action="store_true", help="validate only")
+    parser.add_argument("--processes", type=int, default=None, help="hashing processes (default: CPU count)")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--show-errors", type=int, default=20)
+    parser.add_argument("--sample", type=int, help="print a CSV of this many test students and exit")
+    parser.add_argument("--sample-start", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.sample:
+        write_sample(args.sample, args.sample_start)
+    elif not args.csv:
+        parser.error("csv is required (or --sample N)")
+    else:
+        with open(args.csv, encoding="utf-8-sig") as f:
+            text = f.read()
+        if not args.credentials and not args.dry_run and has_blank_passwords(text):
+            parser.error(
+                "CSV has rows with a blank password; pass --credentials FILE to keep "
+                "the generated initial passwords (or --dry-run to only validate)"
+            )
+        asyncio.run(main(args, text))
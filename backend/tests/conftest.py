@@ -0,0 +1,15 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# Settings are read at import time; give the required ones test values
+# before any app module is imported.
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("JWT_EXPIRE_MINUTES", "60")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.pop("REDIS_URL", None)
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -0,0 +1,108 @@
+# tests/test_auth_deps.py
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core import deps
+from core.config import settings
+from core.db import Base
+from core.user_cache import user_cache
+from models.role import Role
+from models.user import User
+
+ADMIN_CLAIMS = {"user_id": 1, "sub": "admin@vnr.edu.in", "role": "admin", "role_id": 1}
+STUDENT_ID = 2
+
+
+@pytest.fixture
+async def db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'auth.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[Role.__table__, User.__table__])
+        await conn.execute(insert(Role.__table__), [{"id": 1, "name": "admin"}, {"id": 2, "name": "student"}])
+        await conn.execute(insert(User.__table__), [
+            {"id": 1, "email": "admin@vnr.edu.in", "password": "x", "role_id": 1},
+            {"id": STUDENT_ID, "email": "s@vnr.edu.in", "password": "x", "role_id": 2},
+        ])
+
+    queries = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    user_cache.clear()
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        session.queries = queries
+        yield session
+    user_cache.clear()
+    await engine.dispose()
+
+
+def student_claims(**extra) -> dict:
+    """A token issued before role claims were added: user_id and email only."""
+    return {"user_id": STUDENT_ID, "sub": "s@vnr.edu.in", **extra}
+
+
+async def test_claims_only_role_checks_issue_no_queries(db):
+    user = await deps.role_required("admin")(claims=ADMIN_CLAIMS, db=db)
+    assert (user.id, user.role) == (1, "admin")
+    assert (await deps.require_role(1)(claims=ADMIN_CLAIMS, db=db)).role_id == 1
+
+    with pytest.raises(HTTPException) as exc:
+        await deps.role_required("faculty")(claims=ADMIN_CLAIMS, db=db)
+    assert exc.value.status_code == 403
+    assert db.queries == []
+
+
+async def test_token_without_role_id_uses_cache_then_db(db):
+    check = deps.require_role(2)
+
+    assert (await check(claims=student_claims(), db=db)).role_id == 2
+    assert len(db.queries) == 1  # cache miss: one joined users+roles query
+
+    assert (await check(claims=student_claims(), db=db)).role == "student"
+    assert len(db.queries) == 1  # served from the user cache
+
+
+async def test_untrusted_claims_read_the_role(db, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", False)
+    forged = student_claims(role="admin", role_id=1)
+    with pytest.raises(HTTPException) as exc:
+        await deps.role_required("admin")(claims=forged, db=db)
+    assert exc.value.status_code == 403
+    assert len(db.queries) == 1
+
+
+async def test_deleted_user_gets_401(db):
+    await deps.get_current_user(claims=student_claims(), db=db)  # now cached
+    await db.delete(await db.get(User, STUDENT_ID))
+    await db.commit()
+
+    with pytest.raises(HTTPException) as exc:
+        await deps.get_current_user(claims=student_claims(), db=db)
+    assert exc.value.status_code == 401
+
+
+async def test_user_update_invalidates_cache(db):
+    assert (await deps.load_user(db, STUDENT_ID)).role == "student"
+    user = await db.get(User, STUDENT_ID)
+    user.role_id = 1
+    await db.commit()
+
+    assert user_cache.get(STUDENT_ID) is None
+    assert (await deps.load_user(db, STUDENT_ID)).role == "admin"
+
+
+async def test_role_update_clears_cache(db):
+    assert (await deps.load_user(db, STUDENT_ID)).role == "student"
+    role = await db.get(Role, 2)
+    role.name = "learner"
+    await db.commit()
+
+    assert user_cache.get(STUDENT_ID) is None
+    assert (await deps.load_user(db, STUDENT_ID)).role == "learner"
+
+
+async def test_invalid_token_gets_401():
+    with pytest.raises(HTTPException) as exc:
+        await deps.get_token_claims("not-a-jwt")
+    assert exc.value.status_code == 401
@@ -0,0 +1,72 @@
+# tests/test_batch_endpoints.py
+
+import json
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app import app
+from core.auth_utils import create_access_token
+from core.streaming import parse_batch_body
+
+BATCH_URLS = ["/admissions/chat/batch", "/placements/chat/prep/batch"]
+
+
+def auth_header(role: str) -> dict:
+    token = create_access_token({"sub": f"{role}@vnr.edu.in", "role": role, "role_id": 1, "user_id": 1})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("messages", [
+    ["ok", ""],
+    ["ok", "   "],
+    ["ok", None],
+    ["ok", 42],
+    ["ok", {"message": "hi"}],
+])
+def test_parse_batch_body_rejects_non_string_items(messages):
+    with pytest.raises(HTTPException) as exc:
+        parse_batch_body({"messages": messages})
+    assert exc.value.status_code == 400
+    assert exc.value.detail["invalid_indexes"] == [1]
+
+
+def test_parse_batch_body_caps_concurrency():
+    messages, concurrency = parse_batch_body({"messages": ["a", "b"], "concurrency": 10_000})
+    assert messages == ["a", "b"]
+    assert concurrency == 64
+
+
+@pytest.mark.parametrize("url", BATCH_URLS)
+def test_batch_requires_login(client, url):
+    assert client.post(url, json={"messages": ["hi"]}).status_code == 401
+
+
+@pytest.mark.parametrize("url", BATCH_URLS)
+def test_batch_rejects_students(client, url):
+    response = client.post(url, json={"messages": ["hi"]}, headers=auth_header("student"))
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("url", BATCH_URLS)
+def test_batch_rejects_blank_items(client, url):
+    response = client.post(url, json={"messages": ["hi", ""]}, headers=auth_header("admin"))
+    assert response.status_code == 400
+
+
+def test_staff_batch_streams_results(client):
+    response = client.post(
+        "/admissions/chat/batch",
+        json={"messages": ["what is the hostel fee", "when does counselling start"]},
+        headers=auth_header("faculty"),
+    )
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines[:-1]) == [0, 1]
+    assert lines[-1]["summary"]["total"] == 2
@@ -0,0 +1,26 @@
+# tests/test_classwork_analytics.py
+
+import pandas as pd
+
+from classwork.analytics import HIGH_RISK_SCORE, high_risk, high_risk_threshold, score_risk
+
+STUDENTS = pd.DataFrame({
+    "id": [1, 2, 3],
+    "name": ["A", "B", "C"],
+    "attendance_pct": [60, 70, 90],
+    "cumulative_gpa": [5.0, 8.0, 9.0],
+})
+
+
+def test_high_risk_needs_the_fixed_score():
+    scored = score_risk(STUDENTS)
+    assert high_risk_threshold(scored) == HIGH_RISK_SCORE == 2
+    assert high_risk(scored)["id"].tolist() == [1]
+
+
+def test_single_metric_query_does_not_lower_the_threshold():
+    # Only attendance loaded: two students fail one rule, neither is high risk
+    scored = score_risk(STUDENTS[["id", "name", "attendance_pct"]])
+    assert scored["risk_score"].tolist() == [1, 1, 0]
+    assert high_risk_threshold(scored) == 2
+    assert high_risk(scored).empty
@@ -0,0 +1,19 @@
+# tests/test_classwork_nlq.py
+
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def test_graph_imports_from_another_directory(tmp_path):
+    # Relative settings paths (NLQ rules, dataset) resolve against backend/
+    env = {**os.environ, "PYTHONPATH": BACKEND_DIR, "CLASSWORK_DATA_SOURCE": "file"}
+    code = (
+        "from ace_graphs.classwork_graph import classwork_graph\n"
+        "from classwork.nlq import nlq_parser\n"
+        "assert nlq_parser.phrases > 0\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr[-2000:]
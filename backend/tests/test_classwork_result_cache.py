@@ -0,0 +1,61 @@
+# tests/test_classwork_result_cache.py
+
+import pandas as pd
+import pytest
+
+from ace_graphs import classwork_graph as graph_module
+from classwork.result_cache import result_cache
+
+QUERY = "show students in CSE"
+
+
+class FlakySource:
+    """Fails the first fetch, then returns one student."""
+
+    name = "fake"
+
+    def __init__(self):
+        self.fetches = 0
+
+    async def dataset_version(self):
+        return "v1"
+
+    async def estimate_rows(self, plan):
+        return 1
+
+    async def fetch(self, plan):
+        self.fetches += 1
+        if self.fetches == 1:
+            raise ConnectionError("database unavailable")
+        return pd.DataFrame([{"id": 1, "name": "Asha", "branch": "CSE", "year": 2}])
+
+
+@pytest.fixture
+def source(monkeypatch):
+    source = FlakySource()
+    monkeypatch.setattr(graph_module, "get_data_source", lambda: source)
+    result_cache.clear()
+    yield source
+    result_cache.clear()
+
+
+async def run(query: str) -> dict:
+    return await graph_module.classwork_graph.ainvoke({"user_query": query, "role": "admin", "context": {}})
+
+
+async def test_failed_fetch_is_not_cached(source):
+    failed = await run(QUERY)
+    assert failed["fetch_error"]
+    assert failed["structured_response"]["summary"]["total"] == 0
+    assert "could not be loaded" in failed["insights"][0]
+
+    retried = await run(QUERY)
+    assert retried["cache_hit"] is False
+    assert retried["structured_response"]["summary"]["total"] == 1
+    assert source.fetches == 2
+
+    # A successful result is cached as before
+    cached = await run(QUERY)
+    assert cached["cache_hit"] is True
+    assert cached["structured_response"]["summary"]["total"] == 1
+    assert source.fetches == 2
@@ -0,0 +1,34 @@
+# tests/test_classwork_sources.py
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def test_file_mode_imports_without_database_settings():
+    env = {k: v for k, v in os.environ.items() if not k.startswith("DATABASE_")}
+    env["CLASSWORK_DATA_SOURCE"] = "file"
+    code = (
+        "import sys\n"
+        "import ace_graphs.classwork_graph\n"
+        "from classwork.data_source import FileDataSource, get_data_source\n"
+        "assert isinstance(get_data_source(), FileDataSource)\n"
+        "assert 'core.db' not in sys.modules and 'classwork.sql_source' not in sys.modules\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr[-2000:]
+
+
+def test_incomplete_source_fails_at_instantiation():
+    from classwork.data_source import DataSource
+
+    class NoFetch(DataSource):
+        async def estimate_rows(self, plan):
+            return 0
+
+    with pytest.raises(TypeError, match="fetch"):
+        NoFetch()
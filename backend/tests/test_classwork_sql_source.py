@@ -0,0 +1,133 @@
+# tests/test_classwork_sql_source.py
+
+"""SqlDataSource on SQLite must return what FileDataSource returns for the same plan."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+from sqlalchemy import insert
+
+from classwork import risk_store
+from classwork.analytics import score_risk
+from classwork.data_source import FileDataSource
+from classwork.dataset_cache import dataset_cache
+from classwork.plan_executor import build_plan
+from classwork.sql_source import TABLES, SqlDataSource
+from core.config import settings
+from core.db import Base
+
+STUDENTS = 300
+
+
+def make_dataset() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    frame = pd.DataFrame({
+        "id": np.arange(1, STUDENTS + 1),
+        "name": [f"Student {i}" for i in range(1, STUDENTS + 1)],
+        "branch": rng.choice(["CSE", "ECE", "IT", "MECH"], STUDENTS),
+        "year": rng.integers(1, 5, STUDENTS),
+        "attendance_pct": rng.integers(40, 101, STUDENTS).astype(float),
+        "cumulative_gpa": rng.uniform(4, 10, STUDENTS).round(2),
+    })
+    # Some students have no attendance or marks recorded
+    frame.loc[frame.index % 17 == 0, "attendance_pct"] = np.nan
+    frame.loc[frame.index % 23 == 0, "cumulative_gpa"] = np.nan
+    return frame
+
+
+def threshold(op: str, value: float) -> dict:
+    return {"op": op, "value": value}
+
+
+INTENTS = {
+    "overview": {"metrics": [], "filters": {}},
+    "branch": {"metrics": ["attendance_percentage"], "filters": {"branch": "CSE"}},
+    "year": {"metrics": ["cumulative_gpa"], "filters": {"year": 2}},
+    "branch+year": {"metrics": [], "filters": {"branch": "IT", "year": 3}},
+    "low attendance": {
+        "metrics": ["attendance_percentage"], "filters": {},
+        "thresholds": {"attendance_percentage": threshold("<", 75)},
+    },
+    "high gpa in dept": {
+        "metrics": ["cumulative_gpa"], "filters": {"branch": "ECE"},
+        "thresholds": {"cumulative_gpa": threshold(">=", 8.0)},
+    },
+    "range on both metrics": {
+        "metrics": [], "filters": {"year": 1},
+        "thresholds": {"attendance_percentage": threshold(">", 60), "cumulative_gpa": threshold("<=", 6.5)},
+    },
+    "top 10": {"metrics": [], "filters": {}, "limit": 10},
+    "top 5 single metric": {"metrics": ["cumulative_gpa"], "filters": {"year": 4}, "limit": 5},
+    "top 20 with threshold": {
+        "metrics": ["attendance_percentage"], "filters": {"branch": "MECH"},
+        "thresholds": {"attendance_percentage": threshold("<", 90)}, "limit": 20,
+    },
+    "no match": {"metrics": [], "filters": {"branch": "CIVIL"}},
+}
+
+
+def comparable(frame: pd.DataFrame) -> pd.DataFrame:
+    # Missing values are <NA> in Arrow-backed file columns, NaN from SQL
+    return frame.astype(object).where(frame.notna(), None).reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def dataset_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("classwork") / "students.parquet"
+    make_dataset().to_parquet(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+async def sources(dataset_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CLASSWORK_DATA_PATH", dataset_path)
+    monkeypatch.setattr(settings, "CLASSWORK_DATASET_PATHS", {})
+    monkeypatch.setattr(dataset_cache, "cache_dir", str(tmp_path / "cache"))
+
+    sql_source = SqlDataSource(f"sqlite+aiosqlite:///{tmp_path / 'classwork.db'}")
+    frame = pd.read_parquet(dataset_path)
+    async with sql_source.engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=list(TABLES.values()) + [risk_store.RISK, risk_store.VERSION],
+        )
+        for table in TABLES.values():
+            columns = [c.name for c in table.columns if c.name in frame.columns]
+            part = frame[columns].astype(object).where(frame[columns].notna(), None)
+            await conn.execute(insert(table), part.to_dict("records"))
+        await risk_store.rebuild_risk(conn)
+
+    yield FileDataSource(), sql_source
+    await sql_source.close()
+    dataset_cache.invalidate(dataset_path)
+
+
+@pytest.mark.parametrize("name", list(INTENTS))
+async def test_sql_source_matches_file_source(sources, name):
+    file_source, sql_source = sources
+    plan = build_plan(INTENTS[name])
+
+    expected = await file_source.fetch(plan)
+    if "risk_score" not in expected.columns:
+        expected = score_risk(expected)
+    actual = await sql_source.fetch(plan)
+
+    # Same rows in the same order (risk descending, ties by id)
+    assert list(actual.columns) == [c for c in expected.columns if c in actual.columns]
+    assert_frame_equal(comparable(expected[list(actual.columns)]), comparable(actual), check_dtype=False)
+    assert actual["risk_score"].is_monotonic_decreasing
+
+    matching = await sql_source.estimate_rows(plan)
+    if plan.get("limit"):
+        assert len(actual) == min(plan["limit"], matching)
+    else:
+        assert len(actual) == matching
+
+
+async def test_limit_returns_the_top_rows_by_risk(sources):
+    file_source, sql_source = sources
+    full = await sql_source.fetch(build_plan({"metrics": [], "filters": {}}))
+    top = await sql_source.fetch(build_plan({"metrics": [], "filters": {}, "limit": 15}))
+    assert top["id"].tolist() == full["id"].head(15).tolist()
+    assert await sql_source.dataset_version() == "risk-1"
@@ -0,0 +1,89 @@
+# tests/test_classwork_uploads.py
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import app
+from classwork import risk_store
+from classwork.router import validate_metric_rows
+from core.auth_utils import create_access_token
+from core.config import settings
+from core.db import Base
+from models.classwork import StudentMetadata
+
+
+def bad_rows(column: str, rows) -> list[dict]:
+    with pytest.raises(HTTPException) as exc:
+        validate_metric_rows(column, {"rows": rows})
+    assert exc.value.status_code == 400
+    return exc.value.detail["rows"]
+
+
+@pytest.mark.parametrize("row, error", [
+    ({"id": "abc", "attendance_pct": 80}, "'id' must be an integer"),
+    ({"id": 1.5, "attendance_pct": 80}, "'id' must be an integer"),
+    ({"id": True, "attendance_pct": 80}, "'id' must be an integer"),
+    ({"id": 1, "attendance_pct": "high"}, "'attendance_pct' must be a number"),
+    ({"id": 1, "attendance_pct": None}, "'attendance_pct' must be a number"),
+    ({"id": 1, "attendance_pct": float("nan")}, "'attendance_pct' must be a number"),
+    ({"id": 1, "attendance_pct": 140}, "'attendance_pct' must be between 0 and 100"),
+    ({"id": 1, "attendance_pct": -1}, "'attendance_pct' must be between 0 and 100"),
+    ("101", "row must be an object"),
+])
+def test_invalid_rows_are_rejected(row, error):
+    rows = [{"id": 1, "attendance_pct": 90}, row]
+    assert bad_rows("attendance_pct", rows) == [{"index": 1, "error": error}]
+
+
+def test_gpa_range_and_conversion():
+    assert bad_rows("cumulative_gpa", [{"id": 1, "cumulative_gpa": 11}])[0]["index"] == 0
+    assert validate_metric_rows("cumulative_gpa", {"rows": [{"id": 1, "cumulative_gpa": 7}]}) == [
+        {"id": 1, "cumulative_gpa": 7.0}
+    ]
+    assert validate_metric_rows("attendance_pct", {"rows": [{"id": 1, "attendance_pct": 72.6}]}) == [
+        {"id": 1, "attendance_pct": 73}
+    ]
+
+
+def test_row_count_is_capped(monkeypatch):
+    monkeypatch.setattr(settings, "CLASSWORK_UPLOAD_MAX_ROWS", 3)
+    with pytest.raises(HTTPException) as exc:
+        validate_metric_rows("attendance_pct", {"rows": [{"id": i, "attendance_pct": 80} for i in range(4)]})
+    assert exc.value.status_code == 413
+
+
+def test_upload_with_bad_id_is_a_400_not_a_500():
+    token = create_access_token({"sub": "f@vnr.edu.in", "role": "faculty", "role_id": 3, "user_id": 1})
+    response = TestClient(app).post(
+        "/classwork/attendance",
+        json={"rows": [{"id": "x12", "attendance_pct": 80}]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"]["rows"][0]["index"] == 0
+
+
+async def test_record_metric_rows_chunks_id_lookups(monkeypatch):
+    monkeypatch.setattr(risk_store, "IN_CHUNK", 2)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(StudentMetadata.__table__), [
+            {"id": i, "name": f"s{i}", "branch": "CSE", "year": 1} for i in range(1, 6)
+        ])
+        await risk_store.rebuild_risk(conn)
+
+        rows = [{"id": i, "attendance_pct": 50 if i % 2 else 90} for i in range(1, 6)] + [{"id": 99, "attendance_pct": 80}]
+        result = await risk_store.record_metric_rows(conn, "attendance_pct", rows)
+
+        flags = dict((await conn.execute(
+            select(risk_store.RISK.c.id, risk_store.RISK.c.flag_attendance_pct)
+        )).all())
+    await engine.dispose()
+
+    assert result["updated"] == 5
+    assert result["unknown_ids"] == [99]
+    assert flags == {1: 1, 2: 0, 3: 1, 4: 0, 5: 1}
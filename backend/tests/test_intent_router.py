@@ -0,0 +1,74 @@
+# tests/test_intent_router.py
+
+import json
+import logging
+
+import pytest
+
+from ace_graphs.intent_router import SEED_EXAMPLES, IntentRouter
+from core.config import settings
+
+
+@pytest.fixture
+def router():
+    router = IntentRouter(min_confidence=0.35, min_margin=0.1, rule_confidence=0.9)
+    router.fit(SEED_EXAMPLES)
+    return router
+
+
+@pytest.mark.parametrize("message, wrong_route", [
+    ("can you verify my application", "admin_action"),
+    ("please approve my application", "admin_action"),
+    ("Is it possible to talk to someone in the department?", "department_query"),
+    ("is it open on sundays, i need the department office", "department_query"),
+])
+def test_student_messages_are_not_misrouted(router, message, wrong_route):
+    route, _, _ = router.predict(message)
+    assert route != wrong_route
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("approve all pending applications for cse", "admin_action"),
+    ("bulk reject the selected applicants", "admin_action"),
+    ("export the applicant list as excel", "admin_action"),
+    ("who is the hod of the IT department", "department_query"),
+    ("labs in the cse department", "department_query"),
+    ("what is the status of my application", "application_tracking"),
+    ("what is the hostel fee", "faq"),
+])
+def test_confident_messages_route_locally(router, message, expected):
+    route, confidence, _ = router.predict(message)
+    assert route == expected
+    assert confidence < 1.0
+
+
+def test_model_alone_does_not_pick_rule_only_routes(router):
+    # Closest to the department seeds, but names no department
+    route, confidence, method = router.predict("i want to talk to someone in the department")
+    assert route is None and method == "model" and confidence > 0
+
+
+def test_rule_match_is_below_certainty_and_still_margin_checked(router):
+    route, confidence, method = router.predict("approve all pending applications")
+    assert (route, method) == ("admin_action", "rule")
+    assert confidence < 1.0
+
+    # A rule score that does not clear the margin falls back to the LLM
+    strict = IntentRouter(min_confidence=0.35, min_margin=0.95, rule_confidence=0.9)
+    strict.fit(SEED_EXAMPLES)
+    assert strict.predict("approve all pending applications")[0] is None
+
+
+def test_fallback_log_omits_message_by_default(router, caplog, monkeypatch):
+    monkeypatch.setattr(settings, "INTENT_ROUTER_LOG_MESSAGES", False)
+    with caplog.at_level(logging.INFO, logger="vnr_ace.intent_router"):
+        router.record_fallback("my roll number is 21071A0501", "faq")
+    record = json.loads(caplog.records[-1].getMessage().split(" ", 1)[1])
+    assert "message" not in record
+    assert record["route"] == "faq"
+    assert set(record["scores"]) == {"faq", "application_tracking", "department_query", "admin_action"}
+
+    monkeypatch.setattr(settings, "INTENT_ROUTER_LOG_MESSAGES", True)
+    with caplog.at_level(logging.INFO, logger="vnr_ace.intent_router"):
+        router.record_fallback("hello", "faq")
+    assert json.loads(caplog.records[-1].getMessage().split(" ", 1)[1])["message"] == "hello"
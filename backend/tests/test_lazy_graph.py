@@ -0,0 +1,63 @@
+# tests/test_lazy_graph.py
+
+import asyncio
+import sys
+import threading
+import time
+import types
+
+from ace_graphs.lazy import LazyGraph
+
+
+class EchoGraph:
+    async def ainvoke(self, state):
+        return {"echo": state}
+
+    async def astream(self, state):
+        yield {"node": state}
+
+
+def install_slow_module(monkeypatch, name: str, delay: float, loads: list):
+    """A module whose import takes `delay` seconds of blocking work."""
+
+    def slow_getattr(attr):
+        loads.append(threading.current_thread().name)
+        time.sleep(delay)
+        return EchoGraph()
+
+    module = types.ModuleType(name)
+    module.__getattr__ = slow_getattr
+    monkeypatch.setitem(sys.modules, name, module)
+
+
+async def test_first_load_does_not_block_the_event_loop(monkeypatch):
+    loads = []
+    install_slow_module(monkeypatch, "slow_graph_module", 0.3, loads)
+    graph = LazyGraph("slow", "slow_graph_module", "graph")
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticking = asyncio.create_task(ticker())
+    results = await asyncio.gather(*(graph.ainvoke(i) for i in range(5)))
+    ticking.cancel()
+
+    assert results == [{"echo": i} for i in range(5)]
+    assert len(loads) == 1  # concurrent first callers share one load
+    assert loads[0] != threading.main_thread().name
+    assert ticks >= 10  # the loop kept running during the 0.3 s load
+
+
+async def test_astream_loads_lazily(monkeypatch):
+    loads = []
+    install_slow_module(monkeypatch, "stream_graph_module", 0, loads)
+    graph = LazyGraph("stream", "stream_graph_module", "graph")
+
+    assert not graph.loaded
+    assert [chunk async for chunk in graph.astream("x")] == [{"node": "x"}]
+    assert graph.loaded
@@ -0,0 +1,115 @@
+# tests/test_llm_cache.py
+
+import fakeredis
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from core import llm_cache as llm_cache_module
+from core.llm_cache import LLMResponseCache, LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_cache_module.time, "monotonic", clock)
+    return clock
+
+
+class BrokenRedis:
+    """Every command fails, as when Redis is down or times out."""
+
+    async def get(self, key):
+        raise RedisConnectionError("redis down")
+
+    async def ttl(self, key):
+        raise RedisConnectionError("redis down")
+
+    async def set(self, key, value, ex=None):
+        raise RedisConnectionError("redis down")
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", "1", ttl=60)
+    cache.set("b", "2", ttl=60)
+    assert cache.get("a") == "1"  # "b" is now least recently used
+    cache.set("c", "3", ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert len(cache) == 2
+
+
+def test_lru_entries_expire(clock):
+    cache = LRUCache(max_entries=10)
+    cache.set("a", "1", ttl=30)
+    clock.now += 29
+    assert cache.get("a") == "1"
+    clock.now += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+async def test_redis_hit_is_promoted_into_lru():
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    await redis.set("k", "cached answer", ex=120)
+    cache = LLMResponseCache(max_entries=10, redis=redis)
+
+    assert await cache.get("k") == "cached answer"
+    assert cache.stats["redis_hits"] == 1
+    assert cache.local.get("k") == "cached answer"
+
+    # Second lookup is served by the LRU even if Redis loses the key
+    await redis.delete("k")
+    assert await cache.get("k") == "cached answer"
+    assert cache.stats["local_hits"] == 1
+
+
+async def test_promoted_entry_keeps_remaining_redis_ttl(clock):
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    await redis.set("k", "v", ex=5)
+    cache = LLMResponseCache(max_entries=10, redis=redis)
+
+    assert await cache.get("k") == "v"
+    clock.now += 6
+    assert cache.local.get("k") is None
+
+
+async def test_set_writes_both_tiers():
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    cache = LLMResponseCache(max_entries=10, redis=redis)
+    await cache.set("k", "v", ttl=60)
+
+    assert cache.local.get("k") == "v"
+    assert await redis.get("k") == "v"
+    assert 0 < await redis.ttl("k") <= 60
+
+
+async def test_zero_ttl_is_not_cached():
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    cache = LLMResponseCache(max_entries=10, redis=redis)
+    await cache.set("k", "v", ttl=0)
+
+    assert cache.local.get("k") is None
+    assert await redis.get("k") is None
+
+
+async def test_redis_errors_fall_back_to_lru():
+    cache = LLMResponseCache(max_entries=10, redis=BrokenRedis())
+
+    assert await cache.get("k") is None
+    await cache.set("k", "v", ttl=60)
+    assert await cache.get("k") == "v"
+
+    assert cache.stats["redis_errors"] == 2
+    assert cache.stats["misses"] == 1
+    assert cache.stats["local_hits"] == 1
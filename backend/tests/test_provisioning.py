@@ -0,0 +1,110 @@
+# tests/test_provisioning.py
+
+import asyncio
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+from passlib.hash import argon2
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core import provisioning
+from core.db import Base
+from models.role import Role
+from models.user import User
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Role.__table__), [{"id": 1, "name": "admin"}, {"id": 2, "name": "student"}])
+        await conn.execute(insert(User.__table__), [{"email": "Asha.K@VNR.edu.in", "password": "x", "role_id": 2}])
+    yield engine
+    await engine.dispose()
+
+
+async def test_existing_account_is_matched_case_insensitively(engine):
+    csv_text = "email,password,role\nasha.k@vnr.edu.in,,\nnew.student@vnr.edu.in,,\n"
+    result = await provisioning.provision_students(csv_text, engine, processes=0)
+
+    assert result["created"] == 1
+    assert result["errors"] == [{"line": 2, "email": "asha.k@vnr.edu.in", "error": "already exists"}]
+    assert [c["email"] for c in result["credentials"]] == ["new.student@vnr.edu.in"]
+
+
+@pytest.fixture
+def hash_pool():
+    yield
+    provisioning.close_hash_pool()
+
+
+async def test_hash_pool_is_reused_and_does_not_block_the_loop(hash_pool):
+    rows = [
+        provisioning.ProvisionRow(line, f"s{line}@vnr.edu.in", f"pw-{line}", 2, True)
+        for line in range(2, 2 + 2 * provisioning.HASH_CHUNK + 1)
+    ]
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticking = asyncio.create_task(ticker())
+    first = await provisioning.hash_rows(rows, processes=2)
+    pool = provisioning._hash_pool
+    second = await provisioning.hash_rows(rows[:provisioning.HASH_CHUNK + 1], processes=2)
+    ticking.cancel()
+
+    assert provisioning._hash_pool is pool
+    assert len(first) == len(rows) and len(second) == provisioning.HASH_CHUNK + 1
+    assert argon2.verify(rows[-1].password, first[-1])
+    assert ticks > 0
+
+    provisioning.close_hash_pool()
+    assert provisioning._hash_pool is None
+
+
+def _run_script(tmp_path, *args):
+    db_path = tmp_path / "users.db"
+    if not db_path.exists():
+        sync_engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(sync_engine)
+        with sync_engine.begin() as conn:
+            conn.execute(insert(Role.__table__), [{"id": 1, "name": "admin"}, {"id": 2, "name": "student"}])
+        sync_engine.dispose()
+    env = {**os.environ, "DATABASE_URL": f"sqlite+aiosqlite:///{db_path}"}
+    result = subprocess.run(
+        [sys.executable, os.path.join(BACKEND_DIR, "scripts", "provision_students.py"), *args],
+        cwd=tmp_path, env=env, capture_output=True, text=True,
+    )
+    with sqlite3.connect(db_path) as conn:
+        users = conn.execute("SELECT count(*) FROM users").fetchone()[0]
+    return result, users
+
+
+def test_script_refuses_generated_passwords_without_credentials(tmp_path):
+    students = tmp_path / "students.csv"
+    students.write_text("email,password,role\nnew.student@vnr.edu.in,,\n")
+
+    result, users = _run_script(tmp_path, str(students))
+    assert result.returncode == 2 and "--credentials" in result.stderr
+    assert users == 0
+
+    result, users = _run_script(tmp_path, str(students), "--dry-run")
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert users == 0
+
+    creds = tmp_path / "creds.csv"
+    result, users = _run_script(tmp_path, str(students), "--credentials", str(creds), "--processes", "0")
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert users == 1
+    assert creds.read_text().splitlines()[1].startswith("new.student@vnr.edu.in,")
@@ -0,0 +1,81 @@
+# tests/test_singleflight.py
+
+import asyncio
+
+import pytest
+
+from core.singleflight import SingleFlight
+
+
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+    assert results == ["result"] * 5
+    assert calls == 1
+    assert flight.stats == {"leaders": 1, "coalesced": 4}
+    assert len(flight) == 0
+
+
+async def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*(flight.do("k", work) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+async def test_work_survives_while_other_waiters_remain():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flight.do("k", work))
+    second = asyncio.create_task(flight.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_caller_after_last_waiter_cancels_starts_fresh_call():
+    flight = SingleFlight()
+    started = []
+
+    async def work():
+        started.append(len(started))
+        await asyncio.sleep(10)
+        return "slow"
+
+    async def fast():
+        started.append(len(started))
+        return "fresh"
+
+    waiter = asyncio.create_task(flight.do("k", work))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    # The cancelled task's done callback has not run yet; a new caller in
+    # this gap must not join it.
+    assert len(flight) == 0
+    assert await flight.do("k", fast) == "fresh"
+    assert started == [0, 1]
@@ -0,0 +1,48 @@
+# tests/test_tokens.py
+
+import threading
+
+import pytest
+import tiktoken
+
+from core import tokens
+
+
+@pytest.fixture
+def fresh_encoding(monkeypatch):
+    """Encoding not loaded yet; restores the shared state afterwards."""
+    monkeypatch.setattr(tokens, "_encoding_state", {"encoding": None, "attempted": False})
+
+
+def test_first_use_does_not_block_on_loading(fresh_encoding, monkeypatch):
+    release = threading.Event()
+    loaded = threading.Event()
+
+    def slow_get_encoding(name):
+        release.wait(5)
+        loaded.set()
+        return "encoding"
+
+    monkeypatch.setattr(tiktoken, "get_encoding", slow_get_encoding)
+
+    # Returns at once with the approximation while the load runs
+    assert tokens._encoding() is None
+    assert tokens.count_tokens("a" * 40) == 11
+    assert tokens.fit_to_budget("word " * 100, max_tokens=10).count(tokens.TRUNCATION_MARKER) == 1
+
+    release.set()
+    assert loaded.wait(5)
+    tokens.load_encoding()  # waits for the background load to finish
+    assert tokens._encoding() == "encoding"
+
+
+def test_failed_load_falls_back_to_char_heuristic(fresh_encoding, monkeypatch):
+    def offline(name):
+        raise ConnectionError("no network")
+
+    monkeypatch.setattr(tiktoken, "get_encoding", offline)
+
+    assert tokens.load_encoding() is None
+    assert tokens._encoding_state["attempted"]
+    assert tokens.count_tokens("abcdefgh") == 3
+    assert len(tokens.fit_to_budget("x" * 1000, max_tokens=30)) < 200